@@ -0,0 +1,46 @@
+"""Gunicorn configuration for the subitize web-app.
+
+The app is imported once in the master process, so the database, the context
+template, and the search indices are built before forking and shared with
+the workers copy-on-write. The shards, snapshots, and result cache are also
+prepared once, in the master. Set WEB_CONCURRENCY to change the number of
+workers.
+
+Each /watch/ event stream holds a thread for as long as the client is
+connected, so workers are threaded; set SUBITIZE_THREADS to change the number
+of threads per worker.
+"""
+
+# pylint: disable = invalid-name, unused-argument
+
+import gc
+from os import environ
+
+preload_app = True
+worker_class = 'gthread'
+threads = int(environ.get('SUBITIZE_THREADS', '32'))
+
+
+def when_ready(server):
+    """Prepare the app, then move everything loaded out of the garbage collector's reach.
+
+    Otherwise the first collection in each worker touches (and so copies)
+    every page holding a preloaded object.
+
+    Arguments:
+        server (Arbiter): The gunicorn master.
+    """
+    from subitize.app import prepare # pylint: disable = import-outside-toplevel
+    prepare()
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Drop any database connections inherited from the master.
+
+    Arguments:
+        server (Arbiter): The gunicorn master.
+        worker (Worker): The newly forked worker.
+    """
+    from subitize.models import ENGINE # pylint: disable = import-outside-toplevel
+    ENGINE.dispose(close=False)
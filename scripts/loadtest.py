@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+
+import socket
+import sys
+from argparse import ArgumentParser
+from collections import defaultdict
+from pathlib import Path
+from random import Random
+from threading import Thread
+from time import perf_counter, sleep
+from urllib.parse import urlencode, urlsplit
+
+import requests
+from sqlalchemy import select
+
+ROOT_DIRECTORY = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIRECTORY))
+
+from subitize import app, create_session
+from subitize.app import prepare
+from subitize import Semester, Core, Department, Course, Person, Offering
+from subitize.cache import read_query_log
+
+SCENARIO_WEIGHTS = {
+    'search': 35,
+    'filter': 25,
+    'sort': 10,
+    'browse': 10,
+    'fetch': 20,
+}
+
+SORTS = ['semester', 'course', 'title', 'units', 'instructors', 'meetings', 'cores', 'relevance']
+DAYS = 'MTWRF'
+HOURS = [f'{hour:02d}00' for hour in range(6, 24)]
+
+
+class Workload:
+
+    def __init__(self, query_log=None):
+        if query_log is None:
+            self.queries = []
+        else:
+            self.queries = read_query_log(query_log)
+        with create_session() as session:
+            self.semesters = list(session.scalars(select(Semester.id).order_by(Semester.id.desc())))
+            self.departments = list(session.scalars(select(Department.code)))
+            self.cores = list(session.scalars(select(Core.code)))
+            self.instructors = list(session.scalars(select(Person.system_name)))
+            self.units = sorted(set(session.scalars(select(Offering.units))))
+            self.words = sorted(set(
+                word.lower()
+                for title in session.scalars(select(Offering.title).distinct())
+                for word in title.split()
+                if len(word) > 3 and word.isalpha()
+            ))
+            self.readable_ids = [
+                f'{semester_id}_{department_code}_{number}_{section}'
+                for semester_id, department_code, number, section in session.execute(
+                    select(Offering.semester_id, Course.department_code, Course.number, Offering.section)
+                    .join(Course)
+                )
+            ]
+
+    def semester(self, rng):
+        # most searches are for the most recent semesters
+        if rng.random() < 0.1:
+            return 'any'
+        return str(self.semesters[min(int(rng.expovariate(1)), len(self.semesters) - 1)])
+
+    def filters(self, rng):
+        parameters = {}
+        for _ in range(rng.randint(1, 3)):
+            option = rng.choice(['department', 'core', 'instructor', 'units', 'day', 'hours', 'open', 'number'])
+            if option == 'department':
+                parameters['department'] = rng.choice(self.departments)
+            elif option == 'core':
+                parameters['core'] = rng.choice(self.cores)
+            elif option == 'instructor':
+                parameters['instructor'] = rng.choice(self.instructors)
+            elif option == 'units':
+                parameters['units'] = str(rng.choice(self.units))
+            elif option == 'day':
+                parameters['day'] = rng.choice(DAYS)
+            elif option == 'hours':
+                start = rng.randrange(len(HOURS) - 1)
+                parameters['start_hour'] = HOURS[start]
+                parameters['end_hour'] = rng.choice(HOURS[start + 1:])
+            elif option == 'open':
+                parameters['open'] = 'true'
+            elif option == 'number':
+                lower = rng.choice([100, 200, 300])
+                parameters['lower'] = str(lower)
+                parameters['upper'] = str(lower + 99)
+        return parameters
+
+    def parameters(self, rng, scenario):
+        parameters = {'semester': self.semester(rng)}
+        if scenario == 'search':
+            parameters['query'] = ' '.join(rng.sample(self.words, rng.choice([1, 1, 1, 2])))
+        elif scenario == 'filter':
+            parameters.update(self.filters(rng))
+        elif scenario == 'sort':
+            parameters.update(self.filters(rng))
+            parameters['sort'] = rng.choice(SORTS)
+        return parameters
+
+    def next_request(self, rng):
+        scenario = rng.choices(list(SCENARIO_WEIGHTS), weights=list(SCENARIO_WEIGHTS.values()))[0]
+        if scenario == 'fetch':
+            readable_ids = rng.sample(self.readable_ids, min(rng.randint(5, 20), len(self.readable_ids)))
+            return 'fetch', '/fetch/' + ','.join(readable_ids)
+        if self.queries:
+            # replay logged searches in proportion to how often they were made
+            parameters, = rng.choices(
+                [parameters for parameters, _ in self.queries],
+                weights=[count for _, count in self.queries],
+            )
+            return 'json', '/json/?' + parameters
+        return 'json', '/json/?' + urlencode(self.parameters(rng, scenario))
+
+
+def percentile(latencies, fraction):
+    # nearest-rank percentile of a sorted list
+    return latencies[max(0, min(len(latencies) - 1, int(fraction * len(latencies) + 0.5) - 1))]
+
+
+def run_worker(workload, rng, url, deadline, results):
+    if url is None:
+        client = app.test_client()
+        get = (lambda path: client.get(path).status_code)
+    else:
+        http = requests.Session()
+        get = (lambda path: http.get(url + path, timeout=60).status_code)
+    while perf_counter() < deadline:
+        endpoint, path = workload.next_request(rng)
+        start = perf_counter()
+        try:
+            status = get(path)
+        except requests.RequestException:
+            status = None
+        results.append((endpoint, perf_counter() - start, status == 200))
+
+
+def run_slow_client(url, deadline):
+    # a client on a slow network, which sends its request a header at a time
+    # and so keeps a connection open for the whole test without finishing it
+    parts = urlsplit(url)
+    try:
+        with socket.create_connection((parts.hostname, parts.port or 80), timeout=60) as sock:
+            sock.sendall(f'GET / HTTP/1.1\r\nHost: {parts.netloc}\r\n'.encode('ascii'))
+            while perf_counter() < deadline:
+                sleep(1)
+                sock.sendall(b'X-Slow-Client: 1\r\n')
+    except OSError:
+        # the server gave up on the connection
+        return
+
+
+def report(results, elapsed):
+    by_endpoint = defaultdict(list)
+    for endpoint, latency, success in results:
+        by_endpoint[endpoint].append((latency, success))
+    by_endpoint['total'] = [(latency, success) for _, latency, success in results]
+    print(f'{"endpoint":<10}{"requests":>10}{"errors":>8}{"req/s":>10}{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}')
+    for endpoint, samples in sorted(by_endpoint.items(), key=(lambda pair: (pair[0] == 'total', pair[0]))):
+        latencies = sorted(latency for latency, _ in samples)
+        errors = sum(1 for _, success in samples if not success)
+        print(''.join([
+            f'{endpoint:<10}',
+            f'{len(samples):>10}',
+            f'{errors:>8}',
+            f'{len(samples) / elapsed:>10.1f}',
+            f'{1000 * percentile(latencies, 0.50):>10.1f}',
+            f'{1000 * percentile(latencies, 0.95):>10.1f}',
+            f'{1000 * percentile(latencies, 0.99):>10.1f}',
+        ]))
+
+
+def main():
+    arg_parser = ArgumentParser(description='Drive the web-app with a realistic mix of requests and report latencies.')
+    arg_parser.add_argument('--url', help='the base URL of a running server; by default, requests are made in-process')
+    arg_parser.add_argument('--concurrency', type=int, default=8, help='the number of concurrent clients')
+    arg_parser.add_argument('--duration', type=float, default=10, help='the length of the test, in seconds')
+    arg_parser.add_argument('--seed', type=int, help='the random seed for the request mix')
+    arg_parser.add_argument('--log', help='a query log to draw /json/ requests from, instead of generating them')
+    arg_parser.add_argument(
+        '--slow-clients', type=int, default=0,
+        help='the number of additional connections that send their request too slowly to finish (requires --url)',
+    )
+    args = arg_parser.parse_args()
+    if args.slow_clients and not args.url:
+        arg_parser.error('--slow-clients requires --url')
+    url = args.url.rstrip('/') if args.url else None
+    if url is None:
+        # start the in-process app the way a server would
+        prepare()
+    workload = Workload(args.log)
+    results = []
+    threads = []
+    start = perf_counter()
+    deadline = start + args.duration
+    # the slow clients connect first, as they would already be connected in a real server
+    for _ in range(args.slow_clients):
+        threads.append(Thread(target=run_slow_client, args=(url, deadline)))
+    for i in range(args.concurrency):
+        rng = Random(None if args.seed is None else args.seed + i)
+        threads.append(Thread(target=run_worker, args=(workload, rng, url, deadline, results)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if results:
+        report(results, perf_counter() - start)
+
+
+if __name__ == '__main__':
+    main()
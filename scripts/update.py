@@ -1,19 +1,28 @@
 #!/usr/bin/env python3
 
+import json
 import re
 import sys
+from collections import Counter, defaultdict, namedtuple
 from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
-from os import chdir
+from hashlib import sha256
+from html.parser import HTMLParser
+from os import chdir, cpu_count
 from pathlib import Path
+from shutil import copyfile
 from random import random
 from subprocess import run
-from time import sleep
+from threading import Lock
+from time import sleep, time
 from urllib.parse import urlsplit, urljoin
 
 import requests
 from bs4 import BeautifulSoup, Comment
-from sqlalchemy import select
+from sqlalchemy import create_engine, select, delete, func
+from sqlalchemy.orm import selectinload
 
 ROOT_DIRECTORY = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT_DIRECTORY))
@@ -23,13 +32,22 @@ from subitize import Semester, TimeSlot, Building, Room, Meeting
 from subitize import Core, Department, Course, Person
 from subitize import OfferingMeeting, OfferingCore, OfferingInstructor, Offering
 from subitize import CourseDescription
+from subitize import DataVersion, OfferingFragment, OfferingTombstone
+from subitize import DepartmentStats, CoreStats, CourseHistory
 from subitize import create_select, filter_by_semester, filter_by_department, filter_by_number_str, filter_by_section
+from subitize.models import DATA_DIR, ENGINE, OUTPUT_DIR, Base, create_trigram_indices
+from subitize.shards import create_shards
 
 DB_PATH = ROOT_DIRECTORY / 'subitize' / 'data' / 'counts.db'
 DUMP_PATH = ROOT_DIRECTORY / 'subitize' / 'data' / 'data.sql'
 SCHEMA_PATH = ROOT_DIRECTORY / 'subitize' / 'data' / 'schema.sql'
 LAST_UPDATE_PATH = ROOT_DIRECTORY / 'subitize' / 'data' / 'last-update'
 COURSE_COUNTS = 'https://counts.oxy.edu/public/default.aspx'
+PARSE_CHUNK_SIZE = 1 << 16
+VOID_ELEMENTS = set([
+    'area', 'base', 'basefont', 'bgsound', 'br', 'col', 'command', 'embed', 'frame', 'hr', 'image', 'img', 'input',
+    'isindex', 'keygen', 'link', 'menuitem', 'meta', 'nextid', 'param', 'source', 'spacer', 'track', 'wbr',
+])
 
 CATALOG_URL = 'https://oxy.smartcatalogiq.com/en/{}-{}/catalog/'
 CATALOG_CACHE_PATH = Path(__file__).resolve().parent / 'catalog-cache'
@@ -108,6 +126,127 @@ def get_soup_from_url(url):
     return BeautifulSoup(get_url(url), 'html.parser')
 
 
+# Course Counts is reached through a transport: anything with requests-style
+# get() and post() methods. The requests module itself is the live transport;
+# the classes below record its responses to a directory and replay them, so
+# that updates can be run (and timed) without the live site.
+
+RecordedResponse = namedtuple('RecordedResponse', 'status_code, text')
+
+# form fields that change on every visit, and so do not identify a request
+VOLATILE_PARAMS = set(['__VIEWSTATE', '__EVENTVALIDATION'])
+
+
+def get_request_key(method, url, data=None):
+    request = [method, url]
+    if data:
+        request.extend(sorted((key, value) for key, value in data.items() if key not in VOLATILE_PARAMS))
+    return method.lower() + '-' + sha256(json.dumps(request).encode('utf-8')).hexdigest()[:16]
+
+
+class RecordingTransport:
+
+    def __init__(self, directory, transport=requests):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.transport = transport
+        self.lock = Lock()
+
+    def get(self, url, **kwargs):
+        return self.record('GET', url, kwargs, self.transport.get(url, **kwargs))
+
+    def post(self, url, **kwargs):
+        return self.record('POST', url, kwargs, self.transport.post(url, **kwargs))
+
+    def record(self, method, url, kwargs, response):
+        key = get_request_key(method, url, kwargs.get('data'))
+        # the raw body is kept as is, with the status in the index
+        with (self.directory / key).open('w', encoding='utf-8') as fd:
+            fd.write(response.text)
+        with self.lock:
+            index = read_recording_index(self.directory)
+            index[key] = {'method': method, 'url': url, 'status_code': response.status_code}
+            with (self.directory / 'index.json').open('w', encoding='utf-8') as fd:
+                json.dump(index, fd, indent=4, sort_keys=True)
+        return response
+
+
+class ReplayTransport:
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.index = read_recording_index(self.directory)
+
+    def get(self, url, **kwargs):
+        return self.replay('GET', url, kwargs)
+
+    def post(self, url, **kwargs):
+        return self.replay('POST', url, kwargs)
+
+    def replay(self, method, url, kwargs):
+        key = get_request_key(method, url, kwargs.get('data'))
+        if key not in self.index:
+            raise IOError(f'No recorded response for {method} {url} in {self.directory}')
+        with (self.directory / key).open(encoding='utf-8') as fd:
+            return RecordedResponse(self.index[key]['status_code'], fd.read())
+
+
+def read_recording_index(directory):
+    path = Path(directory) / 'index.json'
+    if not path.exists():
+        return {}
+    with path.open(encoding='utf-8') as fd:
+        return json.load(fd)
+
+
+def get_covered_seconds(intervals):
+    # the time covered by possibly overlapping intervals
+    seconds = 0
+    covered_until = None
+    for start, end in sorted(intervals):
+        if covered_until is not None:
+            start = max(start, covered_until)
+        if end > start:
+            seconds += end - start
+            covered_until = end
+    return seconds
+
+
+class PhaseTimer:
+    # the wall time of each phase of an update, in order of first use; a phase
+    # run by several threads or processes at once is only counted while any of
+    # them is in it, and the total does the same for all phases
+    # times are from time() rather than perf_counter(), so that they can be
+    # compared between processes
+
+    def __init__(self):
+        self.intervals = defaultdict(list)
+        self.lock = Lock()
+
+    @contextmanager
+    def phase(self, name):
+        start = time()
+        try:
+            yield
+        finally:
+            self.add(name, start, time())
+
+    def add(self, name, start, end):
+        # for time spent elsewhere, eg. in a worker process
+        with self.lock:
+            self.intervals[name].append((start, end))
+
+    def report(self):
+        print(f'{"phase":<10}{"calls":>8}{"seconds":>10}')
+        for name, intervals in self.intervals.items():
+            print(f'{name:<10}{len(intervals):>8}{get_covered_seconds(intervals):>10.3f}')
+        intervals = [interval for intervals in self.intervals.values() for interval in intervals]
+        print(f'{"total":<10}{len(intervals):>8}{get_covered_seconds(intervals):>10.3f}')
+
+
+TIMER = PhaseTimer()
+
+
 def get_catalog_url(year):
     return CATALOG_URL.format(year - 1, year)
 
@@ -194,15 +333,80 @@ def extract_prerequisites(course_soup):
     return prerequisites, corequisites
 
 
-def parse_prerequisites(prerequisites):
-    return None # TODO
+PREREQUISITE_TOKEN_REGEX = re.compile(
+    r'(?P<course>\b(?P<department>[A-Z]{2,4})\s+(?P<number>[0-9]{1,3}[A-Z]?)\b)'
+    r'|(?P<bare>\b[0-9]{1,3}[A-Z]?\b)'
+    r'|(?P<connector>\b(?i:and|or)\b|,|;)'
+)
+# eg. "a grade of C or better", which is not a choice between alternatives
+PREREQUISITE_QUALIFIER_REGEX = re.compile(r'\bor\s+(?:better|higher|above)\b', flags=re.IGNORECASE)
+
+
+def parse_prerequisites(prerequisites, courses):
+    # returns a JSON list (AND) of lists (OR) of course IDs, eg. "COMP 131 and
+    # MATH 120 or 110" becomes [[COMP 131], [MATH 120, MATH 110]]
+    if not prerequisites:
+        return None
+    text = BeautifulSoup(prerequisites, 'html.parser').get_text(' ')
+    clauses = []
+    for sentence in re.split(r'[.;]', text):
+        sentence = PREREQUISITE_QUALIFIER_REGEX.sub(' ', sentence)
+        tokens = []
+        department = None
+        # text between connectors that names no course, eg. "permission of instructor"
+        segment_start = 0
+        segment_has_course = False
+        for match in PREREQUISITE_TOKEN_REGEX.finditer(sentence):
+            if match.group('course'):
+                department = match.group('department')
+                tokens.append(('course', (department, match.group('number'))))
+                segment_has_course = True
+            elif match.group('bare') and department is not None:
+                # numbers in a list share the last department, eg. "COMP 131, 229, or 146"
+                tokens.append(('course', (department, match.group('bare'))))
+                segment_has_course = True
+            elif match.group('connector'):
+                if not segment_has_course and re.search('[A-Za-z]', sentence[segment_start:match.start()]):
+                    tokens.append(('other', sentence[segment_start:match.start()].strip()))
+                tokens.append(('connector', match.group('connector').lower()))
+                segment_start = match.end()
+                segment_has_course = False
+        if not segment_has_course and re.search('[A-Za-z]', sentence[segment_start:]):
+            tokens.append(('other', sentence[segment_start:].strip()))
+        # commas take on the next connective in the list, or "and" if there is none
+        connector = 'and'
+        for i in range(len(tokens) - 1, -1, -1):
+            kind, value = tokens[i]
+            if kind == 'connector' and value in ('and', 'or'):
+                connector = value
+            elif kind == 'connector':
+                tokens[i] = ('connector', connector)
+        # alternatives that are not known courses (or not courses at all)
+        # could be satisfied by anything, so their whole clause is dropped
+        clause = []
+        satisfiable = True
+        for kind, value in tokens + [('connector', 'and')]:
+            if kind == 'course':
+                if value in courses:
+                    clause.append(courses[value])
+                else:
+                    satisfiable = False
+            elif kind == 'other':
+                satisfiable = False
+            elif value == 'and':
+                if clause and satisfiable and sorted(set(clause)) not in clauses:
+                    clauses.append(sorted(set(clause)))
+                clause = []
+                satisfiable = True
+    if not clauses:
+        return None
+    return json.dumps(clauses)
 
 
 def extract_course_info(session, year, url, html):
     course_soup = BeautifulSoup(html, 'html.parser')
     department, number, description = extract_basic_info(session, course_soup)
     prerequisites, corequisites = extract_prerequisites(course_soup)
-    # parsed_prerequisites = parse_prerequisites(prerequisites) # FIXME
     for number in re.split('[/-]', number):
         number = number.strip()
         if not number:
@@ -222,7 +426,6 @@ def extract_course_info(session, year, url, html):
         course_desc.description = description
         course_desc.prerequisites = prerequisites
         course_desc.corequisites = corequisites
-        #course_desc.parsed_prerequisites = parsed_prerequisites
         # TODO detect if prerequisites have changed
 
 
@@ -249,54 +452,161 @@ def update_course_info(year):
         with path.open(encoding='utf-8') as fd:
             extract_course_info(session, year, course_url, fd.read())
     session.commit()
+    # parse prerequisites only after all courses in the catalog are created
+    update_parsed_prerequisites(year, session)
     dump()
     link_offerings_catalog()
 
 
+def update_parsed_prerequisites(year=None, session=None):
+    if session is None:
+        session = create_session()
+    courses = {
+        (department_code, number): course_id
+        for course_id, department_code, number in session.execute(
+            select(Course.id, Course.department_code, Course.number)
+        )
+    }
+    statement = select(CourseDescription)
+    if year is not None:
+        statement = statement.where(CourseDescription.year == year)
+    for course_desc in session.scalars(statement):
+        course_desc.parsed_prerequisites = parse_prerequisites(course_desc.prerequisites, courses)
+    session.commit()
+
+
 # offering functions
 
 
-def create_department(session, code):
-    department = session.query(Department).filter_by(code=code).first()
-    if not department:
-        department = Department(code=code, name='FIXME')
-        session.add(department)
-        print(f'created unnamed department with code {code}')
-    return department
+class UpdateSession:
+
+    def __init__(self, session):
+        # load everything an update can refer to, so that rows are resolved without querying
+        self.session = session
+        self.semesters = {
+            (semester.year, semester.season): semester
+            for semester in session.scalars(select(Semester))
+        }
+        self.departments = {department.code: department for department in session.scalars(select(Department))}
+        self.people = {person.system_name: person for person in session.scalars(select(Person))}
+        self.buildings = {building.code: building for building in session.scalars(select(Building))}
+        self.rooms = {(room.building_code, room.room): room for room in session.scalars(select(Room))}
+        self.timeslots = {
+            (timeslot.weekdays, timeslot.start, timeslot.end): timeslot
+            for timeslot in session.scalars(select(TimeSlot))
+        }
+        # the timeslots and rooms are already loaded, so these are identity map lookups
+        self.meetings = {
+            (meeting.timeslot, meeting.room): meeting
+            for meeting in session.scalars(select(Meeting))
+        }
+        self.cores = {core.code: core for core in session.scalars(select(Core))}
+        self.courses = {
+            (course.department_code, course.number): course
+            for course in session.scalars(select(Course))
+        }
+        self.offerings = {}
+
+    def load_offerings(self, semester_code):
+        # the offerings of one semester at a time, which rows are matched against
+        self.offerings = {
+            (offering.course.department_code, offering.course.number, offering.section): offering
+            for offering in self.session.scalars(
+                filter_by_semester(create_select(), semester_code).options(
+                    selectinload(Offering.instructors),
+                    selectinload(Offering.meetings),
+                    selectinload(Offering.cores),
+                )
+            )
+        }
+
+    def _get_or_add(self, cache, key, create):
+        if key not in cache:
+            cache[key] = create()
+            self.session.add(cache[key])
+        return cache[key]
+
+    def get_semester(self, year, season):
+        return self._get_or_add(
+            self.semesters, (year, season),
+            (lambda: Semester(year=year, season=season)),
+        )
+
+    def get_department(self, code):
+        if code not in self.departments:
+            print(f'created unnamed department with code {code}')
+        return self._get_or_add(
+            self.departments, code,
+            (lambda: Department(code=code, name='FIXME')),
+        )
+
+    def get_person(self, system_name, first_name, last_name):
+        return self._get_or_add(
+            self.people, system_name,
+            (lambda: Person(system_name=system_name, first_name=first_name, last_name=last_name)),
+        )
 
+    def get_building(self, code):
+        return self._get_or_add(self.buildings, code, (lambda: Building(code=code)))
 
-def create_instructor(session, system_name):
+    def get_room(self, building_code, room):
+        return self._get_or_add(
+            self.rooms, (building_code, room),
+            (lambda: Room(building=self.get_building(building_code), room=room)),
+        )
+
+    def get_timeslot(self, weekdays, start, end):
+        return self._get_or_add(
+            self.timeslots, (weekdays, start, end),
+            (lambda: TimeSlot(weekdays=weekdays, start=start, end=end)),
+        )
+
+    def get_meeting(self, timeslot, room):
+        return self._get_or_add(
+            self.meetings, (timeslot, room),
+            (lambda: Meeting(timeslot=timeslot, room=room)),
+        )
+
+    def get_core(self, code):
+        return self._get_or_add(self.cores, code, (lambda: Core(code=code)))
+
+    def get_course(self, department, number):
+        return self._get_or_add(
+            self.courses, (department.code, number),
+            (lambda: Course(department=department, number=number, number_int=int(re.sub('[^0-9]', '', number)))),
+        )
+
+
+def create_department(update_session, code):
+    return update_session.get_department(code)
+
+
+def create_instructor(update_session, system_name):
     system_name = system_name.strip()
     if system_name == 'Instructor Unassigned':
         return None
-    instructor = session.query(Person).filter_by(system_name=system_name)
-    if instructor.count() == 0:
-        if system_name in PREFERRED_NAMES:
-            first_name, last_name = PREFERRED_NAMES[system_name]
-            system_name = f'{first_name} {last_name}'
-        else:
-            first_name, last_name = system_name.rsplit(' ', maxsplit=1)
-        return get_or_create(session, Person, system_name=system_name, first_name=first_name, last_name=last_name)
-    elif instructor.count() == 1:
-        return instructor.first()
-    assert False
-    return None
+    if system_name in update_session.people:
+        return update_session.people[system_name]
+    if system_name in PREFERRED_NAMES:
+        first_name, last_name = PREFERRED_NAMES[system_name]
+        system_name = f'{first_name} {last_name}'
+    else:
+        first_name, last_name = system_name.rsplit(' ', maxsplit=1)
+    return update_session.get_person(system_name, first_name, last_name)
 
 
-def create_room(session, location_str):
+def create_room(update_session, location_str):
     if location_str == 'Bldg-TBD':
         room = None
     elif ' ' not in location_str:
-        building = get_or_create(session, Building, code=location_str)
-        room = get_or_create(session, Room, building=building, room=None)
+        room = update_session.get_room(location_str, None)
     else:
         building_str, room_str = location_str.rsplit(' ', maxsplit=1)
-        building = get_or_create(session, Building, code=building_str)
-        room = get_or_create(session, Room, building=building, room=room_str)
+        room = update_session.get_room(building_str, room_str)
     return room
 
 
-def create_meeting(session, meeting_strs):
+def create_meeting(update_session, meeting_strs):
     if len(meeting_strs) == 2:
         time_str, days_str = meeting_strs
         location_str = 'Bldg-TBD'
@@ -309,32 +619,28 @@ def create_meeting(session, meeting_strs):
         start_time_str, end_time_str = time_str.upper().split('-')
         start_time = datetime.strptime(start_time_str, '%I:%M%p').time()
         end_time = datetime.strptime(end_time_str, '%I:%M%p').time()
-        timeslot = get_or_create(session, TimeSlot, weekdays=days_str, start=start_time, end=end_time)
-        room = create_room(session, location_str)
+        timeslot = update_session.get_timeslot(days_str, start_time, end_time)
+        room = create_room(update_session, location_str)
     if timeslot is None:
         return None
     else:
-        return get_or_create(session, Meeting, timeslot=timeslot, room=room)
+        return update_session.get_meeting(timeslot, room)
 
 
 def create_objects(
-        session, semester, department_code, number, section, title, units, instructors, meetings, cores,
+        update_session, semester, department_code, number, section, title, units, instructors, meetings, cores,
         num_seats, num_enrolled, num_reserved, num_reserved_open, num_waitlisted):
-    semester = get_or_create(session, Semester, year=semester[0], season=semester[1])
-    department = create_department(session, department_code)
-    course = get_or_create(
-        session, Course, department=department, number=number, number_int=int(re.sub('[^0-9]', '', number))
-    )
-    instructors = [create_instructor(session, instructor) for instructor in instructors]
+    semester = update_session.get_semester(semester[0], semester[1])
+    department = create_department(update_session, department_code)
+    course = update_session.get_course(department, number)
+    instructors = [create_instructor(update_session, instructor) for instructor in instructors]
     instructors = [instructor for instructor in instructors if instructor is not None]
-    meetings = [create_meeting(session, meeting) for meeting in meetings]
+    meetings = [create_meeting(update_session, meeting) for meeting in meetings]
     meetings = [meeting for meeting in meetings if meeting is not None]
-    cores = [get_or_create(session, Core, code=core) for core in cores]
-    offering = session.query(Offering).filter_by(semester=semester, course=course, section=section)
-    if offering.count() == 0:
-        offering = get_or_create(
-            session,
-            Offering,
+    cores = [update_session.get_core(core) for core in cores]
+    key = (department.code, course.number, section)
+    if key not in update_session.offerings:
+        offering = Offering(
             semester=semester,
             course=course,
             section=section,
@@ -346,9 +652,11 @@ def create_objects(
             num_reserved_open=0,
             num_waitlisted=0,
         )
+        update_session.session.add(offering)
+        update_session.offerings[key] = offering
         print(f'adding {offering}: {offering.title} -> {title}')
     else:
-        offering = offering.first()
+        offering = update_session.offerings[key]
         if offering.title != title:
             print(f'changing title of {offering}: {offering.title} -> {title}')
         if set(offering.instructors) != set(instructors):
@@ -380,8 +688,8 @@ def extract_text(soup):
     return re.sub(r'  \+', ' ', ''.join(text).strip())
 
 
-def get_view_state():
-    response = requests.get(COURSE_COUNTS, verify=False)
+def get_view_state(transport=requests):
+    response = transport.get(COURSE_COUNTS, verify=False)
     if response.status_code != 200:
         raise IOError(f'Unable to connect to Course Counts Simple Search (status code {response.status_code})')
     soup = BeautifulSoup(response.text, 'html.parser')
@@ -390,7 +698,7 @@ def get_view_state():
     return view_state, event_validation
 
 
-def get_offerings_data(semester):
+def get_offerings_data(semester, transport=requests, view_state=None):
     params = {
         'ScriptManager2':'pageUpdatePanel|tabContainer$TabPanel1$btnGo',
         '__ASYNCPOST':'true',
@@ -414,8 +722,10 @@ def get_offerings_data(semester):
         'tabContainer$TabPanel4$txtCRN':'',
         'tabContainer_ClientState':'{"ActiveTabIndex":0,"TabEnabledState":[true,true,true,true],"TabWasLoadedOnceState":[true,false,false,false]}',
     }
-    params['__VIEWSTATE'], params['__EVENTVALIDATION'] = get_view_state()
-    response = requests.post(COURSE_COUNTS, headers=REQUEST_HEADERS, data=params, verify=False)
+    if view_state is None:
+        view_state = get_view_state(transport)
+    params['__VIEWSTATE'], params['__EVENTVALIDATION'] = view_state
+    response = transport.post(COURSE_COUNTS, headers=REQUEST_HEADERS, data=params, verify=False)
     if response.status_code != 200:
         raise IOError(f'Unable to connect to Course Counts offerings data (status code {response.status_code})')
     response = response.text.split('|')
@@ -429,41 +739,189 @@ def get_offerings_data(semester):
     return '|'.join(html)
 
 
-def update_from_html(session, semester, html):
-    semester = Semester.code_to_season(semester)
-    soup = BeautifulSoup(html, 'html.parser').find_all(id='searchResultsPanel')[0]
-    soup = soup.find_all('div', recursive=False)[1].find_all('table', limit=1)[0]
-    extracted_sections = set()
-    for row in soup.find_all('tr', recursive=False):
-        tds = row.find_all('td', recursive=False)
-        if not tds:
-            continue
-        department_code, number, section = extract_text(tds[1]).split()
-        title = extract_text(tds[2])
-        units = int(extract_text(tds[3]))
+def clean_text(strings):
+    # the same as extract_text, given the strings of an element
+    return re.sub(r'  \+', ' ', ''.join(strings).strip())
+
+
+class OfferingsParser(HTMLParser):
+    # Parses the rows of the results table as they are fed in, keeping only
+    # the strings of the current row. The table is found, and elements are
+    # nested and closed, the same way BeautifulSoup does with html.parser:
+    # the first table in the second child div of the searchResultsPanel.
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        # each open element is [tag, strings, meeting cells]; the lists are
+        # only kept for elements whose contents are extracted
+        self.stack = []
+        self.open_tags = Counter()
+        self.data = []
+        self.panel_depth = None
+        self.num_panel_divs = 0
+        self.results_depth = None
+        self.table_depth = None
+        self.done = False
+        self.cells = None
+        self.cell = None
+        self.rows = []
+
+    def add_string(self, string):
+        string = string.strip()
+        if not string or self.cell is None:
+            return
+        for _, strings, _ in self.stack:
+            if strings is not None:
+                strings.append(string)
+
+    def flush_data(self):
+        # like BeautifulSoup, treat the text between two tags as one string
+        if self.data:
+            self.add_string(''.join(self.data))
+            self.data = []
+
+    def handle_starttag(self, tag, attrs):
+        self.flush_data()
+        depth = len(self.stack)
+        entry = [tag, None, None]
+        if self.done:
+            pass
+        elif self.panel_depth is None:
+            if dict(attrs).get('id') == 'searchResultsPanel':
+                self.panel_depth = depth
+        elif self.results_depth is None:
+            if tag == 'div' and depth == self.panel_depth + 1:
+                self.num_panel_divs += 1
+                if self.num_panel_divs == 2:
+                    self.results_depth = depth
+        elif self.table_depth is None:
+            if tag == 'table':
+                self.table_depth = depth
+        elif depth == self.table_depth + 1:
+            if tag == 'tr':
+                self.cells = []
+        elif depth == self.table_depth + 2:
+            if tag == 'td' and self.cells is not None:
+                self.cell = {'strings': [], 'abbrs': [], 'meetings': []}
+                self.cells.append(self.cell)
+                entry[1] = self.cell['strings']
+        elif self.cell is not None:
+            if tag == 'abbr':
+                entry[1] = []
+                attrs = {key: ('' if value is None else value) for key, value in attrs}
+                self.cell['abbrs'].append((attrs, entry[1]))
+            elif tag == 'tr':
+                entry[2] = []
+                self.cell['meetings'].append(entry[2])
+            elif tag == 'td':
+                entry[1] = []
+                for _, _, meeting_cells in self.stack:
+                    if meeting_cells is not None:
+                        meeting_cells.append(entry[1])
+        self.stack.append(entry)
+        self.open_tags[tag] += 1
+        if tag in VOID_ELEMENTS:
+            self.pop()
+
+    def handle_endtag(self, tag):
+        self.flush_data()
+        if not self.open_tags[tag]:
+            return
+        while self.pop() != tag:
+            pass
+
+    def handle_data(self, data):
+        self.data.append(data)
+
+    def handle_comment(self, data):
+        self.flush_data()
+        self.add_string(data)
+
+    def close(self):
+        super().close()
+        self.flush_data()
+        while self.stack:
+            self.pop()
+
+    def pop(self):
+        tag, _, _ = self.stack.pop()
+        self.open_tags[tag] -= 1
+        depth = len(self.stack)
+        if self.table_depth is not None:
+            if depth == self.table_depth + 2 and self.cell is not None:
+                self.cell = None
+            elif depth == self.table_depth + 1 and self.cells is not None:
+                if self.cells:
+                    self.rows.append(self.parse_row(self.cells))
+                self.cells = None
+            elif depth == self.table_depth:
+                self.done = True
+        elif self.results_depth is not None:
+            if depth == self.results_depth:
+                self.done = True
+        elif self.panel_depth is not None:
+            if depth == self.panel_depth:
+                self.done = True
+        return tag
+
+    @staticmethod
+    def parse_row(cells):
+        department_code, number, section = clean_text(cells[1]['strings']).split()
+        title = clean_text(cells[2]['strings'])
+        units = int(clean_text(cells[3]['strings']))
         instructors = []
-        for tag in tds[4].find_all('abbr'):
-            instructor = tag['title']
+        for attrs, _ in cells[4]['abbrs']:
+            instructor = attrs['title']
             if instructor != 'Instructor Unassigned':
                 instructors.append(instructor)
         meetings = []
-        for tr in tds[5].find_all('tr'):
+        for meeting_cells in cells[5]['meetings']:
             # time_str, days_str
-            meetings.append([extract_text(td) for td in tr.find_all('td')])
-        # tds[6] is the location, which is always TBD for non-authenticated use
-        cores = []
-        for tag in tds[6].find_all('abbr'):
-            cores.append(extract_text(tag))
+            meetings.append([clean_text(strings) for strings in meeting_cells])
+        # cells[6] is the location, which is always TBD for non-authenticated use
+        cores = [clean_text(strings) for _, strings in cells[6]['abbrs']]
         cores = [core for core in cores if core]
-        num_seats = int(extract_text(tds[7]))
-        num_enrolled = int(extract_text(tds[8]))
-        num_reserved = int(extract_text(tds[9]))
-        num_reserved_open = int(extract_text(tds[10]))
-        num_waitlisted = int(extract_text(tds[11]))
-        offering = create_objects(
-            session, semester, department_code, number, section, title, units, instructors, meetings, cores,
-            num_seats, num_enrolled, num_reserved, num_reserved_open, num_waitlisted
+        num_seats = int(clean_text(cells[7]['strings']))
+        num_enrolled = int(clean_text(cells[8]['strings']))
+        num_reserved = int(clean_text(cells[9]['strings']))
+        num_reserved_open = int(clean_text(cells[10]['strings']))
+        num_waitlisted = int(clean_text(cells[11]['strings']))
+        return (
+            department_code, number, section, title, units, instructors, meetings, cores,
+            num_seats, num_enrolled, num_reserved, num_reserved_open, num_waitlisted,
         )
+
+
+def parse_offerings(html, chunk_size=PARSE_CHUNK_SIZE):
+    parser = OfferingsParser()
+    found = False
+    for start in range(0, len(html), chunk_size):
+        parser.feed(html[start:start + chunk_size])
+        found = found or parser.table_depth is not None
+        yield from parser.rows
+        parser.rows = []
+        if parser.done:
+            break
+    else:
+        parser.close()
+        found = found or parser.table_depth is not None
+        yield from parser.rows
+    if not found:
+        raise ValueError('Unable to find the offerings table')
+
+
+def parse_offerings_data(html):
+    # run in a worker process; the rows are plain tuples, so they can be sent back
+    start = time()
+    rows = list(parse_offerings(html))
+    return rows, start, time()
+
+
+def update_from_rows(update_session, semester, rows):
+    semester = Semester.code_to_season(semester)
+    extracted_sections = set()
+    for row in rows:
+        offering = create_objects(update_session, semester, *row)
         offering_str = f'{offering.course.department.code} {offering.course.number} {offering.section}'
         if offering_str in extracted_sections:
             print('DUPLICATE COURSE-SECTION ID: ' + offering_str)
@@ -472,13 +930,6 @@ def update_from_html(session, semester, html):
     return extracted_sections
 
 
-def get_existing_sections(session, semester_code):
-    return set(
-        f'{offering.course.department.code} {offering.course.number} {offering.section}'
-        for offering in session.scalars(filter_by_semester(create_select(), semester_code))
-    )
-
-
 def delete_section(session, semester_code, dept, num, sec):
     statement = create_select()
     statement = filter_by_semester(statement, semester_code)
@@ -487,21 +938,76 @@ def delete_section(session, semester_code, dept, num, sec):
     statement = filter_by_section(statement, sec)
     for offering in session.scalars(statement):
         print(f'deleting {offering}: {offering.title}')
+        # the version is filled in by update_fragments
+        session.merge(OfferingTombstone(offering_id=offering.id, readable_id=offering.readable_id, version=None))
         session.delete(offering)
 
 
-def update_offerings(semester_code, session=None):
+def apply_offerings(update_session, semester_code, rows):
+    session = update_session.session
+    with TIMER.phase('load'):
+        update_session.load_offerings(semester_code)
+    old_sections = set(' '.join(key) for key in update_session.offerings)
+    # everything is resolved in memory, and written in a single flush
+    with TIMER.phase('upsert'):
+        with session.no_autoflush:
+            new_sections = update_from_rows(update_session, semester_code, rows)
+        session.flush()
+    with TIMER.phase('delete'):
+        for section_str in sorted(old_sections - new_sections):
+            delete_section(session, semester_code, *section_str.split())
+        session.flush()
+
+
+def update_offerings(semester_code, session=None, transport=None):
+    update_semesters([semester_code], session, transport)
+
+
+def apply_semesters(semester_codes, session, transport=None):
+    # the semesters are fetched concurrently over one HTTP session and parsed
+    # in parallel as they arrive, but are written serially, along with their
+    # rollups and course histories, without committing
+    semester_codes = list(dict.fromkeys(semester_codes))
+    if transport is None:
+        transport = requests.Session()
+    with ProcessPoolExecutor(min(len(semester_codes), cpu_count())) as parsers:
+        # start the worker processes before any threads, so that they are not
+        # forked while another thread holds a lock
+        parsers.submit(int).result()
+        with TIMER.phase('fetch'):
+            view_state = get_view_state(transport)
+        with ThreadPoolExecutor(len(semester_codes)) as fetchers:
+
+            def fetch_and_parse(semester_code):
+                with TIMER.phase('fetch'):
+                    offerings_data = get_offerings_data(semester_code, transport, view_state)
+                return parsers.submit(parse_offerings_data, offerings_data)
+
+            parses = {
+                semester_code: fetchers.submit(fetch_and_parse, semester_code)
+                for semester_code in semester_codes
+            }
+            with TIMER.phase('load'):
+                update_session = UpdateSession(session)
+            for semester_code in semester_codes:
+                rows, start, end = parses[semester_code].result().result()
+                TIMER.add('parse', start, end)
+                apply_offerings(update_session, semester_code, rows)
+    with TIMER.phase('rollup'):
+        for semester_code in semester_codes:
+            update_rollups(semester_code, session)
+            update_course_histories(semester_code, session)
+
+
+def update_semesters(semester_codes, session=None, transport=None):
     with DUMP_PATH.open(encoding='utf-8') as fd:
         old_dump = fd.read()
     if session is None:
         session = create_session()
-    old_sections = get_existing_sections(session, semester_code)
-    offerings_data = get_offerings_data(semester_code)
-    new_sections = update_from_html(session, semester_code, offerings_data)
-    for section_str in sorted(old_sections - new_sections):
-        delete_section(session, semester_code, *section_str.split())
-    session.commit()
-    dump()
+    apply_semesters(semester_codes, session, transport)
+    with TIMER.phase('commit'):
+        session.commit()
+    # linking also dumps the database
     link_offerings_catalog()
     with DUMP_PATH.open(encoding='utf-8') as fd:
         new_dump = fd.read()
@@ -517,18 +1023,19 @@ def update_offerings(semester_code, session=None):
 def link_offerings_catalog(session=None):
     if session is None:
         session = create_session()
-    statement = create_select()
-    for offering in session.scalars(statement):
-        description_statement = (
-            select(CourseDescription)
-            .where(CourseDescription.year == (offering.semester_id // 100))
-            .where(CourseDescription.course_id == offering.course_id)
-        )
-        description = session.scalar(description_statement)
-        if description:
-            offering.course_desc = description
-            session.add(offering)
-    session.commit()
+    with TIMER.phase('link'):
+        statement = create_select()
+        for offering in session.scalars(statement):
+            description_statement = (
+                select(CourseDescription)
+                .where(CourseDescription.year == (offering.semester_id // 100))
+                .where(CourseDescription.course_id == offering.course_id)
+            )
+            description = session.scalar(description_statement)
+            if description:
+                offering.course_desc = description
+                session.add(offering)
+        session.commit()
     dump()
 
 
@@ -661,6 +1168,172 @@ def lint():
     dump()
 
 
+# rollup functions
+
+
+def update_rollups(semester_code=None, session=None):
+    # a session that is passed in is left for the caller to commit
+    commit = session is None
+    if commit:
+        session = create_session()
+    if semester_code is None:
+        semester_ids = list(session.scalars(select(Semester.id)))
+    else:
+        semester_ids = [int(semester_code)]
+    totals = (
+        func.count(Offering.id).label('num_sections'),
+        func.sum(Offering.num_seats).label('num_seats'),
+        func.sum(Offering.num_enrolled).label('num_enrolled'),
+        func.sum(Offering.num_waitlisted).label('num_waitlisted'),
+    )
+    session.execute(delete(DepartmentStats).where(DepartmentStats.semester_id.in_(semester_ids)))
+    session.execute(delete(CoreStats).where(CoreStats.semester_id.in_(semester_ids)))
+    statement = (
+        select(Offering.semester_id, Course.department_code, *totals)
+        .join(Course)
+        .where(Offering.semester_id.in_(semester_ids))
+        .group_by(Offering.semester_id, Course.department_code)
+    )
+    for row in session.execute(statement):
+        session.add(DepartmentStats(**row._asdict()))
+    statement = (
+        select(Offering.semester_id, OfferingCore.core_code, *totals)
+        .join(OfferingCore, OfferingCore.offering_id == Offering.id)
+        .where(Offering.semester_id.in_(semester_ids))
+        .group_by(Offering.semester_id, OfferingCore.core_code)
+    )
+    for row in session.execute(statement):
+        session.add(CoreStats(**row._asdict()))
+    if commit:
+        session.commit()
+
+
+def build_course_history(course, offerings):
+    semesters = {}
+    instructors = Counter()
+    patterns = Counter()
+    for offering in offerings:
+        semester = semesters.setdefault(offering.semester_id, {'num_sections': 0, 'instructors': set()})
+        semester['num_sections'] += 1
+        semester['instructors'].update(person.system_name for person in offering.instructors)
+        for meeting in offering.meetings:
+            if meeting.timeslot is not None:
+                timeslot = meeting.timeslot
+                patterns[(timeslot.weekdays, timeslot.iso_start_time, timeslot.iso_end_time)] += 1
+    for semester in semesters.values():
+        instructors.update(semester['instructors'])
+    latest = max(offerings, key=(lambda offering: (offering.semester_id, offering.section)))
+    return {
+        'department': course.department_code,
+        'number': course.number,
+        'title': latest.title,
+        'first_offered': str(min(semesters)),
+        'last_offered': str(max(semesters)),
+        'num_semesters': len(semesters),
+        'num_sections': len(offerings),
+        'semesters': [
+            {
+                'semester': str(semester_id),
+                'num_sections': semester['num_sections'],
+                'instructors': sorted(semester['instructors']),
+            }
+            for semester_id, semester in sorted(semesters.items(), reverse=True)
+        ],
+        'instructors': [
+            {'system_name': system_name, 'num_semesters': count}
+            for system_name, count in sorted(instructors.items(), key=(lambda pair: (-pair[1], pair[0])))
+        ],
+        'meeting_patterns': [
+            {'weekdays': weekdays, 'iso_start_time': start, 'iso_end_time': end, 'num_sections': count}
+            for (weekdays, start, end), count in sorted(patterns.items(), key=(lambda pair: (-pair[1], pair[0])))[:5]
+        ],
+    }
+
+
+def update_course_histories(semester_code=None, session=None):
+    # a session that is passed in is left for the caller to commit
+    commit = session is None
+    if commit:
+        session = create_session()
+    histories = {history.course_id: history for history in session.scalars(select(CourseHistory))}
+    statement = select(Offering.course_id).distinct()
+    if semester_code is None:
+        course_ids = set(session.scalars(statement)) | set(histories)
+    else:
+        # include courses that were offered in the semester before this update
+        course_ids = set(session.scalars(statement.where(Offering.semester_id == int(semester_code))))
+        course_ids |= set(
+            course_id for course_id, history in histories.items()
+            if any(semester['semester'] == semester_code for semester in json.loads(history.history)['semesters'])
+        )
+    offerings = {course_id: [] for course_id in course_ids}
+    statement = (
+        select(Offering)
+        .where(Offering.course_id.in_(course_ids))
+        .options(
+            selectinload(Offering.instructors),
+            selectinload(Offering.meetings).selectinload(Meeting.timeslot),
+        )
+    )
+    for offering in session.scalars(statement):
+        offerings[offering.course_id].append(offering)
+    for course in session.scalars(select(Course).where(Course.id.in_(course_ids))):
+        if not offerings[course.id]:
+            if course.id in histories:
+                session.delete(histories[course.id])
+            continue
+        history = json.dumps(
+            build_course_history(course, offerings[course.id]),
+            separators=(',', ':'),
+            sort_keys=True,
+        )
+        if course.id in histories:
+            histories[course.id].history = history
+        else:
+            session.add(CourseHistory(course_id=course.id, history=history))
+    if commit:
+        session.commit()
+
+
+# serialization functions
+
+
+def update_fragments(session=None):
+    if session is None:
+        session = create_session()
+    fragments = {fragment.offering_id: fragment for fragment in session.scalars(select(OfferingFragment))}
+    statement = create_select().options(
+        selectinload(Offering.semester),
+        selectinload(Offering.course).selectinload(Course.department),
+        selectinload(Offering.course_desc),
+        selectinload(Offering.instructors),
+        selectinload(Offering.meetings).selectinload(Meeting.timeslot),
+        selectinload(Offering.meetings).selectinload(Meeting.room).selectinload(Room.building),
+        selectinload(Offering.cores),
+    )
+    changed = {}
+    for offering in session.scalars(statement):
+        fragment = offering.to_json_fragment()
+        if offering.id not in fragments or fragments[offering.id].fragment != fragment:
+            changed[offering.id] = fragment
+    tombstones = list(session.scalars(select(OfferingTombstone).where(OfferingTombstone.version.is_(None))))
+    if not changed and not tombstones:
+        return
+    version = DataVersion(timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    session.add(version)
+    session.flush()
+    for tombstone in tombstones:
+        tombstone.version = version.id
+    for offering_id, fragment in changed.items():
+        if offering_id in fragments:
+            fragments[offering_id].fragment = fragment
+            fragments[offering_id].version = version.id
+        else:
+            session.add(OfferingFragment(offering_id=offering_id, version=version.id, fragment=fragment))
+    print(f'updated {len(changed)} offering fragments and {len(tombstones)} deletions to version {version.id}')
+    session.commit()
+
+
 # cleanup functions
 
 
@@ -676,34 +1349,114 @@ def dump():
         with path.open('w', encoding='utf-8') as fd:
             fd.write(output)
 
-    create_db()
-    _dump('.schema', SCHEMA_PATH)
-    _dump('.dump', DUMP_PATH)
+    with TIMER.phase('dump'):
+        create_db()
+        update_fragments()
+        _dump('.schema', SCHEMA_PATH)
+        _dump('.dump', DUMP_PATH)
+    # the servers only use shards of the current data, and never write them while serving
+    with TIMER.phase('shards'):
+        create_shards()
+
+
+def publish(url):
+    # replace the contents of another database (eg. PostgreSQL) with the SQLite data
+    # the tables are dropped, recreated, and filled in one transaction, so that
+    # running instances keep reading the old data until the new data is committed
+    source = create_engine(f'sqlite:///{DB_PATH}')
+    target = create_engine(url)
+    with source.connect() as source_conn, target.begin() as target_conn:
+        Base.metadata.drop_all(target_conn)
+        Base.metadata.create_all(target_conn)
+        for table in Base.metadata.sorted_tables:
+            rows = [dict(row) for row in source_conn.execute(table.select()).mappings()]
+            if rows:
+                target_conn.execute(table.insert(), rows)
+            print(f'copied {len(rows)} rows of {table.name}')
+    if target.dialect.name == 'postgresql' and not create_trigram_indices(target):
+        print('pg_trgm is not available; searches will not use trigram indices')
+
+
+def use_scratch_output(directory):
+    # write the database, its dumps, and the last update time somewhere other than the bundled data
+    global DB_PATH, DUMP_PATH, SCHEMA_PATH, LAST_UPDATE_PATH # pylint: disable = global-statement
+    directory.mkdir(parents=True, exist_ok=True)
+    DB_PATH = Path(ENGINE.url.database)
+    # the update starts from (and compares its dump against) the committed dump
+    copyfile(DUMP_PATH, directory / 'data.sql')
+    DUMP_PATH = directory / 'data.sql'
+    SCHEMA_PATH = directory / 'schema.sql'
+    LAST_UPDATE_PATH = directory / 'last-update'
 
 
 def main():
     chdir(ROOT_DIRECTORY)
     arg_parser = ArgumentParser()
-    arg_parser.add_argument('action', choices=['lint', 'offerings', 'catalog'], help='the action to take')
+    arg_parser.add_argument(
+        'action',
+        choices=['lint', 'offerings', 'catalog', 'rollups', 'histories', 'prerequisites', 'publish'],
+        help='the action to take',
+    )
     arg_parser.add_argument('arg', nargs='?', help='argument depending on the action')
+    arg_parser.add_argument('--record', metavar='DIR', help='save the Course Counts responses to a directory')
+    arg_parser.add_argument(
+        '--replay', metavar='DIR',
+        help='use saved Course Counts responses instead of the live site',
+    )
+    arg_parser.add_argument('--timings', action='store_true', help='report the time spent in each phase of the update')
     args = arg_parser.parse_args()
-    DB_PATH.unlink()
-    create_db()
+    if args.record and args.replay:
+        arg_parser.error('only one of --record and --replay can be used')
+    if ENGINE.dialect.name != 'sqlite' or (ENGINE.url.database != str(DB_PATH) and not args.replay):
+        arg_parser.error('updates are made to the SQLite database; unset SUBITIZE_DATABASE_URL and use publish')
+    if args.replay:
+        # a replay only rehearses an update, so it must not overwrite the bundled data
+        if ENGINE.url.database == str(DB_PATH) or OUTPUT_DIR == DATA_DIR:
+            arg_parser.error(
+                '--replay writes to a scratch database; '
+                'set SUBITIZE_DATABASE_URL and SUBITIZE_OUTPUT_DIR outside subitize/data'
+            )
+        use_scratch_output(OUTPUT_DIR)
+    if args.action == 'publish' and not args.arg:
+        arg_parser.error('publish requires the URL of the database to publish to')
+    # start from the committed dump; the database is overwritten rather than
+    # deleted, and kept afterwards, so that running servers see the update
+    # (and its new data version) as soon as it is committed
+    create_db(rebuild=True)
     if args.action == 'lint':
         lint()
     elif args.action == 'offerings':
         if args.arg:
-            semester = args.arg
+            semesters = args.arg.split(',')
+        else:
+            semesters = [Semester.current_semester_code()]
+        # one HTTP session is shared by all semesters
+        if args.record:
+            transport = RecordingTransport(args.record, requests.Session())
+        elif args.replay:
+            transport = ReplayTransport(args.replay)
         else:
-            semester = Semester.current_semester_code()
-        update_offerings(semester)
+            transport = requests.Session()
+        update_semesters(semesters, transport=transport)
     elif args.action == 'catalog':
         if args.arg:
             year = int(args.arg)
         else:
             year = int(Semester.current_semester_code()[:4])
         update_course_info(year)
-    DB_PATH.unlink()
+    elif args.action == 'rollups':
+        update_rollups(args.arg)
+        dump()
+    elif args.action == 'histories':
+        update_course_histories(args.arg)
+        dump()
+    elif args.action == 'prerequisites':
+        update_parsed_prerequisites(int(args.arg) if args.arg else None)
+        dump()
+    elif args.action == 'publish':
+        publish(args.arg)
+    if args.timings:
+        TIMER.report()
 
 
 if __name__ == '__main__':
@@ -2,16 +2,23 @@
 
 # pylint: disable = line-too-long
 
-from .models import create_session, create_db, get_or_create
+from .models import create_session, create_db, get_or_create, get_data_version
 from .models import Semester
 from .models import TimeSlot, Building, Room, Meeting
 from .models import Core, Department, Course
 from .models import Person
 from .models import OfferingMeeting, OfferingCore, OfferingInstructor, Offering
 from .models import CourseDescription
+from .models import DataVersion, OfferingFragment, OfferingTombstone
+from .models import DepartmentStats, CoreStats, CourseHistory
 from .subitizelib import create_select
 from .subitizelib import filter_study_abroad, filter_by_search
 from .subitizelib import filter_by_semester, filter_by_department, filter_by_number_str, filter_by_number, filter_by_section
 from .subitizelib import filter_by_instructor, filter_by_units, filter_by_core, filter_by_meeting, filter_by_openness
+from .subitizelib import filter_by_fuzzy_search, filter_by_fuzzy_instructor, filter_by_prerequisites
 from .subitizelib import sort_offerings
+from .search import SearchIndex, RelevanceIndex
+from .bitmaps import FilterIndex
+from .prerequisites import PrerequisiteGraph
+from .analytics import RoomOccupancy, RoomSchedule, get_room_meetings
 from .app import app
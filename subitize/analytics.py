@@ -0,0 +1,358 @@
+"""Room utilization analytics for subitize.
+
+Aggregate room usage is answered from an occupancy array, indexed by semester, room,
+weekday, and five-minute slot of the day, that counts the meetings in each
+room at each time. The array is filled in a single vectorized pass: each
+meeting adds one at the slot it starts and subtracts one at the slot it ends,
+and a cumulative sum over the slots of the day gives the occupancy.
+
+Whether specific rooms are free is answered from a schedule of the sorted,
+non-overlapping busy intervals of each room on each weekday, so that each
+lookup is a binary search.
+"""
+
+from bisect import bisect_right
+from collections import defaultdict
+
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import select
+
+from .models import TimeSlot, Building, Room, Meeting, OfferingMeeting, Offering
+
+SLOT_MINUTES = 5
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+WEEKDAY_CODES = ''.join(abbr for abbr, _ in TimeSlot.ALIASES)
+
+
+def get_room_meetings(session, semester_codes):
+    """Get the weekly meeting times of every room.
+
+    Meetings shared by several offerings (eg. cross-listed courses) are only
+    included once.
+
+    Arguments:
+        session (Session): The sqlalchemy session to connect with.
+        semester_codes (list[str]): The semester codes.
+
+    Returns:
+        list[tuple[int, int, str, int, int]]: The semester ID, room ID,
+            weekdays, and start and end minute of each meeting.
+    """
+    statement = (
+        select(Offering.semester_id, Meeting.room_id, TimeSlot.weekdays, TimeSlot.start, TimeSlot.end)
+        .join(OfferingMeeting, OfferingMeeting.offering_id == Offering.id)
+        .join(Meeting, OfferingMeeting.meeting_id == Meeting.id)
+        .join(TimeSlot, Meeting.timeslot_id == TimeSlot.id)
+        .where(Offering.semester_id.in_([int(semester_code) for semester_code in semester_codes]))
+        .where(Meeting.room_id.is_not(None))
+        .distinct()
+    )
+    return [
+        (semester_id, room_id, weekdays, start.hour * 60 + start.minute, end.hour * 60 + end.minute)
+        for semester_id, room_id, weekdays, start, end in session.execute(statement)
+    ]
+
+
+def parse_hour(hour):
+    """Convert a military time to minutes from midnight.
+
+    Arguments:
+        hour (str): The time, in the format HHMM.
+
+    Returns:
+        int: The minutes from midnight.
+
+    Raises:
+        ValueError: If the time is invalid.
+    """
+    time = datetime.strptime(hour, '%H%M')
+    return time.hour * 60 + time.minute
+
+
+def parse_weekdays(days):
+    """Convert weekday codes to indices into TimeSlot.ALIASES.
+
+    Arguments:
+        days (str): The concatenated one-letter abbreviation of the weekdays.
+
+    Returns:
+        list[int]: The weekday indices.
+
+    Raises:
+        ValueError: If any of the weekday codes is invalid.
+    """
+    if not days or any(day not in WEEKDAY_CODES for day in days):
+        raise ValueError(f'invalid weekdays: {days}')
+    return sorted(set(WEEKDAY_CODES.index(day) for day in days))
+
+
+class RoomOccupancy:
+    """The occupancy of rooms over the week, for one or more semesters."""
+
+    def __init__(self, session, semester_codes):
+        """Initialize the occupancy array from the database.
+
+        Only rooms with at least one meeting in the semesters are included.
+
+        Arguments:
+            session (Session): The sqlalchemy session to connect with.
+            semester_codes (list[str]): The semester codes.
+        """
+        self.semesters = sorted(str(semester_code) for semester_code in semester_codes)
+        meetings = get_room_meetings(session, self.semesters)
+        room_ids = sorted(set(meeting[1] for meeting in meetings))
+        statement = (
+            select(Room.id, Room.building_code, Room.room, Building.name)
+            .join(Building)
+            .where(Room.id.in_(room_ids))
+            .order_by(Room.building_code, Room.room)
+        )
+        self.rooms = []
+        room_indices = {}
+        self.buildings = {}
+        building_positions = {}
+        building_indices = []
+        for room_id, building_code, room, building_name in session.execute(statement):
+            room_indices[room_id] = len(self.rooms)
+            self.rooms.append((building_code, room))
+            if building_code not in self.buildings:
+                building_positions[building_code] = len(self.buildings)
+                self.buildings[building_code] = building_name
+            building_indices.append(building_positions[building_code])
+        self.building_indices = np.array(building_indices, dtype=np.intp)
+        semester_indices = {int(semester_code): i for i, semester_code in enumerate(self.semesters)}
+        indices = []
+        for semester_id, room_id, weekdays, start_minute, end_minute in meetings:
+            if end_minute <= start_minute:
+                continue
+            for day in weekdays:
+                if day in WEEKDAY_CODES:
+                    indices.append((
+                        semester_indices[semester_id], room_indices[room_id],
+                        WEEKDAY_CODES.index(day), start_minute, end_minute,
+                    ))
+        indices = np.array(indices, dtype=np.intp).reshape(-1, 5)
+        start_slots = indices[:, 3] // SLOT_MINUTES
+        end_slots = np.minimum(-(-indices[:, 4] // SLOT_MINUTES), SLOTS_PER_DAY)
+        changes = np.zeros(
+            (len(self.semesters), len(self.rooms), len(WEEKDAY_CODES), SLOTS_PER_DAY + 1),
+            dtype=np.int16,
+        )
+        np.add.at(changes, (indices[:, 0], indices[:, 1], indices[:, 2], start_slots), 1)
+        np.add.at(changes, (indices[:, 0], indices[:, 1], indices[:, 2], end_slots), -1)
+        self.occupancy = np.cumsum(changes, axis=3, dtype=np.int16)[..., :SLOTS_PER_DAY]
+
+    def _busy(self, days, start_minute=0, end_minute=24 * 60):
+        """Get whether each room is in use during a weekly time window.
+
+        Arguments:
+            days (str): The weekdays of the window.
+            start_minute (int): The start of the window, in minutes from
+                midnight. Optional.
+            end_minute (int): The end of the window, in minutes from
+                midnight. Optional.
+
+        Returns:
+            numpy.ndarray: A boolean array indexed by semester, room, weekday,
+                and slot.
+
+        Raises:
+            ValueError: If any of the weekday codes is invalid, or if the
+                window is empty.
+        """
+        if end_minute <= start_minute:
+            raise ValueError(f'empty time window: {start_minute}-{end_minute}')
+        start_slot = start_minute // SLOT_MINUTES
+        end_slot = -(-end_minute // SLOT_MINUTES)
+        return self.occupancy[:, :, parse_weekdays(days), start_slot:end_slot] > 0
+
+    def _by_building(self, values):
+        """Average per-room values over the rooms of each building.
+
+        Arguments:
+            values (numpy.ndarray): An array whose first axis is the room.
+
+        Returns:
+            numpy.ndarray: An array whose first axis is the building.
+        """
+        totals = np.zeros((len(self.buildings),) + values.shape[1:])
+        np.add.at(totals, self.building_indices, values)
+        counts = np.bincount(self.building_indices, minlength=len(self.buildings))
+        return totals / counts.reshape((-1,) + (1,) * (values.ndim - 1))
+
+    def utilization(self, days, start_minute, end_minute):
+        """Get the fraction of time that the rooms of each building are in use.
+
+        Arguments:
+            days (str): The weekdays to consider.
+            start_minute (int): The start of the day, in minutes from midnight.
+            end_minute (int): The end of the day, in minutes from midnight.
+
+        Returns:
+            dict[str, float]: The utilization of each building.
+
+        Raises:
+            ValueError: If any of the weekday codes is invalid, or if the
+                window is empty.
+        """
+        busy = self._busy(days, start_minute, end_minute)
+        if not self.rooms:
+            return {}
+        per_room = busy.mean(axis=(0, 2, 3))
+        return dict(zip(self.buildings, self._by_building(per_room).tolist()))
+
+    def hourly_utilization(self, days):
+        """Get the fraction of time that the rooms of each building are in use, by hour.
+
+        Arguments:
+            days (str): The weekdays to consider.
+
+        Returns:
+            dict[str, list[float]]: The utilization of each building for each
+                hour of the day.
+        """
+        if not self.rooms:
+            return {}
+        busy = self._busy(days)
+        busy = busy.reshape(busy.shape[:3] + (24, 60 // SLOT_MINUTES))
+        per_room = busy.mean(axis=(0, 2, 4))
+        return dict(zip(self.buildings, self._by_building(per_room).tolist()))
+
+    def peak_hours(self, days, limit=5):
+        """Get the hours of the week with the most rooms in use.
+
+        Arguments:
+            days (str): The weekdays to consider.
+            limit (int): The maximum number of hours. Optional.
+
+        Returns:
+            list[tuple[str, int, float]]: The weekday, the hour, and the
+                average number of rooms in use, from busiest to least busy.
+        """
+        weekdays = parse_weekdays(days)
+        if not self.rooms:
+            return []
+        in_use = self._busy(days).sum(axis=1).mean(axis=0)
+        in_use = in_use.reshape(len(weekdays), 24, 60 // SLOT_MINUTES).mean(axis=2)
+        order = np.argsort(-in_use, axis=None, kind='stable')[:limit]
+        return [
+            (WEEKDAY_CODES[weekdays[index // 24]], int(index % 24), float(in_use.flat[index]))
+            for index in order
+        ]
+
+    def free_rooms(self, days, start_minute, end_minute):
+        """Find the rooms that are not in use during a weekly time window.
+
+        Arguments:
+            days (str): The weekdays of the window.
+            start_minute (int): The start of the window, in minutes from
+                midnight.
+            end_minute (int): The end of the window, in minutes from midnight.
+
+        Returns:
+            list[tuple[str, str]]: The building code and room number of the
+                free rooms.
+
+        Raises:
+            ValueError: If any of the weekday codes is invalid, or if the
+                window is empty.
+        """
+        busy = self._busy(days, start_minute, end_minute)
+        if not self.rooms:
+            return []
+        busy = busy.any(axis=(0, 2, 3))
+        return [room for room, room_busy in zip(self.rooms, busy.tolist()) if not room_busy]
+
+
+class RoomSchedule:
+    """The busy intervals of every room over the week, for a semester."""
+
+    def __init__(self, session, semester_code):
+        """Initialize the schedule from the database.
+
+        Arguments:
+            session (Session): The sqlalchemy session to connect with.
+            semester_code (str): The semester code.
+        """
+        self.semester = str(semester_code)
+        self.rooms = {
+            room_id: (building_code, room)
+            for room_id, building_code, room in session.execute(
+                select(Room.id, Room.building_code, Room.room)
+                .where(Room.room.is_not(None))
+                .order_by(Room.building_code, Room.room)
+            )
+        }
+        intervals = defaultdict(list)
+        for _, room_id, weekdays, start_minute, end_minute in get_room_meetings(session, [self.semester]):
+            if room_id not in self.rooms or end_minute <= start_minute:
+                continue
+            for day in weekdays:
+                if day in WEEKDAY_CODES:
+                    intervals[(room_id, day)].append((start_minute, end_minute))
+        # merge overlapping intervals, so that both starts and ends are sorted
+        self.starts = {}
+        self.ends = {}
+        for key, room_intervals in intervals.items():
+            starts = []
+            ends = []
+            for start_minute, end_minute in sorted(room_intervals):
+                if ends and start_minute <= ends[-1]:
+                    ends[-1] = max(ends[-1], end_minute)
+                else:
+                    starts.append(start_minute)
+                    ends.append(end_minute)
+            self.starts[key] = starts
+            self.ends[key] = ends
+
+    def is_free(self, room_id, days, start_minute, end_minute):
+        """Check if a room is free during a weekly time window.
+
+        Arguments:
+            room_id (int): The ID of the room.
+            days (str): The weekdays of the window.
+            start_minute (int): The start of the window, in minutes from
+                midnight.
+            end_minute (int): The end of the window, in minutes from midnight.
+
+        Returns:
+            bool: True if the room has no meetings during the window.
+        """
+        for day in days:
+            ends = self.ends.get((room_id, day))
+            if not ends:
+                continue
+            # the first interval that ends after the window starts
+            index = bisect_right(ends, start_minute)
+            if index < len(ends) and self.starts[(room_id, day)][index] < end_minute:
+                return False
+        return True
+
+    def free_rooms(self, days, start_minute, end_minute, building=None):
+        """Find the rooms that are free during a weekly time window.
+
+        Arguments:
+            days (str): The weekdays of the window.
+            start_minute (int): The start of the window, in minutes from
+                midnight.
+            end_minute (int): The end of the window, in minutes from midnight.
+            building (str): The building code. Optional.
+
+        Returns:
+            list[tuple[str, str]]: The building code and room number of the
+                free rooms.
+
+        Raises:
+            ValueError: If any of the weekday codes is invalid, or if the
+                window is empty.
+        """
+        parse_weekdays(days)
+        if end_minute <= start_minute:
+            raise ValueError(f'empty time window: {start_minute}-{end_minute}')
+        return [
+            (building_code, room) for room_id, (building_code, room) in self.rooms.items()
+            if (building is None or building_code == building)
+            and self.is_free(room_id, days, start_minute, end_minute)
+        ]
@@ -0,0 +1,341 @@
+"""The data API of the subitize web-app.
+
+Besides searching, the app serves the changes to offerings since a data
+version, streams of seat changes, room utilization and availability,
+enrollment totals, course histories, and prerequisites. These views are
+registered on the app as a blueprint.
+"""
+
+from queue import Empty
+from threading import Lock
+
+from flask import Blueprint, Response, abort, request
+from sqlalchemy import or_, select
+from sqlalchemy.sql.expression import desc
+
+from .models import create_session, get_data_version
+from .models import Semester, Offering, OfferingFragment, OfferingTombstone
+from .models import Course, DepartmentStats, CoreStats, CourseHistory
+from .analytics import RoomOccupancy, RoomSchedule, parse_hour
+from .compact import encode_json
+from .watch import WATCH_HEARTBEAT_SECONDS, WATCH_LIMIT, SeatWatcher
+from .metrics import timed
+from .app import get_context_template, get_indices, get_fragments, get_offering_ids
+
+def get_room_schedule(semester_code):
+    """Get (rebuilding if the data has changed) the room schedule of a semester.
+
+    Arguments:
+        semester_code (str): The semester code.
+
+    Returns:
+        RoomSchedule: The room schedule.
+    """
+    with create_session() as session:
+        version = get_data_version(session)
+        with ROOM_SCHEDULES_LOCK:
+            if ROOM_SCHEDULES.get(semester_code, (None, None))[0] != version:
+                ROOM_SCHEDULES[semester_code] = (version, RoomSchedule(session, semester_code))
+            return ROOM_SCHEDULES[semester_code][1]
+
+
+ROOM_SCHEDULES = {}
+ROOM_SCHEDULES_LOCK = Lock()
+
+
+def get_room_occupancy(semester_codes):
+    """Get (rebuilding if the data has changed) the room occupancy of some semesters.
+
+    Arguments:
+        semester_codes (list[str]): The semester codes.
+
+    Returns:
+        RoomOccupancy: The room occupancy.
+    """
+    key = tuple(sorted(set(semester_codes)))
+    with create_session() as session:
+        version = get_data_version(session)
+        with ROOM_OCCUPANCIES_LOCK:
+            if ROOM_OCCUPANCIES.get(key, (None, None))[0] != version:
+                ROOM_OCCUPANCIES.pop(key, None)
+                # every combination of semesters has its own array, so only the latest few are kept
+                while len(ROOM_OCCUPANCIES) >= ROOM_OCCUPANCY_LIMIT:
+                    del ROOM_OCCUPANCIES[next(iter(ROOM_OCCUPANCIES))]
+                ROOM_OCCUPANCIES[key] = (version, RoomOccupancy(session, key))
+            return ROOM_OCCUPANCIES[key][1]
+
+
+ROOM_OCCUPANCIES = {}
+ROOM_OCCUPANCIES_LOCK = Lock()
+ROOM_OCCUPANCY_LIMIT = 16
+
+SEAT_WATCHER = SeatWatcher()
+
+api = Blueprint('api', __name__) # pylint: disable = invalid-name
+
+
+@api.route('/changes/')
+def view_changes():
+    """Serve the offerings that were added, changed, or deleted since a data version."""
+    since = request.args.get('since', '0')
+    if not since.isdigit():
+        return abort(400)
+    since = int(since)
+    readable_ids = [readable_id for readable_id in request.args.get('ids', '').split(',') if readable_id]
+    if any(readable_id.count('_') != 3 for readable_id in readable_ids):
+        return abort(400)
+    with create_session() as session:
+        version = get_data_version(session)
+        if since > version:
+            # the client has data from a different database; start over
+            since = 0
+        with timed('build_search_query'):
+            fragment_statement = select(OfferingFragment.offering_id).where(OfferingFragment.version > since)
+            tombstone_statement = (
+                select(OfferingTombstone.readable_id)
+                .where(OfferingTombstone.version > since)
+                .order_by(OfferingTombstone.readable_id)
+            )
+            if readable_ids:
+                existing_ids = get_offering_ids(session, readable_ids)
+                changed_ids = set(session.scalars(
+                    fragment_statement.where(OfferingFragment.offering_id.in_(existing_ids.values()))
+                ))
+                # offerings without a stored fragment have never been seen by the client either
+                unversioned_ids = set(existing_ids.values()) - set(session.scalars(
+                    select(OfferingFragment.offering_id)
+                    .where(OfferingFragment.offering_id.in_(existing_ids.values()))
+                ))
+                offering_ids = sorted(changed_ids | unversioned_ids)
+                tombstone_statement = tombstone_statement.where(OfferingTombstone.readable_id.in_(readable_ids))
+            else:
+                # offerings without a stored fragment are changed too, so that a first sync gets everything
+                offering_ids = list(session.scalars(
+                    select(Offering.id)
+                    .outerjoin(OfferingFragment, OfferingFragment.offering_id == Offering.id)
+                    .where(or_(OfferingFragment.version > since, OfferingFragment.offering_id.is_(None)))
+                    .order_by(Offering.id)
+                ))
+        with timed('serialize'):
+            fragments = get_fragments(session, offering_ids)
+            deleted = set(session.scalars(tombstone_statement))
+            deleted -= set(get_offering_ids(session, sorted(deleted)))
+    with timed('encode'):
+        return Response(
+            '{"changed":[' + ','.join(fragments) + ']'
+            + ',"deleted":' + encode_json(sorted(deleted))
+            + ',"since":' + encode_json(since)
+            + ',"version":' + encode_json(version)
+            + '}',
+            mimetype='application/json',
+        )
+
+
+def format_event(event, version, data):
+    """Format a server-sent event.
+
+    Arguments:
+        event (str): The type of the event.
+        version (int): The data version, used as the event ID.
+        data (object): The JSON-serializable data of the event.
+
+    Returns:
+        str: The event, in the text/event-stream format.
+    """
+    return f'event: {event}\nid: {version}\ndata: {encode_json(data)}\n\n'
+
+
+@api.route('/watch/')
+def view_watch():
+    """Stream the changes to the seats of comma-separated offerings."""
+    readable_ids = sorted(set(readable_id for readable_id in request.args.get('ids', '').split(',') if readable_id))
+    if not readable_ids or len(readable_ids) > WATCH_LIMIT:
+        return abort(400)
+    if any(readable_id.count('_') != 3 for readable_id in readable_ids):
+        return abort(400)
+    with create_session() as session:
+        subscription = SEAT_WATCHER.subscribe(session, get_offering_ids(session, readable_ids))
+    # a reconnecting client that has seen the current version only needs later changes
+    last_event_id = request.headers.get('Last-Event-ID')
+
+    def stream():
+        try:
+            if last_event_id != str(subscription.version):
+                yield format_event('seats', subscription.version, subscription.seats)
+            else:
+                # servers only send the headers with the first chunk of the body
+                yield ': resumed\n\n'
+            while True:
+                try:
+                    version, changes = subscription.events.get(timeout=WATCH_HEARTBEAT_SECONDS)
+                except Empty:
+                    # comments keep proxies from closing the connection, and detect clients that left
+                    yield ': heartbeat\n\n'
+                    continue
+                yield format_event('seats', version, changes)
+        finally:
+            SEAT_WATCHER.unsubscribe(subscription)
+
+    return Response(
+        stream(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+@api.route('/rooms/')
+def view_rooms():
+    """Serve the room utilization of one or more comma-separated semesters."""
+    semester_codes = request.args.get('semester', Semester.current_semester_code()).split(',')
+    days = request.args.get('day', 'MTWRF')
+    start_hour = request.args.get('start_hour', '0800')
+    end_hour = request.args.get('end_hour', '1800')
+    valid_codes = set(semester.code for semester in get_context_template()['semesters'])
+    if any(semester_code not in valid_codes for semester_code in semester_codes):
+        return abort(404)
+    try:
+        start_minute = parse_hour(start_hour)
+        end_minute = parse_hour(end_hour)
+        with timed('build_search_query'):
+            occupancy = get_room_occupancy(semester_codes)
+        with timed('serialize'):
+            utilization = occupancy.utilization(days, start_minute, end_minute)
+            hourly_utilization = occupancy.hourly_utilization(days)
+            peak_hours = occupancy.peak_hours(days)
+    except ValueError:
+        return abort(400)
+    with timed('encode'):
+        return Response(
+            encode_json({
+                'semesters': occupancy.semesters,
+                'day': days,
+                'start_hour': start_hour,
+                'end_hour': end_hour,
+                'buildings': {
+                    code: {
+                        'name': name,
+                        'rooms': sum(1 for building_code, _ in occupancy.rooms if building_code == code),
+                        'utilization': round(utilization[code], 4),
+                        'hourly_utilization': [round(value, 4) for value in hourly_utilization[code]],
+                    }
+                    for code, name in occupancy.buildings.items()
+                },
+                'peak_hours': [
+                    {'day': day, 'hour': hour, 'rooms_in_use': round(rooms_in_use, 2)}
+                    for day, hour, rooms_in_use in peak_hours
+                ],
+            }),
+            mimetype='application/json',
+        )
+
+
+@api.route('/rooms/free/')
+def view_free_rooms():
+    """Serve the rooms that are free during a weekly time window."""
+    semester_code = request.args.get('semester', Semester.current_semester_code())
+    days = request.args.get('day')
+    start_hour = request.args.get('start_hour')
+    end_hour = request.args.get('end_hour')
+    building = request.args.get('building') or None
+    if semester_code not in set(semester.code for semester in get_context_template()['semesters']):
+        return abort(404)
+    if days is None or start_hour is None or end_hour is None:
+        return abort(400)
+    try:
+        with timed('build_search_query'):
+            schedule = get_room_schedule(semester_code)
+            rooms = schedule.free_rooms(days, parse_hour(start_hour), parse_hour(end_hour), building)
+    except ValueError:
+        return abort(400)
+    with timed('encode'):
+        return Response(
+            encode_json({
+                'semester': semester_code,
+                'day': days,
+                'start_hour': start_hour,
+                'end_hour': end_hour,
+                'building': building,
+                'rooms': [{'building': building_code, 'room': room} for building_code, room in rooms],
+            }),
+            mimetype='application/json',
+        )
+
+
+@api.route('/stats/')
+def view_stats():
+    """Serve the enrollment totals of departments or core requirements."""
+    semester = request.args.get('semester', Semester.current_semester_code())
+    group = request.args.get('by', 'department')
+    if group == 'department':
+        model, code_column = DepartmentStats, DepartmentStats.department_code
+    elif group == 'core':
+        model, code_column = CoreStats, CoreStats.core_code
+    else:
+        return abort(400)
+    statement = select(model).order_by(desc(model.semester_id), code_column)
+    if semester != 'any':
+        semester_codes = semester.split(',')
+        if not all(semester_code.isdigit() for semester_code in semester_codes):
+            return abort(400)
+        statement = statement.where(model.semester_id.in_([int(semester_code) for semester_code in semester_codes]))
+    with create_session() as session:
+        with timed('serialize'):
+            results = [
+                {
+                    'semester': str(stats.semester_id),
+                    group: getattr(stats, code_column.key),
+                    'num_sections': stats.num_sections,
+                    'num_seats': stats.num_seats,
+                    'num_enrolled': stats.num_enrolled,
+                    'num_waitlisted': stats.num_waitlisted,
+                    'fill_rate': None if stats.fill_rate is None else round(stats.fill_rate, 4),
+                }
+                for stats in session.scalars(statement)
+            ]
+    with timed('encode'):
+        return Response(
+            encode_json({'semester': semester, 'by': group, 'results': results}),
+            mimetype='application/json',
+        )
+
+
+@api.route('/history/<department>/<number>')
+def view_history(department, number):
+    """Serve the offering history of a course."""
+    with create_session() as session:
+        history = session.scalar(
+            select(CourseHistory.history)
+            .join(Course, CourseHistory.course_id == Course.id)
+            .where(Course.department_code == department.upper())
+            .where(Course.number == number.upper())
+        )
+    if history is None:
+        return abort(404)
+    return Response(history, mimetype='application/json')
+
+
+@api.route('/prerequisites/<department>/<number>')
+def view_prerequisites(department, number):
+    """Serve the prerequisites of a course, and the courses it unlocks."""
+    graph = get_indices().prerequisites
+    course_id = graph.courses.get((department.upper(), number.upper()))
+    if course_id is None:
+        return abort(404)
+    names = graph.names
+    response = {
+        'course': names[course_id],
+        'prerequisites': [
+            sorted(names[prerequisite_id] for prerequisite_id in clause)
+            for clause in graph.requirements.get(course_id, [])
+        ],
+        'all_prerequisites': sorted(names[other_id] for other_id in graph.all_prerequisites(course_id)),
+        'unlocks': sorted(names[other_id] for other_id in graph.unlocks(course_id)),
+    }
+    if 'completed' in request.args:
+        completed = graph.parse_courses(request.args['completed'])
+        response['missing'] = [
+            sorted(names[prerequisite_id] for prerequisite_id in clause)
+            for clause in graph.missing(course_id, completed)
+        ]
+        response['eligible'] = not response['missing']
+    return Response(encode_json(response), mimetype='application/json')
@@ -4,27 +4,44 @@
 
 """The subitize web-app."""
 
+import atexit
+import gzip
+import json
 from collections import namedtuple
 from copy import copy
 from datetime import datetime
 from pathlib import Path
+from threading import Lock, Thread
+from urllib.parse import urlencode, parse_qsl
 
-from flask import Flask, render_template, abort, request, send_from_directory, url_for, redirect
-from flask.json import jsonify
+from flask import Flask, Response, render_template, abort, request, send_from_directory, url_for, redirect, g
+from flask import has_request_context
 from sqlalchemy import select
 from sqlalchemy.sql.expression import asc, desc
+from werkzeug.exceptions import HTTPException
 
-from .models import create_session
-from .models import Semester, Core, Department, Person, Offering
+from .models import DB_PATH, create_session, get_data_version
+from .models import Semester, Core, Department, Person, Offering, OfferingFragment
 from .subitizelib import create_select
 from .subitizelib import filter_study_abroad, filter_by_search
 from .subitizelib import filter_by_semester, filter_by_department, filter_by_instructor
 from .subitizelib import filter_by_number, filter_by_number_str, filter_by_section
 from .subitizelib import filter_by_units, filter_by_core, filter_by_meeting, filter_by_openness
+from .subitizelib import filter_by_fuzzy_search, filter_by_fuzzy_instructor, filter_by_prerequisites
 from .subitizelib import sort_offerings
+from .search import SearchIndex, RelevanceIndex
+from .bitmaps import FilterIndex
+from .shards import SHARD_DIR, create_shards, get_shard_codes, create_shard_session
+from .compact import compact_results, encode_json, encode_msgpack
+from .snapshots import SNAPSHOT_DIR, write_snapshot
+from .prerequisites import PrerequisiteGraph
+from .cache import WARM_LIMIT, ResultCache, QueryLog, read_query_log, warm_page_cache
+from .metrics import METRICS, start_request, finish_request, timed
+from .slowlog import QUERY_DEBUG, check_query_budget
 
 Day = namedtuple('Day', ['abbr', 'name'])
 Hour = namedtuple('Hour', ['value', 'display'])
+Indices = namedtuple('Indices', ['version', 'search', 'filter', 'relevance', 'prerequisites'])
 
 DEFAULT_OPTIONS = {
     'advanced': 'false',
@@ -90,14 +107,87 @@ def create_context_template():
         }
 
 
-CONTEXT_TEMPLATE = create_context_template()
+def create_indices(session):
+    """Create the in-memory indices of the current data.
+
+    Arguments:
+        session (Session): The sqlalchemy session to connect with.
+
+    Returns:
+        Indices: The data version, and the fuzzy search, bitmap filter,
+            relevance ranking, and prerequisite indices of that version.
+    """
+    return Indices(
+        get_data_version(session),
+        SearchIndex(session),
+        FilterIndex(session),
+        RelevanceIndex(session),
+        PrerequisiteGraph(session),
+    )
+
+
+def get_indices():
+    """Get (rebuilding if the data has changed) the in-memory indices.
+
+    The data version is only checked once per request, so that a request
+    uses the same indices throughout. When the data changes, the cached
+    results are dropped, and the most frequent searches are run again in
+    the background.
+
+    Returns:
+        Indices: The indices.
+    """
+    global INDICES # pylint: disable = global-statement
+    if has_request_context() and 'indices' in g:
+        return g.indices
+    swapped = False
+    with create_session() as session:
+        version = get_data_version(session)
+        with INDICES_LOCK:
+            if INDICES is None or INDICES.version != version:
+                swapped = INDICES is not None
+                INDICES = create_indices(session)
+            indices = INDICES
+    if swapped:
+        RESULT_CACHE.clear()
+        Thread(target=warm_result_cache, name='subitize-warm', daemon=True).start()
+    if has_request_context():
+        g.indices = indices
+    return indices
+
+
+def get_context_template():
+    """Get (recreating if the data has changed) the context template.
+
+    Returns:
+        dict: The context.
+    """
+    global CONTEXT_TEMPLATE # pylint: disable = global-statement
+    version = get_indices().version
+    with CONTEXT_TEMPLATE_LOCK:
+        if CONTEXT_TEMPLATE[0] != version:
+            CONTEXT_TEMPLATE = (version, create_context_template())
+        return CONTEXT_TEMPLATE[1]
+
+
+# built now, so that a preloading server shares them with its workers
+INDICES = None
+INDICES_LOCK = Lock()
+CONTEXT_TEMPLATE = (None, None)
+CONTEXT_TEMPLATE_LOCK = Lock()
+get_context_template()
 
 JSON_RESULT_LIMIT = 200
 
 ROOT_DIRECTORY = Path(__file__).resolve().parent
 LAST_UPDATE_FILE = ROOT_DIRECTORY / 'data' / 'last-update'
 
-VALID_SORTS = set(['semester', 'course', 'title', 'units', 'instructors', 'meetings', 'cores'])
+SEARCH_PARAMETERS = [
+    'open', 'department', 'lower', 'upper', 'units', 'instructor', 'core',
+    'day', 'start_hour', 'end_hour', 'completed', 'query', 'sort',
+]
+
+VALID_SORTS = set(['semester', 'course', 'title', 'units', 'instructors', 'meetings', 'cores', 'relevance'])
 
 
 def get_parameter_or_none(parameters, parameter):
@@ -122,11 +212,150 @@ def get_parameter_or_none(parameters, parameter):
         return None
 
 
-def build_search_query(parameters):
+def get_search_semester(parameters):
+    """Get the semester to search.
+
+    Arguments:
+        parameters (dict): The parameters of the current search.
+
+    Returns:
+        str: The semester code, or None if all semesters should be searched.
+    """
+    semester = get_parameter_or_none(parameters, 'semester')
+    if semester is None:
+        return Semester.current_semester_code()
+    elif semester == 'any':
+        return None
+    else:
+        return semester
+
+
+def get_shards():
+    """Get the semesters with shards of the current data.
+
+    Shards are not written here; until the update script has written them
+    for the current data version, there are none, and searches use the full
+    database.
+
+    Returns:
+        list[str]: The semester codes, most recent first.
+    """
+    global SHARD_CODES # pylint: disable = global-statement
+    version = get_indices().version
+    if SHARD_CODES[0] == version:
+        return SHARD_CODES[1]
+    shard_codes = get_shard_codes(version)
+    if shard_codes:
+        # only found shards are kept, so that those written after the data changed are noticed
+        SHARD_CODES = (version, shard_codes)
+    return shard_codes
+
+
+SHARD_CODES = (None, [])
+
+
+def create_search_session(semester):
+    """Create a session for searching a semester.
+
+    Arguments:
+        semester (str): The semester code, or None for all semesters.
+
+    Returns:
+        Session: A session on the semester's shard if there is one, or on
+            the full database otherwise.
+    """
+    if semester is not None and semester in get_shards():
+        session = create_shard_session(semester)
+        if session is not None:
+            return session
+    return create_session()
+
+
+def search_shards(parameters):
+    """Search across all semesters by querying each shard in turn.
+
+    Shards are searched from the most recent semester back, stopping once
+    there are enough results. This is only correct for the default sort,
+    under which the results of each semester are contiguous.
+
+    Arguments:
+        parameters (dict): The parameters of the current search.
+
+    Returns:
+        list[str]: The encoded JSON of the results, or None if the search
+            cannot be answered this way.
+    """
+    shard_codes = get_shards()
+    if not shard_codes or get_parameter_or_none(parameters, 'sort') not in (None, 'semester'):
+        return None
+    results = []
+    for semester_code in shard_codes:
+        with create_shard_session(semester_code) as session:
+            statement = build_search_query(dict(parameters, semester=semester_code))
+            statement = statement.with_only_columns(Offering.id).limit(JSON_RESULT_LIMIT - len(results))
+            results.extend(get_fragments(session, list(session.scalars(statement))))
+        if len(results) >= JSON_RESULT_LIMIT:
+            break
+    return results
+
+
+def get_fragments(session, offering_ids):
+    """Get the encoded JSON of offerings.
+
+    Fragments are read from those stored by the update script; any offerings
+    without a stored fragment are serialized on the spot.
+
+    Arguments:
+        session (Session): The sqlalchemy session to connect with.
+        offering_ids (list[int]): The IDs of the offerings.
+
+    Returns:
+        list[str]: The encoded JSON of the offerings, in order.
+    """
+    if not offering_ids:
+        return []
+    fragments = dict(session.execute(
+        select(OfferingFragment.offering_id, OfferingFragment.fragment)
+        .where(OfferingFragment.offering_id.in_(offering_ids))
+    ).all())
+    missing = [offering_id for offering_id in offering_ids if offering_id not in fragments]
+    if missing:
+        for offering in session.scalars(select(Offering).where(Offering.id.in_(missing))):
+            fragments[offering.id] = offering.to_json_fragment()
+    return [fragments[offering_id] for offering_id in offering_ids if offering_id in fragments]
+
+
+def get_offering_ids(session, readable_ids):
+    """Get the IDs of offerings from their readable IDs.
+
+    Arguments:
+        session (Session): The sqlalchemy session to connect with.
+        readable_ids (list[str]): The readable IDs, eg. "201801_COMP_131_1".
+
+    Returns:
+        dict[str, int]: The offering ID of each readable ID that exists.
+    """
+    offering_ids = {}
+    for readable_id in readable_ids:
+        semester, department, number, section = readable_id.split('_')
+        statement = create_select().with_only_columns(Offering.id)
+        statement = filter_by_semester(statement, semester)
+        statement = filter_by_department(statement, department)
+        statement = filter_by_number_str(statement, number)
+        statement = filter_by_section(statement, section)
+        offering_id = session.scalar(statement)
+        if offering_id is not None:
+            offering_ids[readable_id] = offering_id
+    return offering_ids
+
+
+def build_search_query(parameters, fuzzy=False):
     """Build a query for the search.
 
     Arguments:
         parameters (dict): The parameters of the current search.
+        fuzzy (bool): Whether to match the instructor and search terms
+            approximately. Defaults to False.
 
     Returns:
         Query: A sqlalchemy Query object representing the search.
@@ -135,14 +364,10 @@ def build_search_query(parameters):
     statement = create_select()
     if not parameters:
         return statement.limit(JSON_RESULT_LIMIT)
+    indices = get_indices()
     statement = filter_study_abroad(statement)
     # filter by semester
-    semester = get_parameter_or_none(parameters, 'semester')
-    if semester is None:
-        semester = Semester.current_semester_code()
-    elif semester == 'any':
-        semester = None
-    statement = filter_by_semester(statement, semester)
+    statement = filter_by_semester(statement, get_search_semester(parameters))
     # filter by advanced options
     if get_parameter_or_none(parameters, 'open'):
         statement = filter_by_openness(statement)
@@ -153,8 +378,16 @@ def build_search_query(parameters):
         get_parameter_or_none(parameters, 'upper'),
     )
     statement = filter_by_units(statement, get_parameter_or_none(parameters, 'units'))
-    statement = filter_by_instructor(statement, get_parameter_or_none(parameters, 'instructor'))
+    if fuzzy:
+        statement = filter_by_fuzzy_instructor(
+            statement, get_parameter_or_none(parameters, 'instructor'), indices.search,
+        )
+    else:
+        statement = filter_by_instructor(statement, get_parameter_or_none(parameters, 'instructor'))
     statement = filter_by_core(statement, get_parameter_or_none(parameters, 'core'))
+    statement = filter_by_prerequisites(
+        statement, get_parameter_or_none(parameters, 'completed') or None, indices.prerequisites,
+    )
     statement = filter_by_meeting(
         statement,
         get_parameter_or_none(parameters, 'day'),
@@ -162,24 +395,287 @@ def build_search_query(parameters):
         get_parameter_or_none(parameters, 'end_hour'),
     )
     # filter by search
-    statement = filter_by_search(statement, get_parameter_or_none(parameters, 'query'))
+    if fuzzy:
+        statement = filter_by_fuzzy_search(statement, get_parameter_or_none(parameters, 'query'), indices.search)
+    else:
+        statement = filter_by_search(statement, get_parameter_or_none(parameters, 'query'))
     # sort results
     sort = get_parameter_or_none(parameters, 'sort')
     if sort is not None and sort not in VALID_SORTS:
         raise abort(400)
-    statement = sort_offerings(statement, sort)
+    # relevance ranking is done in search_relevance; here, fall back to the
+    # fuzzy similarity (if any) and then the default order
+    statement = sort_offerings(statement, None if sort == 'relevance' else sort)
     # return
     return statement.limit(JSON_RESULT_LIMIT)
 
 
+def filter_bitmap(parameters):
+    """Apply the filters of a search, other than the search terms.
+
+    Arguments:
+        parameters (dict): The parameters of the current search.
+
+    Returns:
+        int: The bitmap of the matching offerings.
+    """
+    indices = get_indices()
+    index = indices.filter
+    bitmap = index.filter_study_abroad(index.all)
+    # filter by semester
+    bitmap = index.filter_by_semester(bitmap, get_search_semester(parameters))
+    # filter by advanced options
+    if get_parameter_or_none(parameters, 'open'):
+        bitmap = index.filter_by_openness(bitmap)
+    bitmap = index.filter_by_department(bitmap, get_parameter_or_none(parameters, 'department'))
+    bitmap = index.filter_by_number(
+        bitmap,
+        get_parameter_or_none(parameters, 'lower'),
+        get_parameter_or_none(parameters, 'upper'),
+    )
+    bitmap = index.filter_by_units(bitmap, get_parameter_or_none(parameters, 'units'))
+    bitmap = index.filter_by_instructor(bitmap, get_parameter_or_none(parameters, 'instructor'))
+    bitmap = index.filter_by_core(bitmap, get_parameter_or_none(parameters, 'core'))
+    bitmap = index.filter_by_prerequisites(
+        bitmap, get_parameter_or_none(parameters, 'completed') or None, indices.prerequisites,
+    )
+    bitmap = index.filter_by_meeting(
+        bitmap,
+        get_parameter_or_none(parameters, 'day'),
+        get_parameter_or_none(parameters, 'start_hour'),
+        get_parameter_or_none(parameters, 'end_hour'),
+    )
+    return bitmap
+
+
+def search_filter_index(parameters):
+    """Search for offerings using only the bitmap filter index.
+
+    Searches with search terms or sorts that the index does not support
+    cannot be answered this way, and must use build_search_query instead.
+
+    Arguments:
+        parameters (dict): The parameters of the current search.
+
+    Returns:
+        list[int]: The sorted IDs of the matching offerings, or None if the
+            search cannot be answered by the index.
+    """
+    if not parameters:
+        return None
+    sort = get_parameter_or_none(parameters, 'sort')
+    if sort is not None and sort not in VALID_SORTS:
+        abort(400)
+    if sort is not None and sort not in FilterIndex.SORTS:
+        return None
+    if get_parameter_or_none(parameters, 'query'):
+        return None
+    bitmap = filter_bitmap(parameters)
+    # sort and return results
+    return get_indices().filter.sorted_ids(bitmap, sort, JSON_RESULT_LIMIT)
+
+
+def search_relevance(parameters):
+    """Search for offerings, ranked by how well they match the search terms.
+
+    Matches are scored without being sorted, and only the top results are
+    kept and serialized, so ranking costs little more than filtering.
+    Offerings with the same score are in the default order, as are all
+    results of searches without search terms.
+
+    Arguments:
+        parameters (dict): The parameters of the current search.
+
+    Returns:
+        list[int]: The IDs of the matching offerings, from most to least
+            relevant.
+    """
+    indices = get_indices()
+    bitmap = filter_bitmap(parameters)
+    terms = get_parameter_or_none(parameters, 'query')
+    if not terms:
+        return indices.filter.sorted_ids(bitmap, None, JSON_RESULT_LIMIT)
+    return indices.relevance.search(
+        terms,
+        JSON_RESULT_LIMIT,
+        accept=(lambda offering_id: indices.filter.contains(bitmap, offering_id)),
+        tiebreak=indices.filter.rank,
+    )
+
+
+def search(parameters):
+    """Search for offerings.
+
+    Arguments:
+        parameters (dict): The parameters of the current search.
+
+    Returns:
+        tuple[list[str], bool]: The encoded JSON of the results, and whether
+            the search terms had to be matched approximately.
+    """
+    semester = get_search_semester(parameters) if parameters else None
+    with timed('build_search_query'):
+        if get_parameter_or_none(parameters, 'sort') == 'relevance':
+            offering_ids = search_relevance(parameters)
+        else:
+            offering_ids = search_filter_index(parameters)
+    if offering_ids is not None:
+        with create_search_session(semester) as session, timed('serialize'):
+            results = get_fragments(session, offering_ids)
+    else:
+        results = None
+        if parameters and semester is None:
+            results = search_shards(parameters)
+        if results is None:
+            with create_search_session(semester) as session:
+                with timed('build_search_query'):
+                    statement = build_search_query(parameters).with_only_columns(Offering.id)
+                with timed('serialize'):
+                    results = get_fragments(session, list(session.scalars(statement)))
+    # fall back to approximate matching if the exact search found nothing
+    fuzzy = False
+    if not results and any(get_parameter_or_none(parameters, key) for key in ('query', 'instructor')):
+        with create_search_session(semester) as session:
+            with timed('build_search_query'):
+                statement = build_search_query(parameters, fuzzy=True).with_only_columns(Offering.id)
+            with timed('serialize'):
+                results = get_fragments(session, list(session.scalars(statement)))
+        # the search is only reported as approximate if the approximation found something
+        fuzzy = bool(results)
+    return results, fuzzy
+
+
+def normalize_parameters(parameters):
+    """Normalize the parameters of a search.
+
+    Parameters that do not change the results (including those with default
+    values) are removed, and the rest are put in a canonical form, so that
+    equivalent searches have the same normalized parameters.
+
+    Arguments:
+        parameters (dict): The parameters of the current search.
+
+    Returns:
+        str: The normalized, URL-encoded parameters.
+    """
+    if not parameters:
+        return ''
+    normalized = {'semester': get_search_semester(parameters) or 'any'}
+    for key in SEARCH_PARAMETERS:
+        value = get_parameter_or_none(parameters, key)
+        if value:
+            normalized[key] = value
+    if 'query' in normalized:
+        normalized['query'] = ' '.join(normalized['query'].lower().split())
+    if 'completed' in normalized:
+        graph = get_indices().prerequisites
+        normalized['completed'] = ','.join(sorted(
+            graph.names[course_id]
+            for course_id in graph.parse_courses(normalized['completed'])
+        ))
+    return urlencode(sorted(normalized.items()))
+
+
+def warm_result_cache(limit=WARM_LIMIT):
+    """Run the most frequent searches in the query log, to fill the caches.
+
+    The database files are read first, so that they are in the OS page cache.
+
+    Arguments:
+        limit (int): The number of searches to run. Optional.
+    """
+    warm_page_cache([DB_PATH, *SHARD_DIR.glob('*.db')])
+    version = get_indices().version
+    for cache_key, _ in read_query_log()[:limit]:
+        if get_indices().version != version:
+            # the data changed again; the caches will be refilled for the new version
+            return
+        parameters = dict(parse_qsl(cache_key))
+        try:
+            RESULT_CACHE.put((version, normalize_parameters(parameters)), search(parameters))
+        except HTTPException:
+            continue
+
+
+def get_snapshot(semester_code):
+    """Get (creating if the data has changed) the snapshot of a semester.
+
+    Arguments:
+        semester_code (str): The semester code.
+
+    Returns:
+        str: The file name of the snapshot.
+    """
+    indices = get_indices()
+    with SNAPSHOTS_LOCK:
+        version, filename = SNAPSHOTS.get(semester_code, (None, None))
+        # the file may have been pruned by another process, if its data was newer
+        if version != indices.version or not (SNAPSHOT_DIR / filename).exists():
+            bitmap = indices.filter.filter_study_abroad(indices.filter.all)
+            bitmap = indices.filter.filter_by_semester(bitmap, semester_code)
+            with create_search_session(semester_code) as session:
+                fragments = get_fragments(session, indices.filter.sorted_ids(bitmap))
+            SNAPSHOTS[semester_code] = (
+                indices.version,
+                write_snapshot(semester_code, indices.version, fragments),
+            )
+        return SNAPSHOTS[semester_code][1]
+
+
+SNAPSHOTS = {}
+SNAPSHOTS_LOCK = Lock()
+
+
+RESULT_CACHE = ResultCache()
+QUERY_LOG = QueryLog()
+atexit.register(QUERY_LOG.flush)
+
+
+def prepare():
+    """Write the files derived from the data, and fill the caches.
+
+    This is called by each server before it accepts requests, and not on
+    import, so that merely importing the app does not write to disk.
+    Snapshots not prepared are instead created when first needed; shards are
+    only ever written here and by the update script.
+    """
+    create_shards()
+    get_snapshot(Semester.current_semester_code())
+    warm_result_cache()
+
+
 app = Flask(__name__, root_path=ROOT_DIRECTORY) # pylint: disable = invalid-name
 
 
+@app.before_request
+def before_request():
+    """Start timing the request."""
+    start_request()
+
+
+@app.after_request
+def after_request(response):
+    """Record the metrics of the request.
+
+    Arguments:
+        response (Response): The response to the request.
+
+    Returns:
+        Response: The unmodified response.
+    """
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    finish_request(route, response)
+    if QUERY_DEBUG:
+        check_query_budget(route, g.metrics_sql_statements)
+        response.headers['X-Query-Count'] = str(g.metrics_sql_statements)
+    return response
+
+
 @app.route('/')
 def view_root():
     """Serve the homepage."""
     parameters = request.args.to_dict()
-    context = copy(CONTEXT_TEMPLATE)
+    context = copy(get_context_template())
     if parameters.get('lower') is not None:
         context['lower'] = parameters.get('lower')
     if parameters.get('upper') is not None:
@@ -191,19 +687,30 @@ def view_root():
     context['defaults'].update(parameters)
     with LAST_UPDATE_FILE.open(encoding='utf-8') as fd:
         context['last_update'] = fd.read().strip()
-    return render_template('main.html', **context)
+    with timed('render'):
+        return render_template('main.html', **context)
 
 
 @app.route('/json/')
 def view_json():
     """Serve the JSON endpoint."""
     parameters = request.args.to_dict()
-    with create_session() as session:
-        results = [
-            offering.to_json_dict() for offering
-            in session.scalars(build_search_query(parameters))
-        ]
+    response_format = parameters.pop('format', 'full')
+    encoding = parameters.pop('encoding', 'json')
+    if response_format not in ('full', 'compact') or encoding not in ('json', 'msgpack'):
+        abort(400)
+    cache_key = normalize_parameters(parameters)
+    # results of other data versions are never served, even while the cache is being refilled
+    version = get_indices().version
+    cached = RESULT_CACHE.get((version, cache_key))
+    if cached is None:
+        cached = search(parameters)
+        RESULT_CACHE.put((version, cache_key), cached)
+    QUERY_LOG.record(cache_key)
+    results, fuzzy = cached
     metadata = {}
+    if fuzzy:
+        metadata['fuzzy'] = True
     if 'sort' in parameters:
         metadata['sorted'] = parameters['sort']
         del parameters['sort']
@@ -212,11 +719,22 @@ def view_json():
     if 'advanced' in parameters:
         metadata['advanced'] = parameters['advanced']
     metadata['parameters'] = url_for('view_root', **parameters)[2:]
-    response = {
-        'metadata': metadata,
-        'results': results,
-    }
-    return jsonify(response)
+    with timed('encode'):
+        if response_format == 'full' and encoding == 'json':
+            return Response(
+                '{"metadata":' + encode_json(metadata) + ',"results":[' + ','.join(results) + ']}',
+                mimetype='application/json',
+            )
+        response = {
+            'metadata': metadata,
+            'results': [json.loads(result) for result in results],
+        }
+        if response_format == 'compact':
+            response['tables'], response['results'] = compact_results(response['results'])
+        if encoding == 'msgpack':
+            return Response(encode_msgpack(response), mimetype='application/msgpack')
+        else:
+            return Response(encode_json(response), mimetype='application/json')
 
 
 @app.route('/simplify/')
@@ -243,27 +761,66 @@ def view_simplify():
 def view_fetch(readable_ids):
     """Fetch the details of one or more comma-separated offerings."""
     with create_session() as session:
-        offerings = []
-        for readable_id in readable_ids.split(','):
-            semester, department, number, section = readable_id.split('_')
-            statement = create_select()
-            statement = filter_by_semester(statement, semester)
-            statement = filter_by_department(statement, department)
-            statement = filter_by_number_str(statement, number)
-            statement = filter_by_section(statement, section)
-            offering = session.scalar(statement)
-            if offering is not None:
-                offerings.append(offering)
-        return jsonify({
-            offering.readable_id: offering.to_json_dict()
-            for offering in offerings
-        })
+        offering_ids = get_offering_ids(session, readable_ids.split(','))
+        with timed('serialize'):
+            readable_ids = sorted(offering_ids)
+            fragments = get_fragments(session, [offering_ids[readable_id] for readable_id in readable_ids])
+    with timed('encode'):
+        return Response(
+            '{' + ','.join(
+                encode_json(readable_id) + ':' + fragment
+                for readable_id, fragment in zip(readable_ids, fragments)
+            ) + '}',
+            mimetype='application/json',
+        )
+
+
+@app.route('/snapshot/')
+def view_snapshot():
+    """Redirect to the current snapshot of a semester."""
+    semester_code = request.args.get('semester', Semester.current_semester_code())
+    if semester_code not in set(semester.code for semester in get_context_template()['semesters']):
+        return abort(404)
+    response = redirect(url_for('view_snapshot_file', filename=get_snapshot(semester_code)))
+    response.headers['Cache-Control'] = 'public, max-age=60'
+    return response
+
+
+@app.route('/snapshot/<filename>')
+def view_snapshot_file(filename):
+    """Serve a (gzipped) semester snapshot."""
+    file_path = SNAPSHOT_DIR / filename
+    if not filename.endswith('.json.gz'):
+        return abort(404)
+    if not file_path.exists():
+        # superseded snapshots are deleted, so send their clients to the current one
+        semester_code = filename.split('-')[0]
+        if semester_code not in set(semester.code for semester in get_context_template()['semesters']):
+            return abort(404)
+        return redirect(url_for('view_snapshot', semester=semester_code))
+    with file_path.open('rb') as fd:
+        contents = fd.read()
+    if request.accept_encodings['gzip']:
+        response = Response(contents, mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(gzip.decompress(contents), mimetype='application/json')
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
 
 
 @app.route('/json-doc/')
 def view_json_doc():
     """Serve the JSON API description page."""
-    return render_template('api.html')
+    with timed('render'):
+        return render_template('api.html')
+
+
+@app.route('/metrics')
+def view_metrics():
+    """Serve request metrics in the Prometheus text format."""
+    return Response(METRICS.render(), mimetype='text/plain; version=0.0.4')
 
 
 @app.route('/static/css/<file>')
@@ -286,3 +843,8 @@ def get_js(file):
         return send_from_directory(file_dir, file)
     else:
         return abort(404)
+
+
+# the data API uses the search helpers above, so it is only imported once they are defined
+from .api import api # pylint: disable = cyclic-import
+app.register_blueprint(api)
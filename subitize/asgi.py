@@ -0,0 +1,153 @@
+"""An ASGI entry point for the subitize web-app.
+
+The Flask views are synchronous, so each request is run to completion on a
+bounded thread pool while the event loop only handles the connections. This
+lets an ASGI server such as uvicorn hold many more idle and slow connections
+than there are threads querying the database:
+
+    uvicorn subitize.asgi:application --host 0.0.0.0 --port 5000
+
+Server-sent event streams never finish, so they are not buffered; they are
+read on a separate thread pool, so that long-lived streams cannot starve the
+requests.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from os import environ
+
+from werkzeug.test import EnvironBuilder
+from werkzeug.wrappers import Response
+
+from .app import app, prepare
+
+ASGI_WORKERS = int(environ.get('SUBITIZE_ASGI_WORKERS', '8'))
+ASGI_STREAMS = int(environ.get('SUBITIZE_ASGI_STREAMS', '64'))
+
+EXECUTOR = ThreadPoolExecutor(max_workers=ASGI_WORKERS, thread_name_prefix='subitize')
+STREAM_EXECUTOR = ThreadPoolExecutor(max_workers=ASGI_STREAMS, thread_name_prefix='subitize-stream')
+
+
+def dispatch(scope, body):
+    """Run an HTTP request through the Flask app.
+
+    Arguments:
+        scope (dict): The ASGI connection scope.
+        body (bytes): The request body.
+
+    Returns:
+        Response: The Flask response, buffered unless it is an event stream.
+    """
+    builder = EnvironBuilder(
+        path=scope['path'],
+        method=scope['method'],
+        query_string=scope['query_string'].decode('latin-1'),
+        headers=[(key.decode('latin-1'), value.decode('latin-1')) for key, value in scope['headers']],
+        data=body,
+    )
+    try:
+        wsgi_environ = builder.get_environ()
+    finally:
+        builder.close()
+    wsgi_environ['SCRIPT_NAME'] = scope.get('root_path', '')
+    wsgi_environ['wsgi.url_scheme'] = scope.get('scheme', 'http')
+    if scope.get('client'):
+        wsgi_environ['REMOTE_ADDR'] = scope['client'][0]
+    if scope.get('server'):
+        wsgi_environ['SERVER_NAME'], wsgi_environ['SERVER_PORT'] = scope['server'][0], str(scope['server'][1])
+    response = Response.from_app(app, wsgi_environ)
+    if response.mimetype != 'text/event-stream':
+        response.make_sequence()
+        response.close()
+    return response
+
+
+async def read_body(receive):
+    """Read the full body of an HTTP request.
+
+    Arguments:
+        receive (Callable): The ASGI receive channel.
+
+    Returns:
+        bytes: The request body.
+    """
+    chunks = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        chunks.append(message.get('body', b''))
+        more_body = message.get('more_body', False)
+    return b''.join(chunks)
+
+
+async def stream_body(receive, send, response):
+    """Send the body of a streaming response until it ends or the client leaves.
+
+    Arguments:
+        receive (Callable): The ASGI receive channel.
+        send (Callable): The ASGI send channel.
+        response (Response): The unbuffered Flask response.
+    """
+    loop = asyncio.get_running_loop()
+    chunks = iter(response.response)
+    disconnect = asyncio.ensure_future(receive())
+    pending = None
+    try:
+        while not disconnect.done():
+            pending = STREAM_EXECUTOR.submit(next, chunks, None)
+            chunk = await asyncio.wrap_future(pending)
+            if chunk is None:
+                await send({'type': 'http.response.body', 'body': b''})
+                break
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+    finally:
+        disconnect.cancel()
+        if pending is not None and not pending.done():
+            # if this was cancelled, the generator may still be running, and cannot be closed until it yields
+            await asyncio.wait([asyncio.wrap_future(pending)])
+        await loop.run_in_executor(STREAM_EXECUTOR, response.close)
+
+
+async def application(scope, receive, send):
+    """Serve the subitize app over ASGI.
+
+    Arguments:
+        scope (dict): The ASGI connection scope.
+        receive (Callable): The ASGI receive channel.
+        send (Callable): The ASGI send channel.
+    """
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    await asyncio.get_running_loop().run_in_executor(EXECUTOR, prepare)
+                except Exception as error: # pylint: disable = broad-exception-caught
+                    await send({'type': 'lifespan.startup.failed', 'message': repr(error)})
+                    return
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                EXECUTOR.shutdown(wait=False)
+                STREAM_EXECUTOR.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+    if scope['type'] != 'http':
+        return
+    body = await read_body(receive)
+    loop = asyncio.get_running_loop()
+    response = await loop.run_in_executor(EXECUTOR, dispatch, scope, body)
+    await send({
+        'type': 'http.response.start',
+        'status': response.status_code,
+        'headers': [
+            (key.lower().encode('latin-1'), value.encode('latin-1'))
+            for key, value in response.headers.to_wsgi_list()
+        ],
+    })
+    if response.mimetype == 'text/event-stream':
+        await stream_body(receive, send, response)
+    else:
+        await send({
+            'type': 'http.response.body',
+            'body': response.get_data(),
+        })
@@ -0,0 +1,323 @@
+"""Bitmap indices for filtering course offerings.
+
+Every offering is assigned a bit position, and every filter value (semester,
+department, instructor, etc.) maps to a Python integer with the bits of the
+matching offerings set. A search is answered by intersecting these bitmaps,
+then sorting only the surviving offerings by precomputed ranks.
+
+The indices are built once from the database, and so need to be rebuilt
+whenever the data changes.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+from heapq import nsmallest
+
+from sqlalchemy import select
+
+from .models import TimeSlot, Meeting, Department, Course, Person, Offering
+from .models import OfferingMeeting, OfferingCore, OfferingInstructor
+
+
+class FilterIndex:
+    """Bitmaps from filter values to offerings."""
+
+    FILTERS = ('semester', 'department', 'number', 'units', 'course', 'instructor', 'core', 'timeslot')
+    SORTS = ('semester', 'course', 'title', 'units')
+
+    def __init__(self, session):
+        """Initialize the index from the database.
+
+        Arguments:
+            session (Session): The sqlalchemy session to connect with.
+        """
+        self.ids = []
+        self.positions = {}
+        # for each filter, the bitmap of each of its values
+        self.bitmaps = {name: defaultdict(int) for name in self.FILTERS}
+        self.not_study_abroad = 0
+        self.open = 0
+        sort_keys = {sort: [] for sort in self.SORTS}
+        statement = (
+            select(
+                Offering.id, Offering.semester_id, Offering.course_id, Offering.section, Offering.title, Offering.units,
+                Offering.num_enrolled, Offering.num_seats, Offering.num_reserved, Offering.num_waitlisted,
+                Course.number, Course.number_int, Department.code, Department.name,
+            )
+            .join(Course, Offering.course_id == Course.id)
+            .join(Department)
+            .order_by(Offering.id)
+        )
+        for position, row in enumerate(session.execute(statement)):
+            bit = 1 << position
+            self.ids.append(row.id)
+            self.positions[row.id] = position
+            self.bitmaps['semester'][row.semester_id] |= bit
+            self.bitmaps['department'][row.code] |= bit
+            self.bitmaps['number'][row.number_int] |= bit
+            self.bitmaps['units'][row.units] |= bit
+            self.bitmaps['course'][row.course_id] |= bit
+            if row.code != 'OXAB' and not row.code.upper().startswith('AB'):
+                self.not_study_abroad |= bit
+            if row.num_waitlisted == 0 and row.num_enrolled < row.num_seats - row.num_reserved:
+                self.open |= bit
+            sort_keys['semester'].append(
+                (-row.semester_id, row.name, row.number_int, row.number, row.section, row.id)
+            )
+            sort_keys['course'].append((row.code, row.number_int, row.number, row.section, row.id))
+            sort_keys['title'].append((row.title, row.id))
+            sort_keys['units'].append((row.units, row.id))
+        self.all = (1 << len(self.ids)) - 1
+        self.ranks = {}
+        for sort, keys in sort_keys.items():
+            ranks = [0 for _ in keys]
+            for rank, position in enumerate(sorted(range(len(keys)), key=keys.__getitem__)):
+                ranks[position] = rank
+            self.ranks[sort] = ranks
+        statement = select(OfferingInstructor.offering_id, Person.system_name).join(Person)
+        for offering_id, system_name in session.execute(statement):
+            self.bitmaps['instructor'][system_name] |= 1 << self.positions[offering_id]
+        statement = select(OfferingCore.offering_id, OfferingCore.core_code)
+        for offering_id, core_code in session.execute(statement):
+            self.bitmaps['core'][core_code] |= 1 << self.positions[offering_id]
+        statement = (
+            select(OfferingMeeting.offering_id, TimeSlot.weekdays, TimeSlot.start, TimeSlot.end)
+            .join(Meeting, OfferingMeeting.meeting_id == Meeting.id)
+            .join(TimeSlot, isouter=True)
+        )
+        for offering_id, weekdays, start, end in session.execute(statement):
+            self.bitmaps['timeslot'][(weekdays, start, end)] |= 1 << self.positions[offering_id]
+
+    def filter_study_abroad(self, bitmap):
+        """Filter out study abroad offerings.
+
+        Arguments:
+            bitmap (int): The offerings to filter.
+
+        Returns:
+            int: The filtered offerings.
+        """
+        return bitmap & self.not_study_abroad
+
+    def filter_by_semester(self, bitmap, semester=None):
+        """Select offerings from a specific semester.
+
+        Arguments:
+            bitmap (int): The offerings to filter.
+            semester (str): The semester code. Optional.
+
+        Returns:
+            int: The filtered offerings.
+        """
+        if semester is None:
+            return bitmap
+        try:
+            return bitmap & self.bitmaps['semester'].get(int(semester), 0)
+        except ValueError:
+            return 0
+
+    def filter_by_department(self, bitmap, department=None):
+        """Select offerings from a specific department.
+
+        Arguments:
+            bitmap (int): The offerings to filter.
+            department (str): The department code. Optional.
+
+        Returns:
+            int: The filtered offerings.
+        """
+        if department is None:
+            return bitmap
+        return bitmap & self.bitmaps['department'].get(department, 0)
+
+    def filter_by_number(self, bitmap, minimum=None, maximum=None):
+        """Select offerings between a range of numbers.
+
+        Arguments:
+            bitmap (int): The offerings to filter.
+            minimum (str): The minimum acceptable number, inclusive. Optional.
+            maximum (str): The maximum acceptable number, inclusive. Optional.
+
+        Returns:
+            int: The filtered offerings.
+        """
+        if minimum is None and maximum is None:
+            return bitmap
+        try:
+            minimum = float('-inf') if minimum is None else int(minimum)
+            maximum = float('inf') if maximum is None else int(maximum)
+        except ValueError:
+            return 0
+        numbers = 0
+        for number, number_bitmap in self.bitmaps['number'].items():
+            if minimum <= number <= maximum:
+                numbers |= number_bitmap
+        return bitmap & numbers
+
+    def filter_by_units(self, bitmap, units=None):
+        """Select offerings worth a specific number of units.
+
+        Arguments:
+            bitmap (int): The offerings to filter.
+            units (str): The number of units. Optional.
+
+        Returns:
+            int: The filtered offerings.
+        """
+        if units is None:
+            return bitmap
+        try:
+            return bitmap & self.bitmaps['units'].get(int(units), 0)
+        except ValueError:
+            return 0
+
+    def filter_by_instructor(self, bitmap, instructor=None):
+        """Select offerings taught by a specific instructor.
+
+        Arguments:
+            bitmap (int): The offerings to filter.
+            instructor (str): The system name of the instructor. Optional.
+
+        Returns:
+            int: The filtered offerings.
+        """
+        if instructor is None:
+            return bitmap
+        return bitmap & self.bitmaps['instructor'].get(instructor, 0)
+
+    def filter_by_core(self, bitmap, core=None):
+        """Select offerings by core requirement fulfilled.
+
+        Arguments:
+            bitmap (int): The offerings to filter.
+            core (str): The core requirement code. Optional.
+
+        Returns:
+            int: The filtered offerings.
+        """
+        if core is None:
+            return bitmap
+        return bitmap & self.bitmaps['core'].get(core, 0)
+
+    def filter_by_openness(self, bitmap):
+        """Select offerings that are open to enrollment.
+
+        Arguments:
+            bitmap (int): The offerings to filter.
+
+        Returns:
+            int: The filtered offerings.
+        """
+        return bitmap & self.open
+
+    def filter_by_prerequisites(self, bitmap, completed=None, graph=None):
+        """Select offerings whose prerequisites have been satisfied.
+
+        Arguments:
+            bitmap (int): The offerings to filter.
+            completed (str): The completed courses, eg. "COMP 131,MATH 120".
+                Optional.
+            graph (PrerequisiteGraph): The prerequisite graph. Required if
+                completed courses are given.
+
+        Returns:
+            int: The filtered offerings.
+        """
+        if completed is None:
+            return bitmap
+        for course_id in graph.ineligible(graph.parse_courses(completed)):
+            bitmap &= ~self.bitmaps['course'].get(course_id, 0)
+        return bitmap
+
+    def filter_by_meeting(self, bitmap, days=None, starts_after=None, ends_before=None):
+        """Select offerings that meet on specific days and times.
+
+        As with subitizelib.filter_by_meeting, offerings with no meetings are
+        always selected.
+
+        Arguments:
+            bitmap (int): The offerings to filter.
+            days (str): The concatenated one-letter abbreviation of the weekdays. Optional.
+            starts_after (str): The earliest acceptable start time, inclusive. Optional.
+            ends_before (str): The latest acceptable end time, inclusive. Optional.
+
+        Returns:
+            int: The filtered offerings.
+        """
+        if days is None and starts_after is None and ends_before is None:
+            return bitmap
+        if starts_after is not None:
+            starts_after = datetime.strptime(starts_after, '%H%M').time()
+        if ends_before is not None:
+            ends_before = datetime.strptime(ends_before, '%H%M').time()
+        meetings = 0
+        scheduled = 0
+        for (weekdays, start, end), timeslot_bitmap in self.bitmaps['timeslot'].items():
+            scheduled |= timeslot_bitmap
+            if days is not None:
+                if weekdays is None:
+                    continue
+                if weekdays != '' and not all(day.upper() in weekdays.upper() for day in days):
+                    continue
+            if starts_after is not None and start is not None and start < starts_after:
+                continue
+            if ends_before is not None and end is not None and end > ends_before:
+                continue
+            meetings |= timeslot_bitmap
+        # offerings with no meetings at all are in none of the timeslot bitmaps
+        return bitmap & (meetings | (self.all & ~scheduled))
+
+    def contains(self, bitmap, offering_id):
+        """Check if an offering is selected.
+
+        Arguments:
+            bitmap (int): The selected offerings.
+            offering_id (int): The ID of the offering.
+
+        Returns:
+            bool: True if the offering is selected.
+        """
+        position = self.positions.get(offering_id)
+        return position is not None and bool(bitmap >> position & 1)
+
+    def rank(self, offering_id, field=None):
+        """Get the position of an offering in a sorting order.
+
+        Arguments:
+            offering_id (int): The ID of the offering.
+            field (str): The sorting order. Must be one of [semester, course,
+                title, units]. Defaults to 'semester'.
+
+        Returns:
+            int: The rank of the offering, starting from 0.
+        """
+        if field is None:
+            field = 'semester'
+        return self.ranks[field][self.positions[offering_id]]
+
+    def sorted_ids(self, bitmap, field=None, limit=None):
+        """Get the IDs of the selected offerings in sorted order.
+
+        Arguments:
+            bitmap (int): The selected offerings.
+            field (str): The sorting order. Must be one of [semester, course,
+                title, units]. Defaults to 'semester'.
+            limit (int): The maximum number of IDs to return. Optional.
+
+        Returns:
+            list[int]: The offering IDs.
+        """
+        if field is None:
+            field = 'semester'
+        ranks = self.ranks[field]
+        bits = bin(bitmap)[:1:-1]
+        positions = []
+        position = bits.find('1')
+        while position != -1:
+            positions.append(position)
+            position = bits.find('1', position + 1)
+        if limit is None:
+            positions.sort(key=ranks.__getitem__)
+        else:
+            positions = nsmallest(limit, positions, key=ranks.__getitem__)
+        return [self.ids[position] for position in positions]
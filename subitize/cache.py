@@ -0,0 +1,158 @@
+"""Caching of search results, and the query log used to warm the cache.
+
+The query log counts how often each (normalized) set of search parameters is
+requested, and is periodically merged into a JSON file on disk, so that the
+most frequent searches can be replayed when the app starts. The file lists
+the parameters and counts from most to least frequent:
+
+    {"queries": [{"count": 12, "parameters": "department=COMP&semester=201801"}, ...]}
+"""
+
+import json
+from collections import Counter, OrderedDict
+from os import environ, getpid
+from pathlib import Path
+from threading import Lock
+from time import monotonic
+
+from .models import OUTPUT_DIR
+
+QUERY_LOG_PATH = Path(environ.get('SUBITIZE_QUERY_LOG', OUTPUT_DIR / 'query-log.json'))
+QUERY_LOG_SIZE = int(environ.get('SUBITIZE_QUERY_LOG_SIZE', 1000))
+QUERY_LOG_FLUSH_SECONDS = 60
+RESULT_CACHE_SIZE = int(environ.get('SUBITIZE_RESULT_CACHE_SIZE', 512))
+WARM_LIMIT = int(environ.get('SUBITIZE_WARM_LIMIT', 100))
+
+
+class ResultCache:
+    """A thread-safe, least-recently-used cache."""
+
+    def __init__(self, size=RESULT_CACHE_SIZE):
+        """Initialize the cache.
+
+        Arguments:
+            size (int): The maximum number of entries. Optional.
+        """
+        self.size = size
+        self.entries = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, key):
+        """Get a cached value.
+
+        Arguments:
+            key (Hashable): The key.
+
+        Returns:
+            object: The cached value, or None if the key is not cached.
+        """
+        with self.lock:
+            if key not in self.entries:
+                return None
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+    def put(self, key, value):
+        """Cache a value, evicting the least recently used entry if full.
+
+        Arguments:
+            key (Hashable): The key.
+            value (object): The value.
+        """
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        """Remove every entry."""
+        with self.lock:
+            self.entries.clear()
+
+
+def read_query_log(path=QUERY_LOG_PATH):
+    """Read a query log.
+
+    Arguments:
+        path (Path): The path of the query log. Optional.
+
+    Returns:
+        list[tuple[str, int]]: The URL-encoded parameters and their counts,
+            from most to least frequent.
+    """
+    path = Path(path)
+    if not path.exists():
+        return []
+    with path.open(encoding='utf-8') as fd:
+        try:
+            queries = json.load(fd)['queries']
+        except (ValueError, KeyError):
+            return []
+    return [(query['parameters'], query['count']) for query in queries]
+
+
+class QueryLog:
+    """Counts of search parameters, periodically merged into a file."""
+
+    def __init__(self, path=QUERY_LOG_PATH, size=QUERY_LOG_SIZE):
+        """Initialize the query log.
+
+        Arguments:
+            path (Path): The path of the query log. Optional.
+            size (int): The maximum number of entries in the file. Optional.
+        """
+        self.path = Path(path)
+        self.size = size
+        self.counts = Counter()
+        self.lock = Lock()
+        self.last_flush = monotonic()
+
+    def record(self, parameters):
+        """Count a search, and write the counts to disk if it is time to.
+
+        Arguments:
+            parameters (str): The normalized, URL-encoded parameters.
+        """
+        with self.lock:
+            self.counts[parameters] += 1
+            if monotonic() - self.last_flush < QUERY_LOG_FLUSH_SECONDS:
+                return
+        self.flush()
+
+    def flush(self):
+        """Merge the counts since the last flush into the file.
+
+        Only the most frequent entries are kept. Since every worker merges
+        into the same file, the counts are approximate: increments may be
+        lost when two workers flush at the same time.
+        """
+        with self.lock:
+            counts = self.counts
+            self.counts = Counter()
+            self.last_flush = monotonic()
+        if not counts:
+            return
+        counts.update(dict(read_query_log(self.path)))
+        queries = [
+            {'parameters': parameters, 'count': count}
+            for parameters, count in sorted(counts.items(), key=lambda pair: (-pair[1], pair[0]))[:self.size]
+        ]
+        temp_path = self.path.with_name(f'{self.path.name}.{getpid()}.tmp')
+        with temp_path.open('w', encoding='utf-8') as fd:
+            json.dump({'queries': queries}, fd, indent=4, sort_keys=True)
+        temp_path.replace(self.path)
+
+
+def warm_page_cache(paths):
+    """Read files from start to end, so that they are in the OS page cache.
+
+    Arguments:
+        paths (list[Path]): The files to read.
+    """
+    for path in paths:
+        if not path.exists():
+            continue
+        with path.open('rb') as fd:
+            while fd.read(1 << 20):
+                pass
@@ -0,0 +1,109 @@
+"""A compact, dictionary-encoded representation of search results.
+
+Entities that are shared between offerings (semesters, departments, people,
+cores, buildings, and meeting time slots) are sent once in lookup tables,
+and each result refers to them by key.
+"""
+
+import json
+
+import msgpack
+
+TIMESLOT_FIELDS = (
+    'weekdays', 'start_minute', 'end_minute', 'duration',
+    'iso_start_time', 'iso_end_time', 'us_start_time', 'us_end_time',
+)
+
+
+def compact_results(results):
+    """Dictionary-encode a list of offerings.
+
+    Arguments:
+        results (list[dict]): The offerings, as returned by
+            Offering.to_json_dict().
+
+    Returns:
+        tuple[dict, list[dict]]: The lookup tables and the compacted
+            offerings.
+    """
+    tables = {
+        'semesters': {},
+        'departments': {},
+        'people': {},
+        'cores': {},
+        'buildings': {},
+        'timeslots': {},
+    }
+    timeslot_keys = {}
+    compacted = []
+    for result in results:
+        result = dict(result)
+        semester = result['semester']
+        tables['semesters'][semester['code']] = {'year': semester['year'], 'season': semester['season']}
+        result['semester'] = semester['code']
+        department = result['department']
+        tables['departments'][department['code']] = department['name']
+        result['department'] = department['code']
+        instructors = []
+        for instructor in result['instructors']:
+            tables['people'][instructor['system_name']] = {
+                'first_name': instructor['first_name'],
+                'last_name': instructor['last_name'],
+            }
+            instructors.append(instructor['system_name'])
+        result['instructors'] = instructors
+        cores = []
+        for core in result['cores']:
+            tables['cores'][core['code']] = core['name']
+            cores.append(core['code'])
+        result['cores'] = cores
+        meetings = []
+        for meeting in result['meetings']:
+            if meeting['weekdays'] is None:
+                timeslot_key = None
+            else:
+                timeslot = {field: meeting[field] for field in TIMESLOT_FIELDS}
+                identity = (meeting['weekdays']['codes'], meeting['iso_start_time'], meeting['iso_end_time'])
+                if identity not in timeslot_keys:
+                    timeslot_keys[identity] = str(len(timeslot_keys))
+                    tables['timeslots'][timeslot_keys[identity]] = timeslot
+                timeslot_key = timeslot_keys[identity]
+            if meeting['building'] is None:
+                building_key = None
+            else:
+                tables['buildings'][meeting['building']['code']] = meeting['building']['name']
+                building_key = meeting['building']['code']
+            meetings.append({
+                'timeslot': timeslot_key,
+                'building': building_key,
+                'room': meeting['room'],
+            })
+        result['meetings'] = meetings
+        compacted.append(result)
+    return tables, compacted
+
+
+def encode_json(response):
+    """Encode a response as compact JSON.
+
+    This is the same encoding used by Offering.to_json_fragment().
+
+    Arguments:
+        response (object): The response.
+
+    Returns:
+        str: The encoded response.
+    """
+    return json.dumps(response, separators=(',', ':'), sort_keys=True)
+
+
+def encode_msgpack(response):
+    """Encode a response as MessagePack.
+
+    Arguments:
+        response (dict): The response.
+
+    Returns:
+        bytes: The encoded response.
+    """
+    return msgpack.packb(response, use_bin_type=True)
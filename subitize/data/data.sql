@@ -0,0 +1,1017 @@
+PRAGMA foreign_keys=OFF;
+BEGIN TRANSACTION;
+CREATE TABLE semesters (
+	id INTEGER NOT NULL, 
+	year INTEGER NOT NULL, 
+	season VARCHAR NOT NULL, 
+	PRIMARY KEY (id), 
+	CONSTRAINT _year_season_uc UNIQUE (year, season)
+);
+INSERT INTO semesters VALUES(201701,2016,'Fall');
+INSERT INTO semesters VALUES(202402,2024,'Spring');
+INSERT INTO semesters VALUES(202701,2026,'Fall');
+INSERT INTO semesters VALUES(202702,2027,'Spring');
+CREATE TABLE timeslots (
+	id INTEGER NOT NULL, 
+	weekdays VARCHAR NOT NULL, 
+	start TIME NOT NULL, 
+	"end" TIME NOT NULL, 
+	PRIMARY KEY (id), 
+	CONSTRAINT _weekdays_time_uc UNIQUE (weekdays, start, "end")
+);
+INSERT INTO timeslots VALUES(1,'MWF','09:00:00.000000','09:50:00.000000');
+INSERT INTO timeslots VALUES(2,'TR','10:00:00.000000','11:20:00.000000');
+INSERT INTO timeslots VALUES(3,'M','13:00:00.000000','15:50:00.000000');
+CREATE TABLE buildings (
+	code VARCHAR NOT NULL, 
+	name VARCHAR NOT NULL, 
+	PRIMARY KEY (code)
+);
+INSERT INTO buildings VALUES('FM','Fowler Hall');
+INSERT INTO buildings VALUES('SWAN','Swan Hall');
+CREATE TABLE cores (
+	code VARCHAR NOT NULL, 
+	name VARCHAR NOT NULL, 
+	PRIMARY KEY (code)
+);
+INSERT INTO cores VALUES('CPFA','Core Fine Arts');
+INSERT INTO cores VALUES('CPGC','Core Global Connections');
+INSERT INTO cores VALUES('CPLS','Core Lab Science');
+CREATE TABLE departments (
+	code VARCHAR NOT NULL, 
+	name VARCHAR NOT NULL, 
+	PRIMARY KEY (code)
+);
+INSERT INTO departments VALUES('COGS','Cognitive Science');
+INSERT INTO departments VALUES('COMP','Computer Science');
+INSERT INTO departments VALUES('MATH','Mathematics');
+INSERT INTO departments VALUES('BIO','Biology');
+INSERT INTO departments VALUES('OXAB','Study Abroad');
+CREATE TABLE people (
+	id INTEGER NOT NULL, 
+	system_name VARCHAR NOT NULL, 
+	first_name VARCHAR NOT NULL, 
+	last_name VARCHAR NOT NULL, 
+	PRIMARY KEY (id)
+);
+INSERT INTO people VALUES(1,'Justin Li','Justin','Li');
+INSERT INTO people VALUES(2,'Dan J. Pondella','Dan J.','Pondella');
+INSERT INTO people VALUES(3,'Kasia Marciniak','Kasia','Marciniak');
+INSERT INTO people VALUES(4,'Alex Gardner','Alex','Gardner');
+CREATE TABLE rooms (
+	id INTEGER NOT NULL, 
+	building_code VARCHAR NOT NULL, 
+	room VARCHAR, 
+	PRIMARY KEY (id), 
+	CONSTRAINT _building_room_uc UNIQUE (building_code, room), 
+	FOREIGN KEY(building_code) REFERENCES buildings (code)
+);
+INSERT INTO rooms VALUES(1,'FM','110');
+INSERT INTO rooms VALUES(2,'FM','202');
+INSERT INTO rooms VALUES(3,'SWAN','101');
+CREATE TABLE courses (
+	id INTEGER NOT NULL, 
+	department_code VARCHAR NOT NULL, 
+	number VARCHAR NOT NULL, 
+	number_int INTEGER NOT NULL, 
+	PRIMARY KEY (id), 
+	CONSTRAINT _department_number_uc UNIQUE (department_code, number), 
+	FOREIGN KEY(department_code) REFERENCES departments (code)
+);
+INSERT INTO courses VALUES(1,'COGS','101',101);
+INSERT INTO courses VALUES(2,'COGS','131',131);
+INSERT INTO courses VALUES(3,'COGS','229',229);
+INSERT INTO courses VALUES(4,'COGS','390',390);
+INSERT INTO courses VALUES(5,'COGS','131L',131);
+INSERT INTO courses VALUES(6,'COMP','101',101);
+INSERT INTO courses VALUES(7,'COMP','131',131);
+INSERT INTO courses VALUES(8,'COMP','229',229);
+INSERT INTO courses VALUES(9,'COMP','390',390);
+INSERT INTO courses VALUES(10,'COMP','131L',131);
+INSERT INTO courses VALUES(11,'MATH','101',101);
+INSERT INTO courses VALUES(12,'MATH','131',131);
+INSERT INTO courses VALUES(13,'MATH','229',229);
+INSERT INTO courses VALUES(14,'MATH','390',390);
+INSERT INTO courses VALUES(15,'MATH','131L',131);
+INSERT INTO courses VALUES(16,'BIO','101',101);
+INSERT INTO courses VALUES(17,'BIO','131',131);
+INSERT INTO courses VALUES(18,'BIO','229',229);
+INSERT INTO courses VALUES(19,'BIO','390',390);
+INSERT INTO courses VALUES(20,'BIO','131L',131);
+INSERT INTO courses VALUES(21,'OXAB','101',101);
+INSERT INTO courses VALUES(22,'OXAB','131',131);
+INSERT INTO courses VALUES(23,'OXAB','229',229);
+INSERT INTO courses VALUES(24,'OXAB','390',390);
+INSERT INTO courses VALUES(25,'OXAB','131L',131);
+CREATE TABLE meetings (
+	id INTEGER NOT NULL, 
+	timeslot_id INTEGER, 
+	room_id INTEGER, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(timeslot_id) REFERENCES timeslots (id), 
+	FOREIGN KEY(room_id) REFERENCES rooms (id)
+);
+INSERT INTO meetings VALUES(1,1,1);
+INSERT INTO meetings VALUES(2,2,2);
+INSERT INTO meetings VALUES(3,3,3);
+INSERT INTO meetings VALUES(4,2,NULL);
+CREATE TABLE course_descriptions (
+	id INTEGER NOT NULL, 
+	year INTEGER NOT NULL,
+	course_id INTEGER NOT NULL,
+	url VARCHAR NOT NULL,
+	description VARCHAR,
+	prerequisites VARCHAR,
+	corequisites VARCHAR,
+	parsed_prerequisites VARCHAR,
+	PRIMARY KEY (id),
+	CONSTRAINT _year_course_uc UNIQUE (year, course_id), 
+	FOREIGN KEY(course_id) REFERENCES courses (id) ON DELETE CASCADE
+);
+INSERT INTO course_descriptions VALUES(1,2027,1,'http://x','desc',NULL,NULL,NULL);
+INSERT INTO course_descriptions VALUES(2,2027,2,'http://x','desc','<p>COGS 101 and MATH 101 or permission of instructor</p>',NULL,NULL);
+INSERT INTO course_descriptions VALUES(3,2027,3,'http://x','desc','<p>COGS 101 and MATH 101 or permission of instructor</p>',NULL,NULL);
+INSERT INTO course_descriptions VALUES(4,2027,4,'http://x','desc','<p>COGS 101 and MATH 101 or permission of instructor</p>',NULL,NULL);
+INSERT INTO course_descriptions VALUES(5,2027,5,'http://x','desc','<p>COGS 101 and MATH 101 or permission of instructor</p>',NULL,NULL);
+INSERT INTO course_descriptions VALUES(6,2027,6,'http://x','desc',NULL,NULL,NULL);
+INSERT INTO course_descriptions VALUES(7,2027,7,'http://x','desc','<p>COMP 101 and MATH 101 or permission of instructor</p>',NULL,NULL);
+INSERT INTO course_descriptions VALUES(8,2027,8,'http://x','desc','<p>COMP 101 and MATH 101 or permission of instructor</p>',NULL,NULL);
+INSERT INTO course_descriptions VALUES(9,2027,9,'http://x','desc','<p>COMP 101 and MATH 101 or permission of instructor</p>',NULL,NULL);
+INSERT INTO course_descriptions VALUES(10,2027,10,'http://x','desc','<p>COMP 101 and MATH 101 or permission of instructor</p>',NULL,NULL);
+INSERT INTO course_descriptions VALUES(11,2027,11,'http://x','desc',NULL,NULL,NULL);
+INSERT INTO course_descriptions VALUES(12,2027,12,'http://x','desc','<p>MATH 101 and MATH 101 or permission of instructor</p>',NULL,NULL);
+INSERT INTO course_descriptions VALUES(13,2027,13,'http://x','desc','<p>MATH 101 and MATH 101 or permission of instructor</p>',NULL,NULL);
+INSERT INTO course_descriptions VALUES(14,2027,14,'http://x','desc','<p>MATH 101 and MATH 101 or permission of instructor</p>',NULL,NULL);
+INSERT INTO course_descriptions VALUES(15,2027,15,'http://x','desc','<p>MATH 101 and MATH 101 or permission of instructor</p>',NULL,NULL);
+INSERT INTO course_descriptions VALUES(16,2027,16,'http://x','desc',NULL,NULL,NULL);
+INSERT INTO course_descriptions VALUES(17,2027,17,'http://x','desc','<p>BIO 101 and MATH 101 or permission of instructor</p>',NULL,NULL);
+INSERT INTO course_descriptions VALUES(18,2027,18,'http://x','desc','<p>BIO 101 and MATH 101 or permission of instructor</p>',NULL,NULL);
+INSERT INTO course_descriptions VALUES(19,2027,19,'http://x','desc','<p>BIO 101 and MATH 101 or permission of instructor</p>',NULL,NULL);
+INSERT INTO course_descriptions VALUES(20,2027,20,'http://x','desc','<p>BIO 101 and MATH 101 or permission of instructor</p>',NULL,NULL);
+INSERT INTO course_descriptions VALUES(21,2027,21,'http://x','desc',NULL,NULL,NULL);
+INSERT INTO course_descriptions VALUES(22,2027,22,'http://x','desc','<p>OXAB 101 and MATH 101 or permission of instructor</p>',NULL,NULL);
+INSERT INTO course_descriptions VALUES(23,2027,23,'http://x','desc','<p>OXAB 101 and MATH 101 or permission of instructor</p>',NULL,NULL);
+INSERT INTO course_descriptions VALUES(24,2027,24,'http://x','desc','<p>OXAB 101 and MATH 101 or permission of instructor</p>',NULL,NULL);
+INSERT INTO course_descriptions VALUES(25,2027,25,'http://x','desc','<p>OXAB 101 and MATH 101 or permission of instructor</p>',NULL,NULL);
+CREATE TABLE offerings (
+	id INTEGER NOT NULL, 
+	semester_id INTEGER NOT NULL, 
+	course_id INTEGER NOT NULL, 
+	course_desc_id INTEGER,
+	section VARCHAR NOT NULL, 
+	title VARCHAR NOT NULL, 
+	units INTEGER NOT NULL, 
+	num_enrolled INTEGER NOT NULL, 
+	num_seats INTEGER NOT NULL, 
+	num_reserved INTEGER NOT NULL, 
+	num_reserved_open INTEGER NOT NULL, 
+	num_waitlisted INTEGER NOT NULL, 
+	PRIMARY KEY (id), 
+	CONSTRAINT _semester_course_section_uc UNIQUE (semester_id, course_id, section), 
+	FOREIGN KEY(semester_id) REFERENCES semesters (id), 
+	FOREIGN KEY(course_id) REFERENCES courses (id),
+	FOREIGN KEY(course_desc_id) REFERENCES course_descriptions (id)
+);
+INSERT INTO offerings VALUES(1,201701,1,1,'0','Linear Algebra',2,8,30,0,0,0);
+INSERT INTO offerings VALUES(2,201701,1,1,'1','Calculus',2,28,30,3,0,0);
+INSERT INTO offerings VALUES(3,201701,2,2,'0','Computer Vision',2,0,30,0,0,3);
+INSERT INTO offerings VALUES(4,201701,2,2,'1','Calculus',4,17,30,1,0,0);
+INSERT INTO offerings VALUES(5,201701,3,3,'0','Machine Learning',2,5,30,5,0,3);
+INSERT INTO offerings VALUES(6,201701,3,3,'1','Marine Biology',4,9,30,4,0,0);
+INSERT INTO offerings VALUES(7,201701,4,4,'0','Machine Learning',4,21,30,1,0,0);
+INSERT INTO offerings VALUES(8,201701,4,4,'1','Machine Learning',4,15,30,5,0,0);
+INSERT INTO offerings VALUES(9,201701,5,5,'0','Marine Biology',2,24,30,1,0,3);
+INSERT INTO offerings VALUES(10,201701,5,5,'1','Data Science',2,12,30,5,0,3);
+INSERT INTO offerings VALUES(11,201701,6,6,'0','Calculus',4,18,30,4,0,0);
+INSERT INTO offerings VALUES(12,201701,6,6,'1','Computer Vision',4,19,30,0,0,0);
+INSERT INTO offerings VALUES(13,201701,7,7,'0','Intro to Cognitive Science',2,27,30,0,0,0);
+INSERT INTO offerings VALUES(14,201701,7,7,'1','Linear Algebra',4,9,30,0,0,0);
+INSERT INTO offerings VALUES(15,201701,8,8,'0','Calculus',4,15,30,3,0,0);
+INSERT INTO offerings VALUES(16,201701,8,8,'1','Marine Biology',4,3,30,2,0,3);
+INSERT INTO offerings VALUES(17,201701,9,9,'0','Data Structures',4,4,30,0,0,3);
+INSERT INTO offerings VALUES(18,201701,9,9,'1','Marine Biology',2,12,30,5,0,3);
+INSERT INTO offerings VALUES(19,201701,10,10,'0','Marine Biology',2,9,30,0,0,0);
+INSERT INTO offerings VALUES(20,201701,10,10,'1','Data Structures',2,18,30,1,0,3);
+INSERT INTO offerings VALUES(21,201701,11,11,'0','Computer Vision',2,6,30,4,0,3);
+INSERT INTO offerings VALUES(22,201701,11,11,'1','Calculus',2,10,30,4,0,0);
+INSERT INTO offerings VALUES(23,201701,12,12,'0','Computer Vision',2,10,30,3,0,0);
+INSERT INTO offerings VALUES(24,201701,12,12,'1','Marine Biology',2,23,30,0,0,0);
+INSERT INTO offerings VALUES(25,201701,13,13,'0','Marine Biology',4,24,30,2,0,3);
+INSERT INTO offerings VALUES(26,201701,13,13,'1','Data Science',2,27,30,4,0,3);
+INSERT INTO offerings VALUES(27,201701,14,14,'0','Machine Learning',2,12,30,1,0,0);
+INSERT INTO offerings VALUES(28,201701,14,14,'1','Intro to Cognitive Science',4,11,30,2,0,3);
+INSERT INTO offerings VALUES(29,201701,15,15,'0','Data Science',2,19,30,5,0,0);
+INSERT INTO offerings VALUES(30,201701,15,15,'1','Marine Biology',2,25,30,4,0,0);
+INSERT INTO offerings VALUES(31,201701,16,16,'0','Marine Biology',2,23,30,0,0,0);
+INSERT INTO offerings VALUES(32,201701,16,16,'1','Intro to Cognitive Science',2,20,30,2,0,0);
+INSERT INTO offerings VALUES(33,201701,17,17,'0','Computer Vision',4,12,30,2,0,0);
+INSERT INTO offerings VALUES(34,201701,17,17,'1','Calculus',2,8,30,1,0,3);
+INSERT INTO offerings VALUES(35,201701,18,18,'0','Marine Biology',4,6,30,1,0,0);
+INSERT INTO offerings VALUES(36,201701,18,18,'1','Computer Vision',2,12,30,2,0,0);
+INSERT INTO offerings VALUES(37,201701,19,19,'0','Computer Vision',2,17,30,4,0,3);
+INSERT INTO offerings VALUES(38,201701,19,19,'1','Marine Biology',4,2,30,2,0,3);
+INSERT INTO offerings VALUES(39,201701,20,20,'0','Computer Vision',4,15,30,1,0,0);
+INSERT INTO offerings VALUES(40,201701,20,20,'1','Linear Algebra',4,9,30,0,0,3);
+INSERT INTO offerings VALUES(41,201701,21,21,'0','Data Structures',4,26,30,4,0,3);
+INSERT INTO offerings VALUES(42,201701,21,21,'1','Marine Biology',4,24,30,0,0,3);
+INSERT INTO offerings VALUES(43,201701,22,22,'0','Calculus',2,12,30,2,0,0);
+INSERT INTO offerings VALUES(44,201701,22,22,'1','Data Structures',4,18,30,1,0,3);
+INSERT INTO offerings VALUES(45,201701,23,23,'0','Machine Learning',4,5,30,4,0,0);
+INSERT INTO offerings VALUES(46,201701,23,23,'1','Computer Vision',4,29,30,5,0,3);
+INSERT INTO offerings VALUES(47,201701,24,24,'0','Machine Learning',4,17,30,4,0,3);
+INSERT INTO offerings VALUES(48,201701,24,24,'1','Intro to Cognitive Science',4,5,30,4,0,0);
+INSERT INTO offerings VALUES(49,201701,25,25,'0','Calculus',2,27,30,0,0,3);
+INSERT INTO offerings VALUES(50,201701,25,25,'1','Marine Biology',2,15,30,5,0,0);
+INSERT INTO offerings VALUES(51,202402,1,1,'0','Data Science',2,8,30,5,0,0);
+INSERT INTO offerings VALUES(52,202402,1,1,'1','Machine Learning',4,12,30,1,0,0);
+INSERT INTO offerings VALUES(53,202402,2,2,'0','Machine Learning',4,29,30,0,0,3);
+INSERT INTO offerings VALUES(54,202402,2,2,'1','Data Structures',2,16,30,3,0,3);
+INSERT INTO offerings VALUES(55,202402,3,3,'0','Data Science',2,5,30,2,0,0);
+INSERT INTO offerings VALUES(56,202402,3,3,'1','Computer Vision',4,13,30,0,0,0);
+INSERT INTO offerings VALUES(57,202402,4,4,'0','Intro to Cognitive Science',2,17,30,2,0,3);
+INSERT INTO offerings VALUES(58,202402,4,4,'1','Computer Vision',4,0,30,0,0,0);
+INSERT INTO offerings VALUES(59,202402,5,5,'0','Calculus',2,20,30,3,0,0);
+INSERT INTO offerings VALUES(60,202402,5,5,'1','Calculus',4,29,30,5,0,3);
+INSERT INTO offerings VALUES(61,202402,6,6,'0','Data Structures',4,18,30,3,0,0);
+INSERT INTO offerings VALUES(62,202402,6,6,'1','Data Structures',4,23,30,5,0,0);
+INSERT INTO offerings VALUES(63,202402,7,7,'0','Data Structures',4,29,30,2,0,3);
+INSERT INTO offerings VALUES(64,202402,7,7,'1','Calculus',2,14,30,4,0,0);
+INSERT INTO offerings VALUES(65,202402,8,8,'0','Calculus',2,5,30,4,0,3);
+INSERT INTO offerings VALUES(66,202402,8,8,'1','Data Science',2,16,30,1,0,0);
+INSERT INTO offerings VALUES(67,202402,9,9,'0','Computer Vision',4,16,30,4,0,3);
+INSERT INTO offerings VALUES(68,202402,9,9,'1','Data Science',4,19,30,5,0,0);
+INSERT INTO offerings VALUES(69,202402,10,10,'0','Computer Vision',2,8,30,4,0,3);
+INSERT INTO offerings VALUES(70,202402,10,10,'1','Machine Learning',2,25,30,2,0,0);
+INSERT INTO offerings VALUES(71,202402,11,11,'0','Linear Algebra',4,14,30,4,0,0);
+INSERT INTO offerings VALUES(72,202402,11,11,'1','Data Science',4,7,30,0,0,3);
+INSERT INTO offerings VALUES(73,202402,12,12,'0','Marine Biology',4,10,30,3,0,0);
+INSERT INTO offerings VALUES(74,202402,12,12,'1','Data Structures',2,21,30,0,0,0);
+INSERT INTO offerings VALUES(75,202402,13,13,'0','Intro to Cognitive Science',2,12,30,1,0,0);
+INSERT INTO offerings VALUES(76,202402,13,13,'1','Marine Biology',4,14,30,4,0,3);
+INSERT INTO offerings VALUES(77,202402,14,14,'0','Intro to Cognitive Science',2,2,30,0,0,0);
+INSERT INTO offerings VALUES(78,202402,14,14,'1','Data Science',2,12,30,1,0,3);
+INSERT INTO offerings VALUES(79,202402,15,15,'0','Machine Learning',2,28,30,5,0,3);
+INSERT INTO offerings VALUES(80,202402,15,15,'1','Intro to Cognitive Science',4,20,30,2,0,0);
+INSERT INTO offerings VALUES(81,202402,16,16,'0','Data Structures',4,24,30,0,0,0);
+INSERT INTO offerings VALUES(82,202402,16,16,'1','Calculus',2,23,30,2,0,3);
+INSERT INTO offerings VALUES(83,202402,17,17,'0','Data Science',4,20,30,5,0,0);
+INSERT INTO offerings VALUES(84,202402,17,17,'1','Computer Vision',4,19,30,5,0,3);
+INSERT INTO offerings VALUES(85,202402,18,18,'0','Machine Learning',2,22,30,2,0,3);
+INSERT INTO offerings VALUES(86,202402,18,18,'1','Linear Algebra',2,29,30,1,0,0);
+INSERT INTO offerings VALUES(87,202402,19,19,'0','Computer Vision',2,10,30,0,0,0);
+INSERT INTO offerings VALUES(88,202402,19,19,'1','Data Science',2,8,30,2,0,0);
+INSERT INTO offerings VALUES(89,202402,20,20,'0','Linear Algebra',4,25,30,3,0,0);
+INSERT INTO offerings VALUES(90,202402,20,20,'1','Computer Vision',4,16,30,3,0,3);
+INSERT INTO offerings VALUES(91,202402,21,21,'0','Data Science',2,6,30,2,0,0);
+INSERT INTO offerings VALUES(92,202402,21,21,'1','Intro to Cognitive Science',2,9,30,5,0,3);
+INSERT INTO offerings VALUES(93,202402,22,22,'0','Computer Vision',2,16,30,0,0,0);
+INSERT INTO offerings VALUES(94,202402,22,22,'1','Calculus',4,29,30,2,0,3);
+INSERT INTO offerings VALUES(95,202402,23,23,'0','Calculus',4,25,30,1,0,3);
+INSERT INTO offerings VALUES(96,202402,23,23,'1','Computer Vision',2,0,30,1,0,0);
+INSERT INTO offerings VALUES(97,202402,24,24,'0','Linear Algebra',4,30,30,5,0,3);
+INSERT INTO offerings VALUES(98,202402,24,24,'1','Intro to Cognitive Science',2,8,30,0,0,3);
+INSERT INTO offerings VALUES(99,202402,25,25,'0','Data Structures',4,28,30,3,0,3);
+INSERT INTO offerings VALUES(100,202402,25,25,'1','Machine Learning',4,21,30,2,0,3);
+INSERT INTO offerings VALUES(101,202701,1,1,'0','Marine Biology',2,23,30,4,0,0);
+INSERT INTO offerings VALUES(102,202701,1,1,'1','Computer Vision',4,0,30,1,0,0);
+INSERT INTO offerings VALUES(103,202701,2,2,'0','Computer Vision',4,16,30,3,0,3);
+INSERT INTO offerings VALUES(104,202701,2,2,'1','Calculus',2,17,30,1,0,0);
+INSERT INTO offerings VALUES(105,202701,3,3,'0','Data Science',2,28,30,0,0,0);
+INSERT INTO offerings VALUES(106,202701,3,3,'1','Computer Vision',4,24,30,2,0,0);
+INSERT INTO offerings VALUES(107,202701,4,4,'0','Machine Learning',2,0,30,1,0,0);
+INSERT INTO offerings VALUES(108,202701,4,4,'1','Data Science',4,22,30,2,0,0);
+INSERT INTO offerings VALUES(109,202701,5,5,'0','Machine Learning',2,2,30,1,0,0);
+INSERT INTO offerings VALUES(110,202701,5,5,'1','Data Science',2,15,30,0,0,0);
+INSERT INTO offerings VALUES(111,202701,6,6,'0','Data Structures',2,17,30,3,0,0);
+INSERT INTO offerings VALUES(112,202701,6,6,'1','Intro to Cognitive Science',4,21,30,2,0,0);
+INSERT INTO offerings VALUES(113,202701,7,7,'0','Machine Learning',2,21,30,3,0,0);
+INSERT INTO offerings VALUES(114,202701,7,7,'1','Linear Algebra',4,19,30,5,0,0);
+INSERT INTO offerings VALUES(115,202701,8,8,'0','Calculus',2,25,30,4,0,0);
+INSERT INTO offerings VALUES(116,202701,8,8,'1','Data Science',2,17,30,5,0,0);
+INSERT INTO offerings VALUES(117,202701,9,9,'0','Marine Biology',4,4,30,1,0,0);
+INSERT INTO offerings VALUES(118,202701,9,9,'1','Machine Learning',4,8,30,3,0,3);
+INSERT INTO offerings VALUES(119,202701,10,10,'0','Calculus',2,10,30,1,0,3);
+INSERT INTO offerings VALUES(120,202701,10,10,'1','Data Structures',4,16,30,5,0,0);
+INSERT INTO offerings VALUES(121,202701,11,11,'0','Linear Algebra',2,22,30,2,0,0);
+INSERT INTO offerings VALUES(122,202701,11,11,'1','Intro to Cognitive Science',2,18,30,1,0,3);
+INSERT INTO offerings VALUES(123,202701,12,12,'0','Data Science',2,2,30,5,0,0);
+INSERT INTO offerings VALUES(124,202701,12,12,'1','Intro to Cognitive Science',4,11,30,1,0,0);
+INSERT INTO offerings VALUES(125,202701,13,13,'0','Intro to Cognitive Science',2,9,30,2,0,0);
+INSERT INTO offerings VALUES(126,202701,13,13,'1','Linear Algebra',4,11,30,5,0,3);
+INSERT INTO offerings VALUES(127,202701,14,14,'0','Computer Vision',2,11,30,5,0,3);
+INSERT INTO offerings VALUES(128,202701,14,14,'1','Calculus',4,17,30,3,0,0);
+INSERT INTO offerings VALUES(129,202701,15,15,'0','Data Structures',2,5,30,1,0,0);
+INSERT INTO offerings VALUES(130,202701,15,15,'1','Calculus',2,12,30,5,0,0);
+INSERT INTO offerings VALUES(131,202701,16,16,'0','Data Science',4,21,30,1,0,0);
+INSERT INTO offerings VALUES(132,202701,16,16,'1','Calculus',4,11,30,2,0,0);
+INSERT INTO offerings VALUES(133,202701,17,17,'0','Linear Algebra',4,9,30,5,0,3);
+INSERT INTO offerings VALUES(134,202701,17,17,'1','Intro to Cognitive Science',4,0,30,3,0,3);
+INSERT INTO offerings VALUES(135,202701,18,18,'0','Calculus',2,3,30,3,0,0);
+INSERT INTO offerings VALUES(136,202701,18,18,'1','Data Science',4,25,30,3,0,3);
+INSERT INTO offerings VALUES(137,202701,19,19,'0','Intro to Cognitive Science',2,29,30,5,0,0);
+INSERT INTO offerings VALUES(138,202701,19,19,'1','Machine Learning',4,9,30,2,0,0);
+INSERT INTO offerings VALUES(139,202701,20,20,'0','Intro to Cognitive Science',2,17,30,5,0,3);
+INSERT INTO offerings VALUES(140,202701,20,20,'1','Calculus',2,12,30,5,0,0);
+INSERT INTO offerings VALUES(141,202701,21,21,'0','Computer Vision',4,21,30,1,0,3);
+INSERT INTO offerings VALUES(142,202701,21,21,'1','Machine Learning',4,12,30,4,0,0);
+INSERT INTO offerings VALUES(143,202701,22,22,'0','Data Structures',4,13,30,0,0,0);
+INSERT INTO offerings VALUES(144,202701,22,22,'1','Linear Algebra',2,16,30,0,0,0);
+INSERT INTO offerings VALUES(145,202701,23,23,'0','Machine Learning',2,17,30,1,0,0);
+INSERT INTO offerings VALUES(146,202701,23,23,'1','Linear Algebra',2,12,30,4,0,0);
+INSERT INTO offerings VALUES(147,202701,24,24,'0','Marine Biology',2,7,30,3,0,0);
+INSERT INTO offerings VALUES(148,202701,24,24,'1','Intro to Cognitive Science',4,1,30,4,0,0);
+INSERT INTO offerings VALUES(149,202701,25,25,'0','Data Science',4,5,30,4,0,0);
+INSERT INTO offerings VALUES(150,202701,25,25,'1','Linear Algebra',4,22,30,3,0,0);
+INSERT INTO offerings VALUES(151,202702,1,1,'0','Data Science',2,24,30,5,0,3);
+INSERT INTO offerings VALUES(152,202702,1,1,'1','Data Science',4,8,30,2,0,0);
+INSERT INTO offerings VALUES(153,202702,2,2,'0','Linear Algebra',4,7,30,1,0,0);
+INSERT INTO offerings VALUES(154,202702,2,2,'1','Machine Learning',2,2,30,5,0,0);
+INSERT INTO offerings VALUES(155,202702,3,3,'0','Machine Learning',2,18,30,4,0,0);
+INSERT INTO offerings VALUES(156,202702,3,3,'1','Machine Learning',4,23,30,1,0,0);
+INSERT INTO offerings VALUES(157,202702,4,4,'0','Data Science',2,22,30,3,0,0);
+INSERT INTO offerings VALUES(158,202702,4,4,'1','Data Structures',2,26,30,2,0,0);
+INSERT INTO offerings VALUES(159,202702,5,5,'0','Marine Biology',2,16,30,4,0,0);
+INSERT INTO offerings VALUES(160,202702,5,5,'1','Data Science',2,22,30,0,0,0);
+INSERT INTO offerings VALUES(161,202702,6,6,'0','Linear Algebra',2,27,30,3,0,0);
+INSERT INTO offerings VALUES(162,202702,6,6,'1','Linear Algebra',2,17,30,0,0,0);
+INSERT INTO offerings VALUES(163,202702,7,7,'0','Computer Vision',2,3,30,0,0,3);
+INSERT INTO offerings VALUES(164,202702,7,7,'1','Marine Biology',4,16,30,2,0,0);
+INSERT INTO offerings VALUES(165,202702,8,8,'0','Calculus',2,26,30,4,0,0);
+INSERT INTO offerings VALUES(166,202702,8,8,'1','Intro to Cognitive Science',4,2,30,3,0,3);
+INSERT INTO offerings VALUES(167,202702,9,9,'0','Calculus',2,13,30,2,0,3);
+INSERT INTO offerings VALUES(168,202702,9,9,'1','Machine Learning',2,18,30,4,0,0);
+INSERT INTO offerings VALUES(169,202702,10,10,'0','Computer Vision',2,20,30,2,0,3);
+INSERT INTO offerings VALUES(170,202702,10,10,'1','Data Structures',2,29,30,2,0,0);
+INSERT INTO offerings VALUES(171,202702,11,11,'0','Machine Learning',4,27,30,4,0,0);
+INSERT INTO offerings VALUES(172,202702,11,11,'1','Intro to Cognitive Science',2,26,30,2,0,0);
+INSERT INTO offerings VALUES(173,202702,12,12,'0','Machine Learning',2,4,30,2,0,3);
+INSERT INTO offerings VALUES(174,202702,12,12,'1','Data Science',4,1,30,5,0,3);
+INSERT INTO offerings VALUES(175,202702,13,13,'0','Data Science',2,1,30,3,0,0);
+INSERT INTO offerings VALUES(176,202702,13,13,'1','Machine Learning',2,28,30,1,0,0);
+INSERT INTO offerings VALUES(177,202702,14,14,'0','Calculus',2,25,30,0,0,0);
+INSERT INTO offerings VALUES(178,202702,14,14,'1','Calculus',2,5,30,2,0,3);
+INSERT INTO offerings VALUES(179,202702,15,15,'0','Intro to Cognitive Science',2,1,30,4,0,0);
+INSERT INTO offerings VALUES(180,202702,15,15,'1','Calculus',4,10,30,3,0,3);
+INSERT INTO offerings VALUES(181,202702,16,16,'0','Data Science',4,19,30,3,0,0);
+INSERT INTO offerings VALUES(182,202702,16,16,'1','Machine Learning',4,10,30,0,0,3);
+INSERT INTO offerings VALUES(183,202702,17,17,'0','Calculus',4,5,30,2,0,3);
+INSERT INTO offerings VALUES(184,202702,17,17,'1','Data Structures',2,25,30,3,0,0);
+INSERT INTO offerings VALUES(185,202702,18,18,'0','Linear Algebra',4,27,30,3,0,0);
+INSERT INTO offerings VALUES(186,202702,18,18,'1','Data Structures',4,12,30,0,0,0);
+INSERT INTO offerings VALUES(187,202702,19,19,'0','Intro to Cognitive Science',2,4,30,5,0,0);
+INSERT INTO offerings VALUES(188,202702,19,19,'1','Linear Algebra',4,9,30,2,0,0);
+INSERT INTO offerings VALUES(189,202702,20,20,'0','Machine Learning',2,19,30,0,0,3);
+INSERT INTO offerings VALUES(190,202702,20,20,'1','Marine Biology',2,23,30,2,0,3);
+INSERT INTO offerings VALUES(191,202702,21,21,'0','Linear Algebra',2,11,30,3,0,3);
+INSERT INTO offerings VALUES(192,202702,21,21,'1','Data Science',4,0,30,2,0,0);
+INSERT INTO offerings VALUES(193,202702,22,22,'0','Machine Learning',4,25,30,1,0,0);
+INSERT INTO offerings VALUES(194,202702,22,22,'1','Intro to Cognitive Science',2,0,30,5,0,0);
+INSERT INTO offerings VALUES(195,202702,23,23,'0','Data Structures',2,17,30,2,0,0);
+INSERT INTO offerings VALUES(196,202702,23,23,'1','Calculus',2,8,30,2,0,3);
+INSERT INTO offerings VALUES(197,202702,24,24,'0','Machine Learning',2,7,30,4,0,3);
+INSERT INTO offerings VALUES(198,202702,24,24,'1','Data Structures',2,16,30,5,0,0);
+INSERT INTO offerings VALUES(199,202702,25,25,'0','Linear Algebra',4,28,30,0,0,0);
+INSERT INTO offerings VALUES(200,202702,25,25,'1','Marine Biology',2,23,30,2,0,0);
+CREATE TABLE offering_meeting_assoc (
+	id INTEGER NOT NULL, 
+	offering_id INTEGER NOT NULL, 
+	meeting_id INTEGER NOT NULL, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(offering_id) REFERENCES offerings (id) ON DELETE CASCADE, 
+	FOREIGN KEY(meeting_id) REFERENCES meetings (id) ON DELETE CASCADE
+);
+INSERT INTO offering_meeting_assoc VALUES(2,1,4);
+INSERT INTO offering_meeting_assoc VALUES(3,1,1);
+INSERT INTO offering_meeting_assoc VALUES(6,2,3);
+INSERT INTO offering_meeting_assoc VALUES(11,3,2);
+INSERT INTO offering_meeting_assoc VALUES(12,3,4);
+INSERT INTO offering_meeting_assoc VALUES(15,4,2);
+INSERT INTO offering_meeting_assoc VALUES(16,4,4);
+INSERT INTO offering_meeting_assoc VALUES(19,5,3);
+INSERT INTO offering_meeting_assoc VALUES(20,5,4);
+INSERT INTO offering_meeting_assoc VALUES(28,7,1);
+INSERT INTO offering_meeting_assoc VALUES(30,8,4);
+INSERT INTO offering_meeting_assoc VALUES(35,9,3);
+INSERT INTO offering_meeting_assoc VALUES(36,9,4);
+INSERT INTO offering_meeting_assoc VALUES(38,10,2);
+INSERT INTO offering_meeting_assoc VALUES(39,10,4);
+INSERT INTO offering_meeting_assoc VALUES(42,11,4);
+INSERT INTO offering_meeting_assoc VALUES(46,12,2);
+INSERT INTO offering_meeting_assoc VALUES(47,12,1);
+INSERT INTO offering_meeting_assoc VALUES(50,13,2);
+INSERT INTO offering_meeting_assoc VALUES(52,14,2);
+INSERT INTO offering_meeting_assoc VALUES(55,15,4);
+INSERT INTO offering_meeting_assoc VALUES(59,16,1);
+INSERT INTO offering_meeting_assoc VALUES(60,17,4);
+INSERT INTO offering_meeting_assoc VALUES(67,19,2);
+INSERT INTO offering_meeting_assoc VALUES(68,19,4);
+INSERT INTO offering_meeting_assoc VALUES(72,20,1);
+INSERT INTO offering_meeting_assoc VALUES(73,20,2);
+INSERT INTO offering_meeting_assoc VALUES(75,21,1);
+INSERT INTO offering_meeting_assoc VALUES(80,23,3);
+INSERT INTO offering_meeting_assoc VALUES(85,25,3);
+INSERT INTO offering_meeting_assoc VALUES(87,26,1);
+INSERT INTO offering_meeting_assoc VALUES(88,26,2);
+INSERT INTO offering_meeting_assoc VALUES(90,27,4);
+INSERT INTO offering_meeting_assoc VALUES(91,27,1);
+INSERT INTO offering_meeting_assoc VALUES(96,28,1);
+INSERT INTO offering_meeting_assoc VALUES(97,29,1);
+INSERT INTO offering_meeting_assoc VALUES(100,31,3);
+INSERT INTO offering_meeting_assoc VALUES(101,31,4);
+INSERT INTO offering_meeting_assoc VALUES(107,34,3);
+INSERT INTO offering_meeting_assoc VALUES(108,35,1);
+INSERT INTO offering_meeting_assoc VALUES(111,36,3);
+INSERT INTO offering_meeting_assoc VALUES(114,38,1);
+INSERT INTO offering_meeting_assoc VALUES(115,38,4);
+INSERT INTO offering_meeting_assoc VALUES(120,39,2);
+INSERT INTO offering_meeting_assoc VALUES(121,39,1);
+INSERT INTO offering_meeting_assoc VALUES(126,41,4);
+INSERT INTO offering_meeting_assoc VALUES(130,42,3);
+INSERT INTO offering_meeting_assoc VALUES(131,42,4);
+INSERT INTO offering_meeting_assoc VALUES(137,45,1);
+INSERT INTO offering_meeting_assoc VALUES(140,46,4);
+INSERT INTO offering_meeting_assoc VALUES(146,48,3);
+INSERT INTO offering_meeting_assoc VALUES(147,48,4);
+INSERT INTO offering_meeting_assoc VALUES(154,50,2);
+INSERT INTO offering_meeting_assoc VALUES(155,50,3);
+INSERT INTO offering_meeting_assoc VALUES(158,51,1);
+INSERT INTO offering_meeting_assoc VALUES(159,51,2);
+INSERT INTO offering_meeting_assoc VALUES(161,52,4);
+INSERT INTO offering_meeting_assoc VALUES(162,52,1);
+INSERT INTO offering_meeting_assoc VALUES(169,55,3);
+INSERT INTO offering_meeting_assoc VALUES(174,56,1);
+INSERT INTO offering_meeting_assoc VALUES(177,57,3);
+INSERT INTO offering_meeting_assoc VALUES(178,57,4);
+INSERT INTO offering_meeting_assoc VALUES(182,58,4);
+INSERT INTO offering_meeting_assoc VALUES(184,59,1);
+INSERT INTO offering_meeting_assoc VALUES(185,59,2);
+INSERT INTO offering_meeting_assoc VALUES(189,60,2);
+INSERT INTO offering_meeting_assoc VALUES(192,61,2);
+INSERT INTO offering_meeting_assoc VALUES(200,64,4);
+INSERT INTO offering_meeting_assoc VALUES(201,64,1);
+INSERT INTO offering_meeting_assoc VALUES(203,65,1);
+INSERT INTO offering_meeting_assoc VALUES(204,65,2);
+INSERT INTO offering_meeting_assoc VALUES(211,69,1);
+INSERT INTO offering_meeting_assoc VALUES(212,69,3);
+INSERT INTO offering_meeting_assoc VALUES(214,70,2);
+INSERT INTO offering_meeting_assoc VALUES(215,70,3);
+INSERT INTO offering_meeting_assoc VALUES(219,72,3);
+INSERT INTO offering_meeting_assoc VALUES(220,72,1);
+INSERT INTO offering_meeting_assoc VALUES(223,74,3);
+INSERT INTO offering_meeting_assoc VALUES(224,74,1);
+INSERT INTO offering_meeting_assoc VALUES(229,76,3);
+INSERT INTO offering_meeting_assoc VALUES(231,77,3);
+INSERT INTO offering_meeting_assoc VALUES(233,79,4);
+INSERT INTO offering_meeting_assoc VALUES(234,79,2);
+INSERT INTO offering_meeting_assoc VALUES(235,80,1);
+INSERT INTO offering_meeting_assoc VALUES(236,80,3);
+INSERT INTO offering_meeting_assoc VALUES(237,82,4);
+INSERT INTO offering_meeting_assoc VALUES(238,82,2);
+INSERT INTO offering_meeting_assoc VALUES(244,84,4);
+INSERT INTO offering_meeting_assoc VALUES(245,84,3);
+INSERT INTO offering_meeting_assoc VALUES(252,87,2);
+INSERT INTO offering_meeting_assoc VALUES(253,87,4);
+INSERT INTO offering_meeting_assoc VALUES(257,88,1);
+INSERT INTO offering_meeting_assoc VALUES(262,89,2);
+INSERT INTO offering_meeting_assoc VALUES(270,91,3);
+INSERT INTO offering_meeting_assoc VALUES(272,92,3);
+INSERT INTO offering_meeting_assoc VALUES(275,93,1);
+INSERT INTO offering_meeting_assoc VALUES(278,94,1);
+INSERT INTO offering_meeting_assoc VALUES(279,94,4);
+INSERT INTO offering_meeting_assoc VALUES(282,95,3);
+INSERT INTO offering_meeting_assoc VALUES(283,95,2);
+INSERT INTO offering_meeting_assoc VALUES(296,100,1);
+INSERT INTO offering_meeting_assoc VALUES(300,101,4);
+INSERT INTO offering_meeting_assoc VALUES(306,103,3);
+INSERT INTO offering_meeting_assoc VALUES(307,103,2);
+INSERT INTO offering_meeting_assoc VALUES(311,104,1);
+INSERT INTO offering_meeting_assoc VALUES(312,104,2);
+INSERT INTO offering_meeting_assoc VALUES(314,105,3);
+INSERT INTO offering_meeting_assoc VALUES(317,106,3);
+INSERT INTO offering_meeting_assoc VALUES(319,107,3);
+INSERT INTO offering_meeting_assoc VALUES(320,107,2);
+INSERT INTO offering_meeting_assoc VALUES(330,111,1);
+INSERT INTO offering_meeting_assoc VALUES(331,111,3);
+INSERT INTO offering_meeting_assoc VALUES(341,114,3);
+INSERT INTO offering_meeting_assoc VALUES(342,114,2);
+INSERT INTO offering_meeting_assoc VALUES(351,117,1);
+INSERT INTO offering_meeting_assoc VALUES(355,118,2);
+INSERT INTO offering_meeting_assoc VALUES(357,119,4);
+INSERT INTO offering_meeting_assoc VALUES(358,119,3);
+INSERT INTO offering_meeting_assoc VALUES(361,120,4);
+INSERT INTO offering_meeting_assoc VALUES(362,120,2);
+INSERT INTO offering_meeting_assoc VALUES(364,121,1);
+INSERT INTO offering_meeting_assoc VALUES(365,121,3);
+INSERT INTO offering_meeting_assoc VALUES(368,122,1);
+INSERT INTO offering_meeting_assoc VALUES(370,123,4);
+INSERT INTO offering_meeting_assoc VALUES(372,124,1);
+INSERT INTO offering_meeting_assoc VALUES(373,124,2);
+INSERT INTO offering_meeting_assoc VALUES(375,125,1);
+INSERT INTO offering_meeting_assoc VALUES(378,126,3);
+INSERT INTO offering_meeting_assoc VALUES(379,126,2);
+INSERT INTO offering_meeting_assoc VALUES(380,127,3);
+INSERT INTO offering_meeting_assoc VALUES(381,127,2);
+INSERT INTO offering_meeting_assoc VALUES(382,128,3);
+INSERT INTO offering_meeting_assoc VALUES(383,128,4);
+INSERT INTO offering_meeting_assoc VALUES(385,129,1);
+INSERT INTO offering_meeting_assoc VALUES(386,129,2);
+INSERT INTO offering_meeting_assoc VALUES(391,130,3);
+INSERT INTO offering_meeting_assoc VALUES(392,130,4);
+INSERT INTO offering_meeting_assoc VALUES(395,131,2);
+INSERT INTO offering_meeting_assoc VALUES(396,131,3);
+INSERT INTO offering_meeting_assoc VALUES(397,132,4);
+INSERT INTO offering_meeting_assoc VALUES(405,134,4);
+INSERT INTO offering_meeting_assoc VALUES(411,136,2);
+INSERT INTO offering_meeting_assoc VALUES(412,136,1);
+INSERT INTO offering_meeting_assoc VALUES(416,137,1);
+INSERT INTO offering_meeting_assoc VALUES(421,138,2);
+INSERT INTO offering_meeting_assoc VALUES(422,138,1);
+INSERT INTO offering_meeting_assoc VALUES(425,139,1);
+INSERT INTO offering_meeting_assoc VALUES(426,139,3);
+INSERT INTO offering_meeting_assoc VALUES(429,141,4);
+INSERT INTO offering_meeting_assoc VALUES(436,143,4);
+INSERT INTO offering_meeting_assoc VALUES(439,144,4);
+INSERT INTO offering_meeting_assoc VALUES(442,145,2);
+INSERT INTO offering_meeting_assoc VALUES(443,145,4);
+INSERT INTO offering_meeting_assoc VALUES(448,147,1);
+INSERT INTO offering_meeting_assoc VALUES(449,147,2);
+INSERT INTO offering_meeting_assoc VALUES(453,149,4);
+INSERT INTO offering_meeting_assoc VALUES(454,149,3);
+INSERT INTO offering_meeting_assoc VALUES(457,150,2);
+INSERT INTO offering_meeting_assoc VALUES(459,151,3);
+INSERT INTO offering_meeting_assoc VALUES(460,151,2);
+INSERT INTO offering_meeting_assoc VALUES(464,153,2);
+INSERT INTO offering_meeting_assoc VALUES(467,154,1);
+INSERT INTO offering_meeting_assoc VALUES(468,154,4);
+INSERT INTO offering_meeting_assoc VALUES(473,155,2);
+INSERT INTO offering_meeting_assoc VALUES(476,156,4);
+INSERT INTO offering_meeting_assoc VALUES(480,157,3);
+INSERT INTO offering_meeting_assoc VALUES(481,157,2);
+INSERT INTO offering_meeting_assoc VALUES(483,158,1);
+INSERT INTO offering_meeting_assoc VALUES(484,158,4);
+INSERT INTO offering_meeting_assoc VALUES(486,159,2);
+INSERT INTO offering_meeting_assoc VALUES(487,159,4);
+INSERT INTO offering_meeting_assoc VALUES(492,160,2);
+INSERT INTO offering_meeting_assoc VALUES(496,161,4);
+INSERT INTO offering_meeting_assoc VALUES(497,162,2);
+INSERT INTO offering_meeting_assoc VALUES(501,163,2);
+INSERT INTO offering_meeting_assoc VALUES(502,164,1);
+INSERT INTO offering_meeting_assoc VALUES(504,165,4);
+INSERT INTO offering_meeting_assoc VALUES(507,166,3);
+INSERT INTO offering_meeting_assoc VALUES(511,167,3);
+INSERT INTO offering_meeting_assoc VALUES(512,167,1);
+INSERT INTO offering_meeting_assoc VALUES(515,168,1);
+INSERT INTO offering_meeting_assoc VALUES(516,168,4);
+INSERT INTO offering_meeting_assoc VALUES(518,169,1);
+INSERT INTO offering_meeting_assoc VALUES(524,171,3);
+INSERT INTO offering_meeting_assoc VALUES(527,172,1);
+INSERT INTO offering_meeting_assoc VALUES(528,172,4);
+INSERT INTO offering_meeting_assoc VALUES(534,174,1);
+INSERT INTO offering_meeting_assoc VALUES(535,174,3);
+INSERT INTO offering_meeting_assoc VALUES(539,175,4);
+INSERT INTO offering_meeting_assoc VALUES(542,176,2);
+INSERT INTO offering_meeting_assoc VALUES(543,176,3);
+INSERT INTO offering_meeting_assoc VALUES(547,177,3);
+INSERT INTO offering_meeting_assoc VALUES(548,177,1);
+INSERT INTO offering_meeting_assoc VALUES(551,179,3);
+INSERT INTO offering_meeting_assoc VALUES(554,181,1);
+INSERT INTO offering_meeting_assoc VALUES(556,182,4);
+INSERT INTO offering_meeting_assoc VALUES(557,182,3);
+INSERT INTO offering_meeting_assoc VALUES(562,183,3);
+INSERT INTO offering_meeting_assoc VALUES(565,184,4);
+INSERT INTO offering_meeting_assoc VALUES(566,184,1);
+INSERT INTO offering_meeting_assoc VALUES(573,186,1);
+INSERT INTO offering_meeting_assoc VALUES(574,186,4);
+INSERT INTO offering_meeting_assoc VALUES(579,189,2);
+INSERT INTO offering_meeting_assoc VALUES(580,189,1);
+INSERT INTO offering_meeting_assoc VALUES(585,190,3);
+INSERT INTO offering_meeting_assoc VALUES(586,190,2);
+INSERT INTO offering_meeting_assoc VALUES(589,191,1);
+INSERT INTO offering_meeting_assoc VALUES(594,192,2);
+INSERT INTO offering_meeting_assoc VALUES(595,192,3);
+INSERT INTO offering_meeting_assoc VALUES(598,193,2);
+INSERT INTO offering_meeting_assoc VALUES(599,193,1);
+INSERT INTO offering_meeting_assoc VALUES(602,195,1);
+INSERT INTO offering_meeting_assoc VALUES(603,195,3);
+INSERT INTO offering_meeting_assoc VALUES(607,197,3);
+INSERT INTO offering_meeting_assoc VALUES(611,200,1);
+INSERT INTO offering_meeting_assoc VALUES(612,200,2);
+CREATE TABLE offering_core_assoc (
+	id INTEGER NOT NULL, 
+	offering_id INTEGER NOT NULL, 
+	core_code VARCHAR NOT NULL, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(offering_id) REFERENCES offerings (id) ON DELETE CASCADE, 
+	FOREIGN KEY(core_code) REFERENCES cores (code) ON DELETE CASCADE
+);
+INSERT INTO offering_core_assoc VALUES(7,2,'CPFA');
+INSERT INTO offering_core_assoc VALUES(8,2,'CPLS');
+INSERT INTO offering_core_assoc VALUES(13,3,'CPFA');
+INSERT INTO offering_core_assoc VALUES(14,3,'CPLS');
+INSERT INTO offering_core_assoc VALUES(17,4,'CPFA');
+INSERT INTO offering_core_assoc VALUES(21,5,'CPLS');
+INSERT INTO offering_core_assoc VALUES(22,5,'CPGC');
+INSERT INTO offering_core_assoc VALUES(25,6,'CPFA');
+INSERT INTO offering_core_assoc VALUES(31,8,'CPFA');
+INSERT INTO offering_core_assoc VALUES(32,8,'CPLS');
+INSERT INTO offering_core_assoc VALUES(37,9,'CPGC');
+INSERT INTO offering_core_assoc VALUES(43,11,'CPFA');
+INSERT INTO offering_core_assoc VALUES(48,12,'CPGC');
+INSERT INTO offering_core_assoc VALUES(49,12,'CPFA');
+INSERT INTO offering_core_assoc VALUES(51,13,'CPFA');
+INSERT INTO offering_core_assoc VALUES(53,14,'CPGC');
+INSERT INTO offering_core_assoc VALUES(54,14,'CPLS');
+INSERT INTO offering_core_assoc VALUES(56,15,'CPGC');
+INSERT INTO offering_core_assoc VALUES(61,17,'CPFA');
+INSERT INTO offering_core_assoc VALUES(62,17,'CPGC');
+INSERT INTO offering_core_assoc VALUES(64,18,'CPGC');
+INSERT INTO offering_core_assoc VALUES(65,18,'CPFA');
+INSERT INTO offering_core_assoc VALUES(69,19,'CPGC');
+INSERT INTO offering_core_assoc VALUES(70,19,'CPFA');
+INSERT INTO offering_core_assoc VALUES(76,21,'CPGC');
+INSERT INTO offering_core_assoc VALUES(77,21,'CPLS');
+INSERT INTO offering_core_assoc VALUES(81,23,'CPLS');
+INSERT INTO offering_core_assoc VALUES(82,23,'CPGC');
+INSERT INTO offering_core_assoc VALUES(92,27,'CPLS');
+INSERT INTO offering_core_assoc VALUES(93,27,'CPFA');
+INSERT INTO offering_core_assoc VALUES(98,30,'CPFA');
+INSERT INTO offering_core_assoc VALUES(102,31,'CPGC');
+INSERT INTO offering_core_assoc VALUES(103,32,'CPLS');
+INSERT INTO offering_core_assoc VALUES(104,33,'CPLS');
+INSERT INTO offering_core_assoc VALUES(109,35,'CPFA');
+INSERT INTO offering_core_assoc VALUES(116,38,'CPFA');
+INSERT INTO offering_core_assoc VALUES(117,38,'CPGC');
+INSERT INTO offering_core_assoc VALUES(127,41,'CPFA');
+INSERT INTO offering_core_assoc VALUES(128,41,'CPLS');
+INSERT INTO offering_core_assoc VALUES(132,42,'CPLS');
+INSERT INTO offering_core_assoc VALUES(134,43,'CPGC');
+INSERT INTO offering_core_assoc VALUES(135,43,'CPFA');
+INSERT INTO offering_core_assoc VALUES(136,44,'CPGC');
+INSERT INTO offering_core_assoc VALUES(141,46,'CPGC');
+INSERT INTO offering_core_assoc VALUES(142,46,'CPFA');
+INSERT INTO offering_core_assoc VALUES(148,48,'CPFA');
+INSERT INTO offering_core_assoc VALUES(151,49,'CPGC');
+INSERT INTO offering_core_assoc VALUES(156,50,'CPFA');
+INSERT INTO offering_core_assoc VALUES(157,50,'CPLS');
+INSERT INTO offering_core_assoc VALUES(164,53,'CPLS');
+INSERT INTO offering_core_assoc VALUES(165,54,'CPLS');
+INSERT INTO offering_core_assoc VALUES(166,54,'CPFA');
+INSERT INTO offering_core_assoc VALUES(170,55,'CPGC');
+INSERT INTO offering_core_assoc VALUES(171,55,'CPFA');
+INSERT INTO offering_core_assoc VALUES(179,57,'CPGC');
+INSERT INTO offering_core_assoc VALUES(183,58,'CPLS');
+INSERT INTO offering_core_assoc VALUES(186,59,'CPLS');
+INSERT INTO offering_core_assoc VALUES(187,59,'CPFA');
+INSERT INTO offering_core_assoc VALUES(190,60,'CPLS');
+INSERT INTO offering_core_assoc VALUES(193,61,'CPLS');
+INSERT INTO offering_core_assoc VALUES(194,61,'CPGC');
+INSERT INTO offering_core_assoc VALUES(198,63,'CPGC');
+INSERT INTO offering_core_assoc VALUES(202,64,'CPFA');
+INSERT INTO offering_core_assoc VALUES(205,65,'CPLS');
+INSERT INTO offering_core_assoc VALUES(206,65,'CPGC');
+INSERT INTO offering_core_assoc VALUES(208,67,'CPLS');
+INSERT INTO offering_core_assoc VALUES(210,68,'CPGC');
+INSERT INTO offering_core_assoc VALUES(213,69,'CPGC');
+INSERT INTO offering_core_assoc VALUES(216,70,'CPLS');
+INSERT INTO offering_core_assoc VALUES(217,71,'CPGC');
+INSERT INTO offering_core_assoc VALUES(218,71,'CPLS');
+INSERT INTO offering_core_assoc VALUES(225,74,'CPLS');
+INSERT INTO offering_core_assoc VALUES(226,74,'CPFA');
+INSERT INTO offering_core_assoc VALUES(230,76,'CPGC');
+INSERT INTO offering_core_assoc VALUES(232,77,'CPLS');
+INSERT INTO offering_core_assoc VALUES(239,82,'CPLS');
+INSERT INTO offering_core_assoc VALUES(240,83,'CPLS');
+INSERT INTO offering_core_assoc VALUES(241,83,'CPFA');
+INSERT INTO offering_core_assoc VALUES(248,86,'CPFA');
+INSERT INTO offering_core_assoc VALUES(249,86,'CPGC');
+INSERT INTO offering_core_assoc VALUES(254,87,'CPGC');
+INSERT INTO offering_core_assoc VALUES(255,87,'CPFA');
+INSERT INTO offering_core_assoc VALUES(258,88,'CPGC');
+INSERT INTO offering_core_assoc VALUES(259,88,'CPLS');
+INSERT INTO offering_core_assoc VALUES(263,89,'CPLS');
+INSERT INTO offering_core_assoc VALUES(264,89,'CPFA');
+INSERT INTO offering_core_assoc VALUES(266,90,'CPGC');
+INSERT INTO offering_core_assoc VALUES(267,90,'CPFA');
+INSERT INTO offering_core_assoc VALUES(273,92,'CPGC');
+INSERT INTO offering_core_assoc VALUES(276,93,'CPGC');
+INSERT INTO offering_core_assoc VALUES(284,95,'CPGC');
+INSERT INTO offering_core_assoc VALUES(287,97,'CPLS');
+INSERT INTO offering_core_assoc VALUES(288,97,'CPGC');
+INSERT INTO offering_core_assoc VALUES(291,98,'CPFA');
+INSERT INTO offering_core_assoc VALUES(292,98,'CPGC');
+INSERT INTO offering_core_assoc VALUES(294,99,'CPGC');
+INSERT INTO offering_core_assoc VALUES(295,99,'CPFA');
+INSERT INTO offering_core_assoc VALUES(297,100,'CPGC');
+INSERT INTO offering_core_assoc VALUES(303,102,'CPLS');
+INSERT INTO offering_core_assoc VALUES(308,103,'CPFA');
+INSERT INTO offering_core_assoc VALUES(313,104,'CPGC');
+INSERT INTO offering_core_assoc VALUES(315,105,'CPGC');
+INSERT INTO offering_core_assoc VALUES(321,107,'CPLS');
+INSERT INTO offering_core_assoc VALUES(323,108,'CPGC');
+INSERT INTO offering_core_assoc VALUES(324,108,'CPLS');
+INSERT INTO offering_core_assoc VALUES(325,109,'CPFA');
+INSERT INTO offering_core_assoc VALUES(326,109,'CPLS');
+INSERT INTO offering_core_assoc VALUES(329,110,'CPLS');
+INSERT INTO offering_core_assoc VALUES(332,111,'CPLS');
+INSERT INTO offering_core_assoc VALUES(333,111,'CPGC');
+INSERT INTO offering_core_assoc VALUES(335,112,'CPLS');
+INSERT INTO offering_core_assoc VALUES(336,112,'CPFA');
+INSERT INTO offering_core_assoc VALUES(339,113,'CPGC');
+INSERT INTO offering_core_assoc VALUES(340,113,'CPFA');
+INSERT INTO offering_core_assoc VALUES(343,114,'CPLS');
+INSERT INTO offering_core_assoc VALUES(344,114,'CPGC');
+INSERT INTO offering_core_assoc VALUES(346,115,'CPLS');
+INSERT INTO offering_core_assoc VALUES(347,115,'CPGC');
+INSERT INTO offering_core_assoc VALUES(349,116,'CPGC');
+INSERT INTO offering_core_assoc VALUES(350,116,'CPLS');
+INSERT INTO offering_core_assoc VALUES(352,117,'CPLS');
+INSERT INTO offering_core_assoc VALUES(353,117,'CPFA');
+INSERT INTO offering_core_assoc VALUES(356,118,'CPGC');
+INSERT INTO offering_core_assoc VALUES(363,120,'CPFA');
+INSERT INTO offering_core_assoc VALUES(387,129,'CPGC');
+INSERT INTO offering_core_assoc VALUES(388,129,'CPLS');
+INSERT INTO offering_core_assoc VALUES(393,130,'CPLS');
+INSERT INTO offering_core_assoc VALUES(394,130,'CPFA');
+INSERT INTO offering_core_assoc VALUES(398,132,'CPFA');
+INSERT INTO offering_core_assoc VALUES(401,133,'CPFA');
+INSERT INTO offering_core_assoc VALUES(402,133,'CPGC');
+INSERT INTO offering_core_assoc VALUES(406,134,'CPLS');
+INSERT INTO offering_core_assoc VALUES(409,135,'CPFA');
+INSERT INTO offering_core_assoc VALUES(410,135,'CPGC');
+INSERT INTO offering_core_assoc VALUES(413,136,'CPGC');
+INSERT INTO offering_core_assoc VALUES(414,136,'CPFA');
+INSERT INTO offering_core_assoc VALUES(417,137,'CPGC');
+INSERT INTO offering_core_assoc VALUES(418,137,'CPLS');
+INSERT INTO offering_core_assoc VALUES(423,138,'CPLS');
+INSERT INTO offering_core_assoc VALUES(430,141,'CPLS');
+INSERT INTO offering_core_assoc VALUES(431,141,'CPFA');
+INSERT INTO offering_core_assoc VALUES(437,143,'CPLS');
+INSERT INTO offering_core_assoc VALUES(438,143,'CPGC');
+INSERT INTO offering_core_assoc VALUES(440,144,'CPLS');
+INSERT INTO offering_core_assoc VALUES(441,144,'CPFA');
+INSERT INTO offering_core_assoc VALUES(444,145,'CPFA');
+INSERT INTO offering_core_assoc VALUES(445,145,'CPLS');
+INSERT INTO offering_core_assoc VALUES(450,148,'CPGC');
+INSERT INTO offering_core_assoc VALUES(455,149,'CPLS');
+INSERT INTO offering_core_assoc VALUES(458,150,'CPLS');
+INSERT INTO offering_core_assoc VALUES(465,153,'CPFA');
+INSERT INTO offering_core_assoc VALUES(466,153,'CPGC');
+INSERT INTO offering_core_assoc VALUES(469,154,'CPGC');
+INSERT INTO offering_core_assoc VALUES(470,154,'CPLS');
+INSERT INTO offering_core_assoc VALUES(474,155,'CPFA');
+INSERT INTO offering_core_assoc VALUES(477,156,'CPGC');
+INSERT INTO offering_core_assoc VALUES(478,156,'CPFA');
+INSERT INTO offering_core_assoc VALUES(482,157,'CPLS');
+INSERT INTO offering_core_assoc VALUES(485,158,'CPLS');
+INSERT INTO offering_core_assoc VALUES(488,159,'CPLS');
+INSERT INTO offering_core_assoc VALUES(489,159,'CPFA');
+INSERT INTO offering_core_assoc VALUES(493,160,'CPFA');
+INSERT INTO offering_core_assoc VALUES(498,162,'CPLS');
+INSERT INTO offering_core_assoc VALUES(503,164,'CPFA');
+INSERT INTO offering_core_assoc VALUES(508,166,'CPFA');
+INSERT INTO offering_core_assoc VALUES(513,167,'CPGC');
+INSERT INTO offering_core_assoc VALUES(514,167,'CPLS');
+INSERT INTO offering_core_assoc VALUES(517,168,'CPGC');
+INSERT INTO offering_core_assoc VALUES(519,169,'CPGC');
+INSERT INTO offering_core_assoc VALUES(520,169,'CPLS');
+INSERT INTO offering_core_assoc VALUES(521,170,'CPFA');
+INSERT INTO offering_core_assoc VALUES(522,170,'CPLS');
+INSERT INTO offering_core_assoc VALUES(529,172,'CPFA');
+INSERT INTO offering_core_assoc VALUES(530,172,'CPGC');
+INSERT INTO offering_core_assoc VALUES(536,174,'CPGC');
+INSERT INTO offering_core_assoc VALUES(540,175,'CPFA');
+INSERT INTO offering_core_assoc VALUES(541,175,'CPLS');
+INSERT INTO offering_core_assoc VALUES(544,176,'CPFA');
+INSERT INTO offering_core_assoc VALUES(545,176,'CPGC');
+INSERT INTO offering_core_assoc VALUES(549,177,'CPFA');
+INSERT INTO offering_core_assoc VALUES(550,177,'CPLS');
+INSERT INTO offering_core_assoc VALUES(552,180,'CPFA');
+INSERT INTO offering_core_assoc VALUES(553,180,'CPLS');
+INSERT INTO offering_core_assoc VALUES(558,182,'CPLS');
+INSERT INTO offering_core_assoc VALUES(559,182,'CPGC');
+INSERT INTO offering_core_assoc VALUES(563,183,'CPGC');
+INSERT INTO offering_core_assoc VALUES(567,184,'CPGC');
+INSERT INTO offering_core_assoc VALUES(568,184,'CPLS');
+INSERT INTO offering_core_assoc VALUES(571,185,'CPLS');
+INSERT INTO offering_core_assoc VALUES(575,186,'CPFA');
+INSERT INTO offering_core_assoc VALUES(576,186,'CPGC');
+INSERT INTO offering_core_assoc VALUES(581,189,'CPGC');
+INSERT INTO offering_core_assoc VALUES(582,189,'CPLS');
+INSERT INTO offering_core_assoc VALUES(587,190,'CPFA');
+INSERT INTO offering_core_assoc VALUES(590,191,'CPLS');
+INSERT INTO offering_core_assoc VALUES(591,191,'CPGC');
+INSERT INTO offering_core_assoc VALUES(596,192,'CPLS');
+INSERT INTO offering_core_assoc VALUES(597,192,'CPGC');
+INSERT INTO offering_core_assoc VALUES(600,193,'CPFA');
+INSERT INTO offering_core_assoc VALUES(608,197,'CPFA');
+INSERT INTO offering_core_assoc VALUES(610,199,'CPFA');
+CREATE TABLE offering_instructor_assoc (
+	id INTEGER NOT NULL, 
+	offering_id INTEGER NOT NULL, 
+	instructor_id INTEGER NOT NULL, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(offering_id) REFERENCES offerings (id) ON DELETE CASCADE, 
+	FOREIGN KEY(instructor_id) REFERENCES people (id) ON DELETE CASCADE
+);
+INSERT INTO offering_instructor_assoc VALUES(1,1,4);
+INSERT INTO offering_instructor_assoc VALUES(4,2,1);
+INSERT INTO offering_instructor_assoc VALUES(5,2,3);
+INSERT INTO offering_instructor_assoc VALUES(9,3,1);
+INSERT INTO offering_instructor_assoc VALUES(10,3,2);
+INSERT INTO offering_instructor_assoc VALUES(18,5,1);
+INSERT INTO offering_instructor_assoc VALUES(23,6,4);
+INSERT INTO offering_instructor_assoc VALUES(24,6,3);
+INSERT INTO offering_instructor_assoc VALUES(26,7,3);
+INSERT INTO offering_instructor_assoc VALUES(27,7,1);
+INSERT INTO offering_instructor_assoc VALUES(29,8,1);
+INSERT INTO offering_instructor_assoc VALUES(33,9,2);
+INSERT INTO offering_instructor_assoc VALUES(34,9,4);
+INSERT INTO offering_instructor_assoc VALUES(40,11,4);
+INSERT INTO offering_instructor_assoc VALUES(41,11,2);
+INSERT INTO offering_instructor_assoc VALUES(44,12,2);
+INSERT INTO offering_instructor_assoc VALUES(45,12,3);
+INSERT INTO offering_instructor_assoc VALUES(57,16,2);
+INSERT INTO offering_instructor_assoc VALUES(58,16,3);
+INSERT INTO offering_instructor_assoc VALUES(63,18,4);
+INSERT INTO offering_instructor_assoc VALUES(66,19,3);
+INSERT INTO offering_instructor_assoc VALUES(71,20,2);
+INSERT INTO offering_instructor_assoc VALUES(74,21,2);
+INSERT INTO offering_instructor_assoc VALUES(78,22,1);
+INSERT INTO offering_instructor_assoc VALUES(79,23,1);
+INSERT INTO offering_instructor_assoc VALUES(83,25,3);
+INSERT INTO offering_instructor_assoc VALUES(84,25,2);
+INSERT INTO offering_instructor_assoc VALUES(86,26,2);
+INSERT INTO offering_instructor_assoc VALUES(89,27,1);
+INSERT INTO offering_instructor_assoc VALUES(94,28,1);
+INSERT INTO offering_instructor_assoc VALUES(95,28,2);
+INSERT INTO offering_instructor_assoc VALUES(99,31,3);
+INSERT INTO offering_instructor_assoc VALUES(105,34,4);
+INSERT INTO offering_instructor_assoc VALUES(106,34,3);
+INSERT INTO offering_instructor_assoc VALUES(110,36,2);
+INSERT INTO offering_instructor_assoc VALUES(112,37,1);
+INSERT INTO offering_instructor_assoc VALUES(113,37,4);
+INSERT INTO offering_instructor_assoc VALUES(118,39,3);
+INSERT INTO offering_instructor_assoc VALUES(119,39,1);
+INSERT INTO offering_instructor_assoc VALUES(122,40,3);
+INSERT INTO offering_instructor_assoc VALUES(123,40,1);
+INSERT INTO offering_instructor_assoc VALUES(124,41,2);
+INSERT INTO offering_instructor_assoc VALUES(125,41,1);
+INSERT INTO offering_instructor_assoc VALUES(129,42,4);
+INSERT INTO offering_instructor_assoc VALUES(133,43,4);
+INSERT INTO offering_instructor_assoc VALUES(138,46,2);
+INSERT INTO offering_instructor_assoc VALUES(139,46,1);
+INSERT INTO offering_instructor_assoc VALUES(143,47,3);
+INSERT INTO offering_instructor_assoc VALUES(144,47,4);
+INSERT INTO offering_instructor_assoc VALUES(145,48,3);
+INSERT INTO offering_instructor_assoc VALUES(149,49,4);
+INSERT INTO offering_instructor_assoc VALUES(150,49,1);
+INSERT INTO offering_instructor_assoc VALUES(152,50,3);
+INSERT INTO offering_instructor_assoc VALUES(153,50,2);
+INSERT INTO offering_instructor_assoc VALUES(160,52,2);
+INSERT INTO offering_instructor_assoc VALUES(163,53,3);
+INSERT INTO offering_instructor_assoc VALUES(167,55,2);
+INSERT INTO offering_instructor_assoc VALUES(168,55,4);
+INSERT INTO offering_instructor_assoc VALUES(172,56,4);
+INSERT INTO offering_instructor_assoc VALUES(173,56,1);
+INSERT INTO offering_instructor_assoc VALUES(175,57,2);
+INSERT INTO offering_instructor_assoc VALUES(176,57,1);
+INSERT INTO offering_instructor_assoc VALUES(180,58,4);
+INSERT INTO offering_instructor_assoc VALUES(181,58,2);
+INSERT INTO offering_instructor_assoc VALUES(188,60,2);
+INSERT INTO offering_instructor_assoc VALUES(191,61,1);
+INSERT INTO offering_instructor_assoc VALUES(195,62,4);
+INSERT INTO offering_instructor_assoc VALUES(196,62,2);
+INSERT INTO offering_instructor_assoc VALUES(197,63,3);
+INSERT INTO offering_instructor_assoc VALUES(199,64,1);
+INSERT INTO offering_instructor_assoc VALUES(207,66,3);
+INSERT INTO offering_instructor_assoc VALUES(209,68,4);
+INSERT INTO offering_instructor_assoc VALUES(221,74,4);
+INSERT INTO offering_instructor_assoc VALUES(222,74,2);
+INSERT INTO offering_instructor_assoc VALUES(227,75,4);
+INSERT INTO offering_instructor_assoc VALUES(228,76,2);
+INSERT INTO offering_instructor_assoc VALUES(242,84,1);
+INSERT INTO offering_instructor_assoc VALUES(243,84,2);
+INSERT INTO offering_instructor_assoc VALUES(246,85,1);
+INSERT INTO offering_instructor_assoc VALUES(247,85,2);
+INSERT INTO offering_instructor_assoc VALUES(250,87,1);
+INSERT INTO offering_instructor_assoc VALUES(251,87,2);
+INSERT INTO offering_instructor_assoc VALUES(256,88,1);
+INSERT INTO offering_instructor_assoc VALUES(260,89,3);
+INSERT INTO offering_instructor_assoc VALUES(261,89,1);
+INSERT INTO offering_instructor_assoc VALUES(265,90,1);
+INSERT INTO offering_instructor_assoc VALUES(268,91,3);
+INSERT INTO offering_instructor_assoc VALUES(269,91,1);
+INSERT INTO offering_instructor_assoc VALUES(271,92,4);
+INSERT INTO offering_instructor_assoc VALUES(274,93,3);
+INSERT INTO offering_instructor_assoc VALUES(277,94,1);
+INSERT INTO offering_instructor_assoc VALUES(280,95,3);
+INSERT INTO offering_instructor_assoc VALUES(281,95,2);
+INSERT INTO offering_instructor_assoc VALUES(285,96,2);
+INSERT INTO offering_instructor_assoc VALUES(286,96,3);
+INSERT INTO offering_instructor_assoc VALUES(289,98,1);
+INSERT INTO offering_instructor_assoc VALUES(290,98,4);
+INSERT INTO offering_instructor_assoc VALUES(293,99,2);
+INSERT INTO offering_instructor_assoc VALUES(298,101,4);
+INSERT INTO offering_instructor_assoc VALUES(299,101,1);
+INSERT INTO offering_instructor_assoc VALUES(301,102,1);
+INSERT INTO offering_instructor_assoc VALUES(302,102,3);
+INSERT INTO offering_instructor_assoc VALUES(304,103,4);
+INSERT INTO offering_instructor_assoc VALUES(305,103,3);
+INSERT INTO offering_instructor_assoc VALUES(309,104,1);
+INSERT INTO offering_instructor_assoc VALUES(310,104,2);
+INSERT INTO offering_instructor_assoc VALUES(316,106,1);
+INSERT INTO offering_instructor_assoc VALUES(318,107,2);
+INSERT INTO offering_instructor_assoc VALUES(322,108,4);
+INSERT INTO offering_instructor_assoc VALUES(327,110,2);
+INSERT INTO offering_instructor_assoc VALUES(328,110,1);
+INSERT INTO offering_instructor_assoc VALUES(334,112,1);
+INSERT INTO offering_instructor_assoc VALUES(337,113,4);
+INSERT INTO offering_instructor_assoc VALUES(338,113,2);
+INSERT INTO offering_instructor_assoc VALUES(345,115,1);
+INSERT INTO offering_instructor_assoc VALUES(348,116,1);
+INSERT INTO offering_instructor_assoc VALUES(354,118,3);
+INSERT INTO offering_instructor_assoc VALUES(359,120,2);
+INSERT INTO offering_instructor_assoc VALUES(360,120,4);
+INSERT INTO offering_instructor_assoc VALUES(366,122,3);
+INSERT INTO offering_instructor_assoc VALUES(367,122,2);
+INSERT INTO offering_instructor_assoc VALUES(369,123,3);
+INSERT INTO offering_instructor_assoc VALUES(371,124,2);
+INSERT INTO offering_instructor_assoc VALUES(374,125,1);
+INSERT INTO offering_instructor_assoc VALUES(376,126,2);
+INSERT INTO offering_instructor_assoc VALUES(377,126,1);
+INSERT INTO offering_instructor_assoc VALUES(384,129,3);
+INSERT INTO offering_instructor_assoc VALUES(389,130,3);
+INSERT INTO offering_instructor_assoc VALUES(390,130,1);
+INSERT INTO offering_instructor_assoc VALUES(399,133,1);
+INSERT INTO offering_instructor_assoc VALUES(400,133,3);
+INSERT INTO offering_instructor_assoc VALUES(403,134,4);
+INSERT INTO offering_instructor_assoc VALUES(404,134,2);
+INSERT INTO offering_instructor_assoc VALUES(407,135,1);
+INSERT INTO offering_instructor_assoc VALUES(408,135,4);
+INSERT INTO offering_instructor_assoc VALUES(415,137,3);
+INSERT INTO offering_instructor_assoc VALUES(419,138,2);
+INSERT INTO offering_instructor_assoc VALUES(420,138,3);
+INSERT INTO offering_instructor_assoc VALUES(424,139,3);
+INSERT INTO offering_instructor_assoc VALUES(427,140,2);
+INSERT INTO offering_instructor_assoc VALUES(428,141,4);
+INSERT INTO offering_instructor_assoc VALUES(432,142,4);
+INSERT INTO offering_instructor_assoc VALUES(433,142,2);
+INSERT INTO offering_instructor_assoc VALUES(434,143,1);
+INSERT INTO offering_instructor_assoc VALUES(435,143,4);
+INSERT INTO offering_instructor_assoc VALUES(446,146,2);
+INSERT INTO offering_instructor_assoc VALUES(447,146,4);
+INSERT INTO offering_instructor_assoc VALUES(451,149,3);
+INSERT INTO offering_instructor_assoc VALUES(452,149,4);
+INSERT INTO offering_instructor_assoc VALUES(456,150,3);
+INSERT INTO offering_instructor_assoc VALUES(461,152,4);
+INSERT INTO offering_instructor_assoc VALUES(462,153,2);
+INSERT INTO offering_instructor_assoc VALUES(463,153,3);
+INSERT INTO offering_instructor_assoc VALUES(471,155,1);
+INSERT INTO offering_instructor_assoc VALUES(472,155,4);
+INSERT INTO offering_instructor_assoc VALUES(475,156,2);
+INSERT INTO offering_instructor_assoc VALUES(479,157,1);
+INSERT INTO offering_instructor_assoc VALUES(490,160,4);
+INSERT INTO offering_instructor_assoc VALUES(491,160,3);
+INSERT INTO offering_instructor_assoc VALUES(494,161,4);
+INSERT INTO offering_instructor_assoc VALUES(495,161,2);
+INSERT INTO offering_instructor_assoc VALUES(499,163,1);
+INSERT INTO offering_instructor_assoc VALUES(500,163,2);
+INSERT INTO offering_instructor_assoc VALUES(505,166,3);
+INSERT INTO offering_instructor_assoc VALUES(506,166,2);
+INSERT INTO offering_instructor_assoc VALUES(509,167,3);
+INSERT INTO offering_instructor_assoc VALUES(510,167,1);
+INSERT INTO offering_instructor_assoc VALUES(523,171,3);
+INSERT INTO offering_instructor_assoc VALUES(525,172,3);
+INSERT INTO offering_instructor_assoc VALUES(526,172,4);
+INSERT INTO offering_instructor_assoc VALUES(531,173,3);
+INSERT INTO offering_instructor_assoc VALUES(532,173,1);
+INSERT INTO offering_instructor_assoc VALUES(533,174,2);
+INSERT INTO offering_instructor_assoc VALUES(537,175,1);
+INSERT INTO offering_instructor_assoc VALUES(538,175,4);
+INSERT INTO offering_instructor_assoc VALUES(546,177,3);
+INSERT INTO offering_instructor_assoc VALUES(555,182,2);
+INSERT INTO offering_instructor_assoc VALUES(560,183,3);
+INSERT INTO offering_instructor_assoc VALUES(561,183,4);
+INSERT INTO offering_instructor_assoc VALUES(564,184,2);
+INSERT INTO offering_instructor_assoc VALUES(569,185,1);
+INSERT INTO offering_instructor_assoc VALUES(570,185,2);
+INSERT INTO offering_instructor_assoc VALUES(572,186,3);
+INSERT INTO offering_instructor_assoc VALUES(577,187,3);
+INSERT INTO offering_instructor_assoc VALUES(578,188,4);
+INSERT INTO offering_instructor_assoc VALUES(583,190,3);
+INSERT INTO offering_instructor_assoc VALUES(584,190,1);
+INSERT INTO offering_instructor_assoc VALUES(588,191,4);
+INSERT INTO offering_instructor_assoc VALUES(592,192,4);
+INSERT INTO offering_instructor_assoc VALUES(593,192,1);
+INSERT INTO offering_instructor_assoc VALUES(601,194,1);
+INSERT INTO offering_instructor_assoc VALUES(604,196,3);
+INSERT INTO offering_instructor_assoc VALUES(605,196,1);
+INSERT INTO offering_instructor_assoc VALUES(606,197,1);
+INSERT INTO offering_instructor_assoc VALUES(609,199,2);
+CREATE INDEX ix_offering_meeting_assoc_offering_id ON offering_meeting_assoc (offering_id);
+CREATE INDEX ix_offering_meeting_assoc_meeting_id ON offering_meeting_assoc (meeting_id);
+CREATE INDEX ix_offering_core_assoc_core_code ON offering_core_assoc (core_code);
+CREATE INDEX ix_offering_core_assoc_offering_id ON offering_core_assoc (offering_id);
+CREATE INDEX ix_offering_instructor_assoc_offering_id ON offering_instructor_assoc (offering_id);
+CREATE INDEX ix_offering_instructor_assoc_instructor_id ON offering_instructor_assoc (instructor_id);
+COMMIT;
@@ -122,3 +122,52 @@ CREATE INDEX ix_offering_core_assoc_core_code ON offering_core_assoc (core_code)
 CREATE INDEX ix_offering_core_assoc_offering_id ON offering_core_assoc (offering_id);
 CREATE INDEX ix_offering_instructor_assoc_offering_id ON offering_instructor_assoc (offering_id);
 CREATE INDEX ix_offering_instructor_assoc_instructor_id ON offering_instructor_assoc (instructor_id);
+CREATE TABLE data_versions (
+	id INTEGER NOT NULL, 
+	timestamp VARCHAR NOT NULL, 
+	PRIMARY KEY (id)
+);
+CREATE TABLE offering_fragments (
+	offering_id INTEGER NOT NULL, 
+	version INTEGER NOT NULL, 
+	fragment VARCHAR NOT NULL, 
+	PRIMARY KEY (offering_id), 
+	FOREIGN KEY(offering_id) REFERENCES offerings (id) ON DELETE CASCADE, 
+	FOREIGN KEY(version) REFERENCES data_versions (id)
+);
+CREATE TABLE department_stats (
+	semester_id INTEGER NOT NULL, 
+	department_code VARCHAR NOT NULL, 
+	num_sections INTEGER NOT NULL, 
+	num_seats INTEGER NOT NULL, 
+	num_enrolled INTEGER NOT NULL, 
+	num_waitlisted INTEGER NOT NULL, 
+	PRIMARY KEY (semester_id, department_code), 
+	FOREIGN KEY(semester_id) REFERENCES semesters (id) ON DELETE CASCADE, 
+	FOREIGN KEY(department_code) REFERENCES departments (code) ON DELETE CASCADE
+);
+CREATE TABLE core_stats (
+	semester_id INTEGER NOT NULL, 
+	core_code VARCHAR NOT NULL, 
+	num_sections INTEGER NOT NULL, 
+	num_seats INTEGER NOT NULL, 
+	num_enrolled INTEGER NOT NULL, 
+	num_waitlisted INTEGER NOT NULL, 
+	PRIMARY KEY (semester_id, core_code), 
+	FOREIGN KEY(semester_id) REFERENCES semesters (id) ON DELETE CASCADE, 
+	FOREIGN KEY(core_code) REFERENCES cores (code) ON DELETE CASCADE
+);
+CREATE TABLE course_histories (
+	course_id INTEGER NOT NULL, 
+	history VARCHAR NOT NULL, 
+	PRIMARY KEY (course_id), 
+	FOREIGN KEY(course_id) REFERENCES courses (id) ON DELETE CASCADE
+);
+CREATE TABLE offering_tombstones (
+	offering_id INTEGER NOT NULL, 
+	readable_id VARCHAR NOT NULL, 
+	version INTEGER, 
+	PRIMARY KEY (offering_id), 
+	FOREIGN KEY(version) REFERENCES data_versions (id)
+);
+CREATE INDEX ix_offering_tombstones_readable_id ON offering_tombstones (readable_id);
@@ -0,0 +1,214 @@
+"""Request metrics for subitize.
+
+Metrics are kept in memory per process and exposed in the Prometheus text
+format; with several gunicorn workers, each worker reports its own. Time
+spent executing SQL is counted in the `sql` phase only; it is subtracted from
+whichever other phase was running at the time, so that (for example) the
+`serialize` phase measures the work of `to_json_dict` itself and not the lazy
+loads it triggers.
+
+Every statement is timed by a single pair of engine events, which other
+modules (such as the slow statement log) can listen to as well.
+"""
+
+from collections import defaultdict
+from contextlib import contextmanager
+from threading import Lock
+from time import perf_counter
+
+from flask import g, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+STATEMENTS_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+BYTES_BUCKETS = (1000, 10000, 100000, 250000, 500000, 1000000, 2500000, 10000000)
+
+
+class Histogram:
+    """A cumulative histogram with fixed buckets."""
+
+    def __init__(self, buckets):
+        """Initialize the histogram.
+
+        Arguments:
+            buckets (Sequence[float]): The upper bounds of the buckets.
+        """
+        self.buckets = buckets
+        self.counts = [0 for _ in buckets]
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        """Record a value.
+
+        Arguments:
+            value (float): The value to record.
+        """
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += value
+
+
+class MetricsRegistry:
+    """A thread-safe collection of labeled histograms."""
+
+    def __init__(self):
+        """Initialize the registry."""
+        self.lock = Lock()
+        self.histograms = {}
+
+    def observe(self, name, buckets, labels, value):
+        """Record a value in a histogram.
+
+        Arguments:
+            name (str): The name of the metric.
+            buckets (Sequence[float]): The buckets of the histogram.
+            labels (tuple[tuple[str, str]]): The label names and values.
+            value (float): The value to record.
+        """
+        key = (name, labels)
+        with self.lock:
+            if key not in self.histograms:
+                self.histograms[key] = Histogram(buckets)
+            self.histograms[key].observe(value)
+
+    def render(self):
+        """Render all metrics in the Prometheus text format.
+
+        Returns:
+            str: The metrics.
+        """
+        with self.lock:
+            histograms = sorted(self.histograms.items())
+        lines = []
+        last_name = None
+        for (name, labels), histogram in histograms:
+            if name != last_name:
+                lines.append(f'# HELP {name} {METRIC_DESCRIPTIONS[name]}')
+                lines.append(f'# TYPE {name} histogram')
+                last_name = name
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{format_labels(labels, le=bound)}}} {cumulative}')
+            lines.append(f'{name}_bucket{{{format_labels(labels, le="+Inf")}}} {histogram.count}')
+            lines.append(f'{name}_sum{{{format_labels(labels)}}} {histogram.sum}')
+            lines.append(f'{name}_count{{{format_labels(labels)}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+METRIC_DESCRIPTIONS = {
+    'subitize_request_duration_seconds': 'Total time to serve a request.',
+    'subitize_request_phase_seconds': 'Time spent in each phase of a request.',
+    'subitize_request_sql_statements': 'Number of SQL statements executed by a request.',
+    'subitize_response_size_bytes': 'Size of the response body.',
+}
+
+METRICS = MetricsRegistry()
+
+
+def format_labels(labels, **extra):
+    """Format labels for the Prometheus text format.
+
+    Arguments:
+        labels (tuple[tuple[str, str]]): The label names and values.
+        **extra (str): Additional labels.
+
+    Returns:
+        str: The comma-separated labels.
+    """
+    pairs = list(labels) + list(extra.items())
+    return ','.join(
+        '{}="{}"'.format(key, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+        for key, value in pairs
+    )
+
+
+def start_request():
+    """Start collecting metrics for the current request."""
+    g.metrics_start = perf_counter()
+    g.metrics_phases = defaultdict(float)
+    g.metrics_sql_time = 0
+    g.metrics_sql_statements = 0
+
+
+def finish_request(route, response):
+    """Record the metrics of the current request.
+
+    Arguments:
+        route (str): The URL rule that served the request.
+        response (Response): The response to the request.
+    """
+    if 'metrics_start' not in g:
+        return
+    duration = perf_counter() - g.metrics_start
+    labels = (('route', route),)
+    METRICS.observe(
+        'subitize_request_duration_seconds', SECONDS_BUCKETS,
+        labels + (('status', str(response.status_code)),), duration,
+    )
+    g.metrics_phases['sql'] = g.metrics_sql_time
+    for phase, seconds in g.metrics_phases.items():
+        METRICS.observe('subitize_request_phase_seconds', SECONDS_BUCKETS, labels + (('phase', phase),), seconds)
+    METRICS.observe('subitize_request_sql_statements', STATEMENTS_BUCKETS, labels, g.metrics_sql_statements)
+    if not response.is_streamed:
+        METRICS.observe('subitize_response_size_bytes', BYTES_BUCKETS, labels, response.content_length or 0)
+
+
+@contextmanager
+def timed(phase):
+    """Time a phase of the current request.
+
+    Arguments:
+        phase (str): The name of the phase.
+
+    Yields:
+        None: Nothing.
+    """
+    if not has_request_context() or 'metrics_start' not in g:
+        yield
+        return
+    sql_time = g.metrics_sql_time
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = perf_counter() - start - (g.metrics_sql_time - sql_time)
+        g.metrics_phases[phase] += elapsed
+
+
+def listen_for_statements(listener):
+    """Call a function after every SQL statement, with the time it took.
+
+    Arguments:
+        listener (Callable[[Connection, Cursor, str, Sequence, bool, float], None]):
+            The function, called with the connection, the DBAPI cursor, the
+            statement, its parameters, whether it was executed with
+            executemany, and its duration in seconds.
+    """
+    STATEMENT_LISTENERS.append(listener)
+
+
+STATEMENT_LISTENERS = []
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # pylint: disable = unused-argument
+    conn.info.setdefault('query_start', []).append(perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # pylint: disable = unused-argument
+    elapsed = perf_counter() - conn.info['query_start'].pop()
+    if has_request_context() and 'metrics_start' in g:
+        g.metrics_sql_time += elapsed
+        g.metrics_sql_statements += 1
+    for listener in STATEMENT_LISTENERS:
+        listener(conn, cursor, statement, parameters, executemany, elapsed)
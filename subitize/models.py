@@ -1,24 +1,46 @@
 """Database models for subitize."""
 
+import json
 import sqlite3
 from datetime import datetime, date
+from os import environ
 from pathlib import Path
 from time import sleep
 
-from sqlalchemy import create_engine, event, select
+from sqlalchemy import create_engine, event, select, func, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy import Integer, String, Time, ForeignKey
 from sqlalchemy.orm import DeclarativeBase, mapped_column, relationship, Session
 from sqlalchemy.schema import UniqueConstraint
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import NullPool, StaticPool
 
 DATA_DIR = Path(__file__).resolve().parent / 'data'
 DB_PATH = DATA_DIR / 'counts.db'
 SQL_PATH = DATA_DIR / 'data.sql'
+# where the app writes its own files: the shards, the snapshots, and the query log
+OUTPUT_DIR = Path(environ.get('SUBITIZE_OUTPUT_DIR', DATA_DIR))
 
 SQLITE_URI = f'sqlite:///{DB_PATH}'
 
-ENGINE = create_engine(SQLITE_URI, poolclass=NullPool)
-event.listen(ENGINE, 'connect', (lambda dbapi_con, con_record: dbapi_con.execute('pragma foreign_keys=ON')))
+DATABASE_URL = make_url(environ.get('SUBITIZE_DATABASE_URL', SQLITE_URI))
+DATABASE_POOL_SIZE = int(environ.get('SUBITIZE_DATABASE_POOL_SIZE', '5'))
+
+# columns searched with ILIKE '%term%', which PostgreSQL can answer from a trigram index
+TRIGRAM_COLUMNS = {
+    'offerings': ['title'],
+    'departments': ['name'],
+    'cores': ['name'],
+    'people': ['system_name', 'first_name', 'last_name'],
+}
+
+if DATABASE_URL.get_backend_name() == 'sqlite':
+    # opening a SQLite connection is cheap, and connections must not be shared across forks
+    ENGINE = create_engine(DATABASE_URL, poolclass=NullPool)
+    event.listen(ENGINE, 'connect', (lambda dbapi_con, con_record: dbapi_con.execute('pragma foreign_keys=ON')))
+    DB_PATH = Path(DATABASE_URL.database)
+else:
+    ENGINE = create_engine(DATABASE_URL, pool_size=DATABASE_POOL_SIZE, pool_pre_ping=True)
 
 
 class Base(DeclarativeBase):
@@ -494,6 +516,17 @@ class Offering(Base):
         parts.append(self.section)
         return '_'.join(parts)
 
+    def to_json_fragment(self):
+        """Represent this offering as encoded JSON.
+
+        The encoding matches that of the JSON endpoints, so that fragments
+        can be concatenated directly into a response.
+
+        Returns:
+            str: The JSON.
+        """
+        return json.dumps(self.to_json_dict(), sort_keys=True, separators=(',', ':'))
+
     def to_json_dict(self):
         """Represent this offering in JSON-compatible dictionary.
 
@@ -605,6 +638,82 @@ class CourseDescription(Base):
     parsed_prerequisites = mapped_column(String, nullable=True)
 
 
+class DataVersion(Base):
+    """A version of the data, created whenever an update changes it."""
+
+    __tablename__ = 'data_versions'
+    id = mapped_column(Integer, primary_key=True)
+    timestamp = mapped_column(String, nullable=False)
+
+
+class OfferingFragment(Base):
+    """The pre-encoded JSON of an offering, as of a data version."""
+
+    __tablename__ = 'offering_fragments'
+    offering_id = mapped_column(Integer, ForeignKey('offerings.id', ondelete='CASCADE'), primary_key=True)
+    version = mapped_column(Integer, ForeignKey('data_versions.id'), nullable=False)
+    fragment = mapped_column(String, nullable=False)
+
+
+class OfferingTombstone(Base):
+    """A deleted offering, as of the data version that deleted it."""
+
+    __tablename__ = 'offering_tombstones'
+    offering_id = mapped_column(Integer, primary_key=True)
+    readable_id = mapped_column(String, nullable=False, index=True)
+    version = mapped_column(Integer, ForeignKey('data_versions.id'), nullable=True)
+
+
+class DepartmentStats(Base):
+    """The enrollment totals of a department in a semester."""
+
+    __tablename__ = 'department_stats'
+    semester_id = mapped_column(Integer, ForeignKey('semesters.id', ondelete='CASCADE'), primary_key=True)
+    department_code = mapped_column(String, ForeignKey('departments.code', ondelete='CASCADE'), primary_key=True)
+    num_sections = mapped_column(Integer, nullable=False)
+    num_seats = mapped_column(Integer, nullable=False)
+    num_enrolled = mapped_column(Integer, nullable=False)
+    num_waitlisted = mapped_column(Integer, nullable=False)
+
+    @property
+    def fill_rate(self):
+        """Get the fraction of seats that are filled.
+
+        Returns:
+            float: The fill rate, or None if there are no seats.
+        """
+        return self.num_enrolled / self.num_seats if self.num_seats else None
+
+
+class CoreStats(Base):
+    """The enrollment totals of a core requirement in a semester."""
+
+    __tablename__ = 'core_stats'
+    semester_id = mapped_column(Integer, ForeignKey('semesters.id', ondelete='CASCADE'), primary_key=True)
+    core_code = mapped_column(String, ForeignKey('cores.code', ondelete='CASCADE'), primary_key=True)
+    num_sections = mapped_column(Integer, nullable=False)
+    num_seats = mapped_column(Integer, nullable=False)
+    num_enrolled = mapped_column(Integer, nullable=False)
+    num_waitlisted = mapped_column(Integer, nullable=False)
+
+    @property
+    def fill_rate(self):
+        """Get the fraction of seats that are filled.
+
+        Returns:
+            float: The fill rate, or None if there are no seats.
+        """
+        return self.num_enrolled / self.num_seats if self.num_seats else None
+
+
+class CourseHistory(Base):
+    """The pre-encoded offering history of a course."""
+
+    __tablename__ = 'course_histories'
+    course_id = mapped_column(Integer, ForeignKey('courses.id', ondelete='CASCADE'), primary_key=True)
+    history = mapped_column(String, nullable=False)
+
+
 def create_session():
     """Create a SQLAlchemy session.
 
@@ -614,18 +723,80 @@ def create_session():
     return Session(ENGINE)
 
 
-def create_db():
-    """Read the dump into a binary SQLite file."""
-    if not DB_PATH.exists():
+def create_db(rebuild=False):
+    """Read the dump into a binary SQLite file.
+
+    The dump is loaded into memory and then copied into the file with the
+    SQLite backup API, so that processes reading the database wait for the
+    copy to finish instead of seeing a partial one.
+
+    If the app is configured to use another database, only the tables (and
+    the search indices) are created; the data must be copied in separately.
+
+    Arguments:
+        rebuild (bool): Replace the SQLite file even if it exists. Optional.
+    """
+    if ENGINE.dialect.name != 'sqlite':
+        Base.metadata.create_all(ENGINE)
+        create_trigram_indices(ENGINE)
+        return
+    if rebuild or not DB_PATH.exists():
         with SQL_PATH.open(encoding='utf-8') as fd:
             dump = fd.read()
-        conn = sqlite3.connect(DB_PATH)
-        with conn:
-            conn.executescript(dump)
-        conn.close()
+        source = sqlite3.connect(':memory:')
+        target = sqlite3.connect(DB_PATH)
+        try:
+            with source:
+                source.executescript(dump)
+            # tables newer than the dump are created before the copy, not after
+            Base.metadata.create_all(create_engine('sqlite://', creator=(lambda: source), poolclass=StaticPool))
+            source.backup(target)
+        finally:
+            source.close()
+            target.close()
     Base.metadata.create_all(ENGINE)
 
 
+def create_trigram_indices(engine):
+    """Create trigram indices for the searched columns of a PostgreSQL database.
+
+    Nothing is done for other databases, or if the pg_trgm extension is not
+    available, in which case searches fall back to sequential scans.
+
+    Arguments:
+        engine (Engine): The engine of the database.
+
+    Returns:
+        bool: True if the indices exist.
+    """
+    if engine.dialect.name != 'postgresql':
+        return False
+    try:
+        with engine.begin() as conn:
+            conn.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+    except DBAPIError:
+        return False
+    with engine.begin() as conn:
+        for table, columns in TRIGRAM_COLUMNS.items():
+            for column in columns:
+                conn.execute(text(
+                    f'CREATE INDEX IF NOT EXISTS ix_{table}_{column}_trgm ON {table} USING gin ({column} gin_trgm_ops)'
+                ))
+    return True
+
+
+def get_data_version(session):
+    """Get the current data version.
+
+    Arguments:
+        session (Session): The sqlalchemy session to connect with.
+
+    Returns:
+        int: The current data version, or 0 if there are no versions.
+    """
+    return session.scalar(select(func.max(DataVersion.id))) or 0
+
+
 def get_or_create(session, model, **kwargs):
     """Retrieve or create an object from the database.
 
@@ -0,0 +1,154 @@
+"""The prerequisite graph between courses.
+
+The prerequisites of a course are parsed by the update script into a list of
+clauses, all of which must be satisfied; each clause is a list of courses,
+any one of which satisfies it. The graph keeps the most recent prerequisites
+of every course, along with the transitive closure of the prerequisite
+relation in both directions.
+"""
+
+import json
+import re
+from collections import defaultdict
+
+from sqlalchemy import select
+
+from .models import Course, CourseDescription
+
+COURSE_REGEX = re.compile(r'([A-Za-z]{2,4})[\s_-]*([0-9]{1,3}[A-Za-z]?)')
+
+
+def _closure(edges):
+    """Compute the transitive closure of a directed graph.
+
+    Arguments:
+        edges (dict[int, set[int]]): The successors of each node.
+
+    Returns:
+        dict[int, frozenset[int]]: The nodes reachable from each node.
+    """
+    closure = {}
+    for start in edges:
+        reachable = set()
+        frontier = list(edges[start])
+        while frontier:
+            node = frontier.pop()
+            if node not in reachable:
+                reachable.add(node)
+                frontier.extend(edges.get(node, ()))
+        closure[start] = frozenset(reachable)
+    return closure
+
+
+class PrerequisiteGraph:
+    """The prerequisites of every course."""
+
+    def __init__(self, session):
+        """Initialize the graph from the database.
+
+        Arguments:
+            session (Session): The sqlalchemy session to connect with.
+        """
+        self.courses = {}
+        self.names = {}
+        for course_id, department_code, number in session.execute(
+            select(Course.id, Course.department_code, Course.number)
+        ):
+            self.courses[(department_code, number)] = course_id
+            self.names[course_id] = f'{department_code} {number}'
+        self.requirements = {}
+        statement = (
+            select(CourseDescription.course_id, CourseDescription.parsed_prerequisites)
+            .where(CourseDescription.parsed_prerequisites.is_not(None))
+            .order_by(CourseDescription.year)
+        )
+        # later catalog years replace earlier ones
+        for course_id, parsed_prerequisites in session.execute(statement):
+            self.requirements[course_id] = [frozenset(clause) for clause in json.loads(parsed_prerequisites)]
+        prerequisites = {
+            course_id: set().union(*clauses)
+            for course_id, clauses in self.requirements.items()
+        }
+        dependents = defaultdict(set)
+        for course_id, prerequisite_ids in prerequisites.items():
+            for prerequisite_id in prerequisite_ids:
+                dependents[prerequisite_id].add(course_id)
+        self.ancestors = _closure(prerequisites)
+        self.descendants = _closure(dependents)
+
+    def parse_courses(self, text):
+        """Find the courses in a list of course numbers.
+
+        Arguments:
+            text (str): The courses, eg. "COMP 131,MATH 120". Unknown courses
+                are ignored.
+
+        Returns:
+            set[int]: The course IDs.
+        """
+        return set(
+            self.courses[(department.upper(), number.upper())]
+            for department, number in COURSE_REGEX.findall(text)
+            if (department.upper(), number.upper()) in self.courses
+        )
+
+    def missing(self, course_id, completed):
+        """Get the prerequisites of a course that have not been satisfied.
+
+        Arguments:
+            course_id (int): The ID of the course.
+            completed (set[int]): The IDs of the completed courses.
+
+        Returns:
+            list[frozenset[int]]: The unsatisfied clauses, any course in each
+                of which would satisfy it.
+        """
+        return [clause for clause in self.requirements.get(course_id, ()) if clause.isdisjoint(completed)]
+
+    def is_eligible(self, course_id, completed):
+        """Check if the prerequisites of a course have been satisfied.
+
+        Arguments:
+            course_id (int): The ID of the course.
+            completed (set[int]): The IDs of the completed courses.
+
+        Returns:
+            bool: True if all prerequisites are satisfied.
+        """
+        return not self.missing(course_id, completed)
+
+    def ineligible(self, completed):
+        """Find the courses whose prerequisites have not been satisfied.
+
+        Arguments:
+            completed (set[int]): The IDs of the completed courses.
+
+        Returns:
+            set[int]: The IDs of the ineligible courses.
+        """
+        return set(
+            course_id for course_id, clauses in self.requirements.items()
+            if any(clause.isdisjoint(completed) for clause in clauses)
+        )
+
+    def all_prerequisites(self, course_id):
+        """Get the courses that a course directly or indirectly requires.
+
+        Arguments:
+            course_id (int): The ID of the course.
+
+        Returns:
+            frozenset[int]: The IDs of the required courses.
+        """
+        return self.ancestors.get(course_id, frozenset())
+
+    def unlocks(self, course_id):
+        """Get the courses that directly or indirectly require a course.
+
+        Arguments:
+            course_id (int): The ID of the course.
+
+        Returns:
+            frozenset[int]: The IDs of the dependent courses.
+        """
+        return self.descendants.get(course_id, frozenset())
@@ -0,0 +1,281 @@
+"""In-memory search indices for subitize."""
+
+import re
+from collections import defaultdict
+from heapq import nlargest
+from math import log
+
+from sqlalchemy import select
+
+from .models import Core, Department, Course, Person, Offering
+from .models import OfferingCore, OfferingInstructor
+
+FUZZY_THRESHOLD = 0.4
+FUZZY_LIMIT = 5
+
+RELEVANCE_FIELD_WEIGHTS = {
+    'title': 3.0,
+    'department': 2.0,
+    'number': 2.0,
+    'instructors': 1.5,
+    'cores': 1.0,
+}
+RELEVANCE_K1 = 1.2
+RELEVANCE_B = 0.75
+RELEVANCE_GRAM_LENGTH = 3
+
+
+def trigrams(text):
+    """Split text into its character trigrams.
+
+    Words are lowercased and padded with two leading and one trailing space,
+    the same scheme used by PostgreSQL's pg_trgm.
+
+    Arguments:
+        text (str): The text to split.
+
+    Returns:
+        set[str]: The trigrams of the text.
+    """
+    result = set()
+    for word in re.findall(r'\w+', text.lower()):
+        word = f'  {word} '
+        for i in range(len(word) - 2):
+            result.add(word[i:i + 3])
+    return result
+
+
+class TrigramIndex:
+    """An inverted index from trigrams to keys."""
+
+    def __init__(self):
+        """Initialize the index."""
+        self.postings = defaultdict(set)
+        self.sizes = {}
+
+    def add(self, key, text):
+        """Add a key to the index.
+
+        Arguments:
+            key (Hashable): The key to return when the text matches.
+            text (str): The text to index the key by.
+        """
+        grams = trigrams(text)
+        if not grams:
+            return
+        for gram in grams:
+            self.postings[gram].add(key)
+        self.sizes[key] = len(grams)
+
+    def search(self, text, threshold=FUZZY_THRESHOLD, limit=FUZZY_LIMIT):
+        """Find the keys whose text is most similar to the given text.
+
+        Similarity is the Jaccard similarity of the two trigram sets. Only keys
+        that share at least one trigram with the text are ever scored.
+
+        Arguments:
+            text (str): The text to search for.
+            threshold (float): The minimum similarity, inclusive. Optional.
+            limit (int): The maximum number of results. Optional.
+
+        Returns:
+            list[tuple[Hashable, float]]: The keys and their similarity,
+                from most to least similar.
+        """
+        grams = trigrams(text)
+        if not grams:
+            return []
+        overlaps = defaultdict(int)
+        for gram in grams:
+            for key in self.postings.get(gram, ()):
+                overlaps[key] += 1
+        results = []
+        for key, overlap in overlaps.items():
+            similarity = overlap / (len(grams) + self.sizes[key] - overlap)
+            if similarity >= threshold:
+                results.append((key, similarity))
+        results.sort(key=lambda pair: (-pair[1], pair[0]))
+        return results[:limit]
+
+
+class SearchIndex:
+    """The fuzzy search indices over people and offering titles."""
+
+    def __init__(self, session):
+        """Initialize the index from the database.
+
+        Arguments:
+            session (Session): The sqlalchemy session to connect with.
+        """
+        self.instructors = TrigramIndex()
+        self.words = TrigramIndex()
+        vocabulary = set()
+        for person in session.scalars(select(Person)):
+            self.instructors.add(person.system_name, f'{person.first_name} {person.last_name}')
+            vocabulary.update(re.findall(r'\w+', f'{person.first_name} {person.last_name}'))
+        for title, in session.execute(select(Offering.title).distinct()):
+            vocabulary.update(re.findall(r'\w+', title))
+        for name, in session.execute(select(Department.name)):
+            vocabulary.update(re.findall(r'\w+', name))
+        for name, in session.execute(select(Core.name)):
+            vocabulary.update(re.findall(r'\w+', name))
+        for word in vocabulary:
+            if len(word) > 2 and not word.isdigit():
+                self.words.add(word.lower(), word)
+
+    def correct_instructor(self, instructor):
+        """Find the system names closest to a misspelled instructor name.
+
+        Arguments:
+            instructor (str): The (possibly misspelled) name.
+
+        Returns:
+            list[tuple[str, float]]: The system names and their similarity.
+        """
+        return self.instructors.search(instructor)
+
+    def correct_term(self, term):
+        """Find the indexed words closest to a misspelled search term.
+
+        Arguments:
+            term (str): The (possibly misspelled) search term.
+
+        Returns:
+            list[tuple[str, float]]: The words and their similarity.
+        """
+        return self.words.search(term)
+
+
+class RelevanceIndex:
+    """A BM25F index over the searchable fields of offerings.
+
+    Each offering is a document with the fields listed in
+    RELEVANCE_FIELD_WEIGHTS. The length-normalized, weighted term frequency
+    of every token in every offering is precomputed, so that scoring a search
+    only touches the postings of its terms. Tokens are also indexed by their
+    substrings of up to three characters, so that finding the tokens that
+    contain a term only checks those that share its rarest trigram.
+
+    Search terms match the same way as in filter_by_search: a term matches
+    any token that contains it, except department and core requirement codes,
+    which must match exactly.
+    """
+
+    def __init__(self, session):
+        """Initialize the index from the database.
+
+        Arguments:
+            session (Session): The sqlalchemy session to connect with.
+        """
+        self.postings = defaultdict(dict)
+        self.codes = defaultdict(dict)
+        self.grams = defaultdict(set)
+        documents = defaultdict(lambda: defaultdict(list))
+        statement = (
+            select(Offering.id, Offering.title, Course.number, Department.code, Department.name)
+            .join(Course, Offering.course_id == Course.id)
+            .join(Department)
+        )
+        for offering_id, title, number, department_code, department_name in session.execute(statement):
+            documents[offering_id]['title'].extend(title.lower().split())
+            documents[offering_id]['number'].append(number.lower())
+            documents[offering_id]['department'].extend(department_name.lower().split())
+            self.codes[department_code.lower()][offering_id] = None
+        statement = (
+            select(OfferingInstructor.offering_id, Person.system_name, Person.first_name, Person.last_name)
+            .join(Person)
+        )
+        for offering_id, system_name, first_name, last_name in session.execute(statement):
+            documents[offering_id]['instructors'].extend(
+                set(f'{system_name} {first_name} {last_name}'.lower().split())
+            )
+        statement = select(OfferingCore.offering_id, Core.code, Core.name).join(Core)
+        for offering_id, core_code, core_name in session.execute(statement):
+            documents[offering_id]['cores'].extend(core_name.lower().split())
+            self.codes[core_code.lower()][offering_id] = None
+        self.size = len(documents)
+        average_lengths = {
+            field: sum(len(fields[field]) for fields in documents.values()) / max(self.size, 1)
+            for field in RELEVANCE_FIELD_WEIGHTS
+        }
+        for offering_id, fields in documents.items():
+            frequencies = defaultdict(float)
+            for field, tokens in fields.items():
+                if not average_lengths[field]:
+                    continue
+                normalization = 1 - RELEVANCE_B + RELEVANCE_B * len(tokens) / average_lengths[field]
+                for token in tokens:
+                    frequencies[token] += RELEVANCE_FIELD_WEIGHTS[field] / normalization
+            for token, frequency in frequencies.items():
+                self.postings[token][offering_id] = frequency
+        for token in self.postings:
+            for length in range(1, RELEVANCE_GRAM_LENGTH + 1):
+                for i in range(len(token) - length + 1):
+                    self.grams[token[i:i + length]].add(token)
+
+    def match(self, term):
+        """Get the weighted term frequencies of the offerings matching a term.
+
+        Arguments:
+            term (str): The search term.
+
+        Returns:
+            dict[int, float]: The weighted term frequency of each matching
+                offering.
+        """
+        term = term.lower()
+        frequencies = defaultdict(float)
+        # every token containing the term contains each of its trigrams, so the rarest one is enough to check
+        candidates = min(
+            (
+                self.grams.get(term[i:i + RELEVANCE_GRAM_LENGTH], ())
+                for i in range(max(len(term) - RELEVANCE_GRAM_LENGTH, 0) + 1)
+            ),
+            key=len,
+        )
+        for token in candidates:
+            if term in token:
+                for offering_id, frequency in self.postings[token].items():
+                    frequencies[offering_id] += frequency
+        for offering_id in self.codes.get(term, ()):
+            # exact code matches count as a single unweighted occurrence
+            frequencies[offering_id] += 1.0
+        return frequencies
+
+    def search(self, terms, limit, accept=None, tiebreak=None):
+        """Find the offerings that best match search terms.
+
+        Only offerings that match every term are returned, as with
+        filter_by_search. Scores are only computed for offerings in the
+        postings of the rarest term, and only the top results are kept.
+
+        Arguments:
+            terms (str): A space-separated string of search terms.
+            limit (int): The maximum number of results.
+            accept (Callable[[int], bool]): Whether an offering passes the
+                other filters of the search. Optional.
+            tiebreak (Callable[[int], int]): The rank of an offering among
+                those with the same score, lowest first. Optional.
+
+        Returns:
+            list[int]: The offering IDs, from most to least relevant.
+        """
+        matches = sorted((self.match(term) for term in terms.split()), key=len)
+        if not matches:
+            return []
+        scores = {}
+        for offering_id in matches[0]:
+            if accept is not None and not accept(offering_id):
+                continue
+            score = 0
+            for frequencies in matches:
+                frequency = frequencies.get(offering_id)
+                if frequency is None:
+                    break
+                idf = log(1 + (self.size - len(frequencies) + 0.5) / (len(frequencies) + 0.5))
+                score += idf * frequency / (RELEVANCE_K1 + frequency)
+            else:
+                scores[offering_id] = score
+        if tiebreak is None:
+            return nlargest(limit, scores, key=scores.__getitem__)
+        return nlargest(limit, scores, key=(lambda offering_id: (scores[offering_id], -tiebreak(offering_id))))
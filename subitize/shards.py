@@ -0,0 +1,258 @@
+"""Per-semester database shards for subitize.
+
+The full database is split into a reference database, which holds everything
+except offerings (departments, people, cores, buildings, etc.), and one shard
+per semester that holds only that semester's offerings and their
+associations. Each shard is opened with the reference database attached;
+since SQLite resolves unqualified table names in the main database first and
+in attached databases after, the usual models and subitizelib queries work
+unchanged against a shard.
+
+Shards are written by the update script (and when a server starts, if they
+are missing), never while serving a request. They are only rewritten when
+their contents change, so updating the current semester leaves the files of
+past semesters untouched. The manifest records the data version the shards
+were made from, and they are only used while that version is current and
+the app itself is on SQLite.
+"""
+
+import json
+import re
+import sqlite3
+from hashlib import sha256
+from os import replace
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from threading import Lock
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from .models import DB_PATH, ENGINE, OUTPUT_DIR
+
+SHARD_DIR = OUTPUT_DIR / 'shards'
+REFERENCE_PATH = SHARD_DIR / 'reference.db'
+MANIFEST_PATH = SHARD_DIR / 'manifest.json'
+
+SHARDED_TABLES = {
+    'offerings': 'SELECT * FROM main.offerings WHERE semester_id = ? ORDER BY id',
+    'offering_meeting_assoc': 'SELECT * FROM main.offering_meeting_assoc WHERE offering_id IN (SELECT id FROM main.offerings WHERE semester_id = ?) ORDER BY id', # pylint: disable = line-too-long
+    'offering_core_assoc': 'SELECT * FROM main.offering_core_assoc WHERE offering_id IN (SELECT id FROM main.offerings WHERE semester_id = ?) ORDER BY id', # pylint: disable = line-too-long
+    'offering_instructor_assoc': 'SELECT * FROM main.offering_instructor_assoc WHERE offering_id IN (SELECT id FROM main.offerings WHERE semester_id = ?) ORDER BY id', # pylint: disable = line-too-long
+    'offering_fragments': 'SELECT * FROM main.offering_fragments WHERE offering_id IN (SELECT id FROM main.offerings WHERE semester_id = ?) ORDER BY offering_id', # pylint: disable = line-too-long
+}
+
+_ENGINES = {}
+_ENGINES_LOCK = Lock()
+
+
+def get_shard_path(semester_code):
+    """Get the path of the shard for a semester.
+
+    Arguments:
+        semester_code (str): The semester code.
+
+    Returns:
+        Path: The path of the shard.
+    """
+    return SHARD_DIR / f'{semester_code}.db'
+
+
+def get_shard_codes(version):
+    """Get the semesters that have shards of a data version, most recent first.
+
+    Arguments:
+        version (int): The data version.
+
+    Returns:
+        list[str]: The semester codes, or an empty list if the shards were
+            made from another version.
+    """
+    if ENGINE.dialect.name != 'sqlite' or not MANIFEST_PATH.exists():
+        return []
+    with MANIFEST_PATH.open(encoding='utf-8') as fd:
+        manifest = json.load(fd)
+    if manifest.get('version') != version:
+        return []
+    return sorted(manifest['semesters'], reverse=True)
+
+
+def _temp_path(path):
+    """Create an empty, uniquely named file next to a destination.
+
+    Arguments:
+        path (Path): The destination.
+
+    Returns:
+        Path: The path of the new file.
+    """
+    with NamedTemporaryFile(dir=path.parent, prefix=f'{path.name}.', suffix='.tmp', delete=False) as fd:
+        return Path(fd.name)
+
+
+def _copy_tables(conn, path, queries):
+    """Copy the results of queries into tables of a new database file.
+
+    The new file is written next to the destination and then moved into
+    place, so that open readers are never given a half-written file, and
+    processes writing the same file at once do not interfere.
+
+    Arguments:
+        conn (Connection): A sqlite3 connection to the full database.
+        path (Path): The database file to (re)write.
+        queries (dict[str, tuple[str, tuple]]): The SELECT query and
+            parameters for each table to copy.
+    """
+    temp_path = _temp_path(path)
+    try:
+        _attach_and_copy(conn, temp_path, queries)
+        replace(temp_path, path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+def _attach_and_copy(conn, path, queries):
+    """Copy the results of queries into tables of an empty database file.
+
+    Arguments:
+        conn (Connection): A sqlite3 connection to the full database.
+        path (Path): The empty database file.
+        queries (dict[str, tuple[str, tuple]]): The SELECT query and
+            parameters for each table to copy.
+    """
+    conn.execute('ATTACH DATABASE ? AS shard', (str(path),))
+    try:
+        for table, (query, parameters) in queries.items():
+            create_sql, = conn.execute(
+                "SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = ?", (table,),
+            ).fetchone()
+            conn.execute(re.sub(r'^CREATE TABLE\s+', 'CREATE TABLE shard.', create_sql))
+            conn.execute(f'INSERT INTO shard.{table} {query}', parameters)
+            for index_sql, in conn.execute(
+                "SELECT sql FROM main.sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+                (table,),
+            ).fetchall():
+                conn.execute(re.sub(r'^CREATE (UNIQUE )?INDEX\s+', r'CREATE \1INDEX shard.', index_sql))
+        conn.commit()
+    finally:
+        conn.execute('DETACH DATABASE shard')
+
+
+def _digest(conn, queries):
+    """Compute a digest of the results of queries.
+
+    Arguments:
+        conn (Connection): A sqlite3 connection to the full database.
+        queries (dict[str, tuple[str, tuple]]): The SELECT query and
+            parameters for each table.
+
+    Returns:
+        str: The hex digest.
+    """
+    digest = sha256()
+    for table, (query, parameters) in sorted(queries.items()):
+        digest.update(table.encode('utf-8'))
+        for row in conn.execute(query, parameters):
+            digest.update(repr(row).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def create_shards():
+    """Split the full database into the reference database and shards.
+
+    Returns:
+        list[str]: The semester codes (or "reference") that were rewritten.
+    """
+    if ENGINE.dialect.name != 'sqlite':
+        return []
+    SHARD_DIR.mkdir(parents=True, exist_ok=True)
+    if MANIFEST_PATH.exists():
+        with MANIFEST_PATH.open(encoding='utf-8') as fd:
+            old_manifest = json.load(fd)
+    else:
+        old_manifest = {'reference': None, 'semesters': {}}
+    manifest = {'reference': None, 'semesters': {}}
+    rewritten = []
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        manifest['version'] = conn.execute('SELECT max(id) FROM main.data_versions').fetchone()[0] or 0
+        tables = [
+            table for table, in conn.execute(
+                "SELECT name FROM main.sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+            )
+            if table not in SHARDED_TABLES
+        ]
+        queries = {table: (f'SELECT * FROM main.{table} ORDER BY rowid', ()) for table in tables}
+        manifest['reference'] = _digest(conn, queries)
+        if manifest['reference'] != old_manifest['reference'] or not REFERENCE_PATH.exists():
+            _copy_tables(conn, REFERENCE_PATH, queries)
+            rewritten.append('reference')
+        for semester_id, in conn.execute('SELECT id FROM main.semesters ORDER BY id').fetchall():
+            semester_code = str(semester_id)
+            queries = {table: (query, (semester_id,)) for table, query in SHARDED_TABLES.items()}
+            manifest['semesters'][semester_code] = _digest(conn, queries)
+            shard_path = get_shard_path(semester_code)
+            if manifest['semesters'][semester_code] != old_manifest['semesters'].get(semester_code) or not shard_path.exists(): # pylint: disable = line-too-long
+                _copy_tables(conn, shard_path, queries)
+                rewritten.append(semester_code)
+    finally:
+        conn.close()
+    for semester_code in set(old_manifest['semesters']) - set(manifest['semesters']):
+        get_shard_path(semester_code).unlink(missing_ok=True)
+    if manifest != old_manifest:
+        temp_path = _temp_path(MANIFEST_PATH)
+        try:
+            with temp_path.open('w', encoding='utf-8') as fd:
+                json.dump(manifest, fd, indent=4, sort_keys=True)
+            replace(temp_path, MANIFEST_PATH)
+        finally:
+            temp_path.unlink(missing_ok=True)
+    with _ENGINES_LOCK:
+        _ENGINES.clear()
+    return rewritten
+
+
+def _get_shard_engine(semester_code):
+    """Get (and cache) a read-only engine for the shard of a semester.
+
+    Arguments:
+        semester_code (str): The semester code.
+
+    Returns:
+        Engine: The engine, or None if there is no shard for the semester.
+    """
+    semester_code = str(semester_code)
+    if ENGINE.dialect.name != 'sqlite' or not semester_code.isdigit():
+        return None
+    with _ENGINES_LOCK:
+        if semester_code in _ENGINES:
+            return _ENGINES[semester_code]
+        shard_path = get_shard_path(semester_code)
+        if not shard_path.exists() or not REFERENCE_PATH.exists():
+            return None
+        engine = create_engine(f'sqlite:///file:{shard_path}?mode=ro&uri=true', poolclass=NullPool)
+        event.listen(
+            engine, 'connect',
+            (lambda dbapi_con, con_record: dbapi_con.execute(
+                'ATTACH DATABASE ? AS reference', (f'file:{REFERENCE_PATH}?mode=ro',),
+            )),
+        )
+        _ENGINES[semester_code] = engine
+        return engine
+
+
+def create_shard_session(semester_code):
+    """Create a SQLAlchemy session on the shard of a semester.
+
+    Arguments:
+        semester_code (str): The semester code.
+
+    Returns:
+        Session: A SQLAlchemy Session object, or None if there is no shard
+            for the semester.
+    """
+    engine = _get_shard_engine(semester_code)
+    if engine is None:
+        return None
+    return Session(engine)
@@ -0,0 +1,93 @@
+"""Slow SQL statement logging for subitize.
+
+Every statement executed through the engine is timed by the hook shared with
+the request metrics. Statements slower than SLOW_QUERY_SECONDS are logged
+with their parameters and query plan to the `subitize.sql` logger. When
+QUERY_DEBUG is set, requests that execute more than QUERY_BUDGET statements
+are logged as well, and every response reports its statement count in an
+X-Query-Count header.
+"""
+
+import logging
+from os import environ
+
+from .metrics import listen_for_statements
+from .utils import format_sql
+
+SLOW_QUERY_SECONDS = float(environ.get('SUBITIZE_SLOW_QUERY_SECONDS', '0.1'))
+QUERY_BUDGET = int(environ.get('SUBITIZE_QUERY_BUDGET', '50'))
+QUERY_DEBUG = environ.get('SUBITIZE_QUERY_DEBUG', '') not in ('', '0', 'false')
+
+LOGGER = logging.getLogger('subitize.sql')
+
+
+def explain(cursor, dialect, statement, parameters):
+    """Get the query plan of a statement.
+
+    The plan is retrieved through the raw DBAPI cursor so that it does not
+    itself trigger the engine events.
+
+    Arguments:
+        cursor (Cursor): The DBAPI cursor that executed the statement.
+        dialect (Dialect): The dialect of the engine.
+        statement (str): The SQL statement.
+        parameters (Sequence): The bound parameters.
+
+    Returns:
+        str: The query plan, one step per line.
+    """
+    if dialect.name == 'sqlite':
+        prefix = 'EXPLAIN QUERY PLAN '
+    else:
+        prefix = 'EXPLAIN '
+    try:
+        explain_cursor = cursor.connection.cursor()
+        explain_cursor.execute(prefix + statement, parameters)
+        rows = explain_cursor.fetchall()
+        explain_cursor.close()
+    except Exception as error: # pylint: disable = broad-exception-caught
+        return f'(unable to explain: {error})'
+    return '\n'.join(' '.join(str(column) for column in row) for row in rows)
+
+
+def check_query_budget(route, statements):
+    """Log a request that executed too many statements.
+
+    Arguments:
+        route (str): The URL rule that served the request.
+        statements (int): The number of statements executed.
+
+    Returns:
+        bool: True if the request was over budget.
+    """
+    if statements <= QUERY_BUDGET:
+        return False
+    LOGGER.warning('%s executed %d SQL statements (budget %d)', route, statements, QUERY_BUDGET)
+    return True
+
+
+def log_slow_statement(conn, cursor, statement, parameters, executemany, elapsed):
+    """Log a statement that took longer than SLOW_QUERY_SECONDS.
+
+    Arguments:
+        conn (Connection): The connection that executed the statement.
+        cursor (Cursor): The DBAPI cursor that executed the statement.
+        statement (str): The SQL statement.
+        parameters (Sequence): The bound parameters.
+        executemany (bool): Whether the statement was executed with
+            executemany.
+        elapsed (float): The duration of the statement, in seconds.
+    """
+    if elapsed < SLOW_QUERY_SECONDS:
+        return
+    if executemany:
+        plan = '(not explained: executemany)'
+    else:
+        plan = explain(cursor, conn.dialect, statement, parameters)
+    LOGGER.warning(
+        'slow SQL statement (%.3fs)\n%s\nparameters: %r\nplan:\n%s',
+        elapsed, format_sql(statement), parameters, plan,
+    )
+
+
+listen_for_statements(log_slow_statement)
@@ -0,0 +1,66 @@
+"""Whole-semester snapshots for subitize.
+
+A snapshot is a gzipped JSON file of every offering in a semester, in the
+same format as the results of the JSON endpoint. Snapshot file names include
+a digest of their contents, so a file never changes once written and can be
+cached indefinitely. Snapshots are deleted once superseded; the app redirects
+requests for them to the current snapshot of their semester.
+"""
+
+import gzip
+from hashlib import sha256
+from os import replace
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+
+from .models import OUTPUT_DIR
+from .compact import encode_json
+
+SNAPSHOT_DIR = OUTPUT_DIR / 'snapshots'
+
+
+def write_snapshot(semester_code, version, fragments):
+    """Write a snapshot of a semester, if it does not already exist.
+
+    Any other snapshots of the semester are deleted.
+
+    Arguments:
+        semester_code (str): The semester code.
+        version (int): The data version.
+        fragments (list[str]): The encoded JSON of the offerings.
+
+    Returns:
+        str: The file name of the snapshot.
+    """
+    contents = (
+        '{"results":[' + ','.join(fragments) + ']'
+        + ',"semester":' + encode_json(semester_code)
+        + ',"version":' + encode_json(version)
+        + '}'
+    ).encode('utf-8')
+    filename = f'{semester_code}-{sha256(contents).hexdigest()[:16]}.json.gz'
+    path = SNAPSHOT_DIR / filename
+    if not path.exists():
+        SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+        # processes may write the same snapshot at once, so each uses its own temporary file
+        with NamedTemporaryFile(dir=SNAPSHOT_DIR, prefix=f'{filename}.', suffix='.tmp', delete=False) as fd:
+            temp_path = Path(fd.name)
+            fd.write(gzip.compress(contents, compresslevel=9, mtime=0))
+        try:
+            replace(temp_path, path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+    prune_snapshots(semester_code, filename)
+    return filename
+
+
+def prune_snapshots(semester_code, filename):
+    """Delete the snapshots of a semester other than the current one.
+
+    Arguments:
+        semester_code (str): The semester code.
+        filename (str): The file name of the current snapshot.
+    """
+    for path in SNAPSHOT_DIR.glob(f'{semester_code}-*.json.gz'):
+        if path.name != filename:
+            path.unlink(missing_ok=True)
@@ -681,12 +681,35 @@ const load_starred_courses = () => {
         starred_courses_list = [];
         starred_courses = {};
     } else {
-        fetch(`/fetch/${course_list}`)
+        // only fetch courses that changed since they were cached
+        const readable_ids = course_list.split(",");
+        let cache = null;
+        try {
+            cache = JSON.parse(localStorage.getItem("starred-courses-cache"));
+        } catch (error) {
+            cache = null;
+        }
+        let since = 0;
+        if (cache !== null && readable_ids.every((readable_id) => Object.prototype.hasOwnProperty.call(cache.courses, readable_id))) {
+            since = cache.version;
+        }
+        fetch(`/changes/?since=${since}&ids=${course_list}`)
         .then((response) => response.json())
         .then((response) => {
-            starred_courses_list = Object.keys(response);
+            const courses = {};
+            if (response.since !== 0) {
+                readable_ids.forEach((readable_id) => courses[readable_id] = cache.courses[readable_id]);
+            }
+            response.changed.forEach((result) => courses[result.id] = result);
+            response.deleted.forEach((readable_id) => delete courses[readable_id]);
+            try {
+                localStorage.setItem("starred-courses-cache", JSON.stringify({version: response.version, courses: courses}));
+            } catch (error) {
+                // the cache is only an optimization
+            }
+            starred_courses_list = Object.keys(courses);
             starred_courses_list.sort();
-            starred_courses = response;
+            starred_courses = courses;
             update_starred_courses_display();
             save_starred_courses();
             if (curr_tab === "" && starred_courses_list.length > 0) {
@@ -1,4 +1,12 @@
-"""Query functions for subitize."""
+"""Query functions for subitize.
+
+The queries are written to run on both SQLite and PostgreSQL. In particular,
+no filter joins more than one row per offering, so that results need no
+DISTINCT (which PostgreSQL does not allow to be ordered by columns outside of
+the select list), and sorting by a property that an offering can have several
+of (eg. instructors) uses the first of them. For meetings, that is the
+earliest one, and every part of the sort key comes from that one meeting.
+"""
 
 # pylint: disable = singleton-comparison
 
@@ -6,7 +14,7 @@ from datetime import datetime
 
 from sqlalchemy import select, union
 from sqlalchemy.orm import aliased
-from sqlalchemy.sql.expression import and_, or_, asc, desc, func
+from sqlalchemy.sql.expression import and_, or_, asc, desc, func, case, false
 
 from .models import Semester, TimeSlot, Building, Room, Meeting, Core, Department, Course, Person, Offering
 from .models import OfferingMeeting, OfferingCore, OfferingInstructor
@@ -16,9 +24,9 @@ def create_select():
     """Create a blank query for course offerings.
 
     Returns:
-        Query: An unfiltered sqlalchemy Query on distinct Offerings.
+        Query: An unfiltered sqlalchemy Query on Offerings.
     """
-    return select(Offering).distinct()
+    return select(Offering)
 
 
 def filter_study_abroad(statement):
@@ -51,6 +59,10 @@ def filter_by_semester(statement, semester=None):
     """
     if semester is None:
         return statement
+    try:
+        semester = int(semester)
+    except ValueError:
+        return statement.where(false())
     return statement.join(
         select(Semester)
         .where(Semester.id == semester)
@@ -111,10 +123,13 @@ def filter_by_number(statement, minimum=None, maximum=None):
         Statement: The filtered Statement.
     """
     conditions = []
-    if minimum is not None:
-        conditions.append(Course.number_int >= minimum)
-    if maximum is not None:
-        conditions.append(Course.number_int <= maximum)
+    try:
+        if minimum is not None:
+            conditions.append(Course.number_int >= int(minimum))
+        if maximum is not None:
+            conditions.append(Course.number_int <= int(maximum))
+    except ValueError:
+        return statement.where(false())
     if conditions:
         return statement.join(select(Course).where(*conditions).subquery())
     else:
@@ -148,7 +163,10 @@ def filter_by_units(statement, units=None):
     """
     if units is None:
         return statement
-    return statement.where(Offering.units == units)
+    try:
+        return statement.where(Offering.units == int(units))
+    except ValueError:
+        return statement.where(false())
 
 
 def filter_by_instructor(statement, instructor=None):
@@ -163,12 +181,49 @@ def filter_by_instructor(statement, instructor=None):
     """
     if instructor is None:
         return statement
-    return statement.join(
-        select(OfferingInstructor)
+    return statement.where(Offering.id.in_(
+        select(OfferingInstructor.offering_id)
         .join(Person)
         .where(Person.system_name == instructor)
+    ))
+
+
+def filter_by_fuzzy_instructor(statement, instructor=None, index=None):
+    """Select offerings taught by instructors with names similar to a name.
+
+    Results are ordered by how similar the instructor's name is.
+
+    Arguments:
+        statement (Select): The existing query to build on.
+        instructor (str): The (possibly misspelled) name of the instructor. Optional.
+        index (SearchIndex): The fuzzy search index. Required if instructor is given.
+
+    Returns:
+        Statement: The filtered Statement.
+    """
+    if instructor is None:
+        return statement
+    matches = index.correct_instructor(instructor)
+    if not matches:
+        return statement.where(false())
+    subquery = (
+        select(
+            OfferingInstructor.offering_id.label('id'),
+            func.max(case(
+                *((Person.system_name == system_name, similarity) for system_name, similarity in matches),
+                else_=0,
+            )).label('score'),
+        )
+        .join(Person)
+        .where(Person.system_name.in_([system_name for system_name, _ in matches]))
+        .group_by(OfferingInstructor.offering_id)
         .subquery()
     )
+    return (
+        statement
+        .join(subquery, subquery.c.id == Offering.id)
+        .order_by(desc(subquery.c.score))
+    )
 
 
 def filter_by_meeting(statement, days=None, starts_after=None, ends_before=None):
@@ -231,12 +286,10 @@ def filter_by_core(statement, core=None):
     """
     if core is None:
         return statement
-    return statement.join(
-        select(OfferingCore)
-        .join(Core)
-        .where(Core.code == core)
-        .subquery()
-    )
+    return statement.where(Offering.id.in_(
+        select(OfferingCore.offering_id)
+        .where(OfferingCore.core_code == core)
+    ))
 
 
 def filter_by_openness(statement):
@@ -255,6 +308,23 @@ def filter_by_openness(statement):
     )
 
 
+def filter_by_prerequisites(statement, completed=None, graph=None):
+    """Select offerings whose prerequisites have been satisfied.
+
+    Arguments:
+        statement (Select): The existing query to build on.
+        completed (str): The completed courses, eg. "COMP 131,MATH 120". Optional.
+        graph (PrerequisiteGraph): The prerequisite graph. Required if
+            completed courses are given.
+
+    Returns:
+        Statement: The filtered Statement.
+    """
+    if completed is None:
+        return statement
+    return statement.where(Offering.course_id.not_in(graph.ineligible(graph.parse_courses(completed))))
+
+
 def filter_by_search(statement, terms=None):
     """Select offerings that match search terms.
 
@@ -279,7 +349,7 @@ def filter_by_search(statement, terms=None):
     for term in terms.split():
         offering_alias = aliased(Offering)
         subquery = (
-            select(offering_alias)
+            select(offering_alias.id)
             .join(Course)
             .join(Department)
             .join(OfferingCore, isouter=True)
@@ -297,14 +367,74 @@ def filter_by_search(statement, terms=None):
                 Person.system_name.ilike(f'%{term}%'),
                 Person.first_name.ilike(f'%{term}%'),
                 Person.last_name.ilike(f'%{term}%'),
-            )).subquery())
-        statement = statement.join(subquery, subquery.c.id == Offering.id)
+            ))
+        )
+        statement = statement.where(Offering.id.in_(subquery))
     return statement
 
 
+def filter_by_fuzzy_search(statement, terms=None, index=None):
+    """Select offerings that approximately match search terms.
+
+    Each search term is replaced by the most similar words in titles,
+    department names, core requirement names, and instructor names, which are
+    then matched as in filter_by_search. Results are ordered by the total
+    similarity of the replacements.
+
+    Arguments:
+        statement (Select): The existing query to build on.
+        terms (str): A space-separated string of search terms. Optional.
+        index (SearchIndex): The fuzzy search index. Required if terms are given.
+
+    Returns:
+        Statement: The filtered Statement.
+    """
+    if terms is None:
+        return statement
+    scores = []
+    for term in terms.split():
+        matches = index.correct_term(term)
+        if not matches:
+            return statement.where(false())
+        offering_alias = aliased(Offering)
+        conditions = [
+            (
+                or_(
+                    offering_alias.title.ilike(f'%{word}%'),
+                    Department.name.ilike(f'%{word}%'),
+                    Core.name.ilike(f'%{word}%'),
+                    Person.first_name.ilike(f'%{word}%'),
+                    Person.last_name.ilike(f'%{word}%'),
+                ),
+                similarity,
+            )
+            for word, similarity in matches
+        ]
+        subquery = (
+            select(
+                offering_alias.id.label('id'),
+                func.max(case(*conditions, else_=0)).label('score'),
+            )
+            .join(Course)
+            .join(Department)
+            .join(OfferingCore, isouter=True)
+            .join(Core, isouter=True)
+            .join(OfferingInstructor, isouter=True)
+            .join(Person, isouter=True)
+            .where(or_(*(condition for condition, _ in conditions)))
+            .group_by(offering_alias.id)
+            .subquery()
+        )
+        statement = statement.join(subquery, subquery.c.id == Offering.id)
+        scores.append(subquery.c.score)
+    return statement.order_by(desc(sum(scores)))
+
+
 def sort_offerings(statement, field=None):
     """Sort the results of a query.
 
+    Offerings that sort equally are in the order of their IDs.
+
     Arguments:
         statement (Select): The existing query to build on.
         field (str): The sorting order. Must be one of [semester, course,
@@ -317,7 +447,7 @@ def sort_offerings(statement, field=None):
         ValueError: If the field is invalid.
     """
     if field is None or field == 'semester':
-        return (
+        statement = (
             statement
             .join(Semester)
             .join(Course)
@@ -331,7 +461,7 @@ def sort_offerings(statement, field=None):
             )
         )
     elif field == 'course':
-        return (
+        statement = (
             statement
             .join(Course)
             .join(Department)
@@ -343,43 +473,83 @@ def sort_offerings(statement, field=None):
             )
         )
     elif field == 'title':
-        return statement.order_by(asc(Offering.title))
+        statement = statement.order_by(asc(Offering.title))
     elif field == 'units':
-        return statement.order_by(asc(Offering.units))
+        statement = statement.order_by(asc(Offering.units))
     elif field == 'instructors':
-        return (
+        subquery = (
+            select(
+                OfferingInstructor.offering_id.label('id'),
+                func.min(Person.last_name).label('last_name'),
+            )
+            .join(Person)
+            .group_by(OfferingInstructor.offering_id)
+            .subquery()
+        )
+        statement = (
             statement
-            .join(OfferingInstructor, isouter=True)
-            .join(Person, isouter=True)
+            .join(subquery, subquery.c.id == Offering.id, isouter=True)
             .order_by(
-                asc(Person.id == None),
-                asc(Person.last_name),
+                asc(subquery.c.last_name == None),
+                asc(subquery.c.last_name),
             )
         )
     elif field == 'meetings':
-        return (
+        # the weekday, times, and room all come from the offering's earliest meeting
+        weekday = func.substr(TimeSlot.weekdays, 1, 1)
+        ranked = (
+            select(
+                OfferingMeeting.offering_id.label('id'),
+                TimeSlot.id.label('timeslot_id'),
+                weekday.label('weekday'),
+                TimeSlot.start.label('start'),
+                TimeSlot.end.label('end'),
+                Room.id.label('room_id'),
+                Building.name.label('building'),
+                func.row_number().over(
+                    partition_by=OfferingMeeting.offering_id,
+                    order_by=(
+                        asc(TimeSlot.id == None),
+                        asc(weekday).nulls_first(),
+                        asc(TimeSlot.start).nulls_first(),
+                        asc(TimeSlot.end).nulls_first(),
+                        asc(OfferingMeeting.id),
+                    ),
+                ).label('rank'),
+            )
+            .join(Meeting, OfferingMeeting.meeting_id == Meeting.id)
+            .join(TimeSlot, Meeting.timeslot_id == TimeSlot.id, isouter=True)
+            .join(Room, Meeting.room_id == Room.id, isouter=True)
+            .join(Building, Room.building_code == Building.code, isouter=True)
+            .subquery()
+        )
+        subquery = select(ranked).where(ranked.c.rank == 1).subquery()
+        statement = (
             statement
-            .join(OfferingMeeting, isouter=True)
-            .join(Meeting, isouter=True)
-            .join(TimeSlot, isouter=True)
-            .join(Room, isouter=True)
-            .join(Building, isouter=True)
+            .join(subquery, subquery.c.id == Offering.id, isouter=True)
             .order_by(
-                asc(TimeSlot.id == None),
-                asc(func.substr(TimeSlot.weekdays, 1, 1)),
-                asc(TimeSlot.start),
-                asc(TimeSlot.end),
-                asc(Room.id == None),
-                asc(Building.name == None),
+                asc(subquery.c.timeslot_id == None),
+                asc(subquery.c.weekday).nulls_first(),
+                asc(subquery.c.start).nulls_first(),
+                asc(subquery.c.end).nulls_first(),
+                asc(subquery.c.room_id == None),
+                asc(subquery.c.building == None),
             )
         )
     elif field == 'cores':
-        return (
+        subquery = (
+            select(
+                OfferingCore.offering_id.label('id'),
+                func.min(OfferingCore.core_code).label('code'),
+            )
+            .group_by(OfferingCore.offering_id)
+            .subquery()
+        )
+        statement = (
             statement
-            .join(OfferingCore, isouter=True)
-            .join(Core, isouter=True)
-            .order_by(asc(Core.code))
+            .join(subquery, subquery.c.id == Offering.id, isouter=True)
+            .order_by(asc(subquery.c.code).nulls_first())
         )
     else:
         raise ValueError(f'invalid sorting key: {field}')
-        return statement # pylint: disable = unreachable
+    return statement.order_by(asc(Offering.id))
@@ -3,6 +3,18 @@
 import sqlparse
 from sqlalchemy.dialects import sqlite
 
+def format_sql(sql):
+    """Pretty format a SQL string.
+
+    Arguments:
+        sql (str): The SQL to format.
+
+    Returns:
+        str: The reindented SQL.
+    """
+    return sqlparse.format(sql, reindent=True, keyword_case='upper')
+
+
 def print_sql(query):
     """Pretty print a SQL query.
 
@@ -10,4 +22,4 @@ def print_sql(query):
         query (Query): A sqlalchemy query object.
     """
     sql = str(query.statement.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}))
-    print(sqlparse.format(sql, reindent=True, keyword_case='upper'))
+    print(format_sql(sql))
@@ -0,0 +1,180 @@
+"""Notifications of changes to the seats of offerings.
+
+Clients subscribe to a set of offerings and are sent the openness, enrollment,
+and waitlist of each whenever they change. A single watcher thread per process
+polls the data version; when an update changes it, the seats of every watched
+offering are read in one query, and only the offerings whose seats changed are
+queued for the subscribers watching them.
+"""
+
+from collections import defaultdict
+from os import environ
+from queue import Queue
+from threading import Lock, Thread
+from time import sleep
+
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+
+from .models import Offering, create_session, get_data_version
+
+WATCH_POLL_SECONDS = float(environ.get('SUBITIZE_WATCH_POLL_SECONDS', 15))
+WATCH_HEARTBEAT_SECONDS = 15
+WATCH_LIMIT = 50
+
+
+def get_seats(session, offering_ids):
+    """Get the seats of offerings.
+
+    Arguments:
+        session (Session): The sqlalchemy session to connect with.
+        offering_ids (list[int]): The IDs of the offerings.
+
+    Returns:
+        dict[int, dict]: The openness, enrollment, and waitlist of each
+            offering that exists.
+    """
+    if not offering_ids:
+        return {}
+    statement = (
+        select(Offering.id, Offering.num_enrolled, Offering.num_seats, Offering.num_reserved, Offering.num_waitlisted)
+        .where(Offering.id.in_(offering_ids))
+    )
+    return {
+        offering_id: {
+            # the same as Offering.is_open, without loading the offering
+            'is_open': num_waitlisted == 0 and num_enrolled < num_seats - num_reserved,
+            'num_enrolled': num_enrolled,
+            'num_waitlisted': num_waitlisted,
+        }
+        for offering_id, num_enrolled, num_seats, num_reserved, num_waitlisted in session.execute(statement)
+    }
+
+
+class Subscription:
+    """A client watching the seats of some offerings."""
+
+    def __init__(self, offering_ids, version, seats):
+        """Initialize the subscription.
+
+        Arguments:
+            offering_ids (dict[str, int]): The offering ID of each readable ID.
+            version (int): The data version of the initial seats.
+            seats (dict[str, dict]): The initial seats of each readable ID.
+        """
+        self.readable_ids = {offering_id: readable_id for readable_id, offering_id in offering_ids.items()}
+        self.version = version
+        self.seats = seats
+        self.events = Queue()
+
+
+class SeatWatcher:
+    """The subscriptions of a process, and the thread that notifies them."""
+
+    def __init__(self, poll_seconds=WATCH_POLL_SECONDS):
+        """Initialize the watcher.
+
+        The polling thread is only started by the first subscription, so that
+        it runs in the worker processes and not in a preloading parent.
+
+        Arguments:
+            poll_seconds (float): The time between checks of the data
+                version. Optional.
+        """
+        self.poll_seconds = poll_seconds
+        self.subscriptions = defaultdict(set)
+        self.seats = {}
+        self.version = None
+        self.lock = Lock()
+        self.thread = None
+
+    def subscribe(self, session, offering_ids):
+        """Start watching offerings.
+
+        Arguments:
+            session (Session): The sqlalchemy session to connect with.
+            offering_ids (dict[str, int]): The offering ID of each readable ID.
+
+        Returns:
+            Subscription: The subscription, with the current seats of the
+                offerings.
+        """
+        version = get_data_version(session)
+        seats = get_seats(session, list(offering_ids.values()))
+        subscription = Subscription(
+            offering_ids,
+            version,
+            {
+                readable_id: seats[offering_id]
+                for readable_id, offering_id in offering_ids.items()
+                if offering_id in seats
+            },
+        )
+        with self.lock:
+            if self.version is None:
+                self.version = version
+            for offering_id in subscription.readable_ids:
+                self.subscriptions[offering_id].add(subscription)
+                # the seats already known are the ones other subscribers were last sent
+                self.seats.setdefault(offering_id, seats.get(offering_id))
+            if self.thread is None:
+                self.thread = Thread(target=self.run, name='subitize-watch', daemon=True)
+                self.thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Stop watching offerings.
+
+        Arguments:
+            subscription (Subscription): The subscription.
+        """
+        with self.lock:
+            for offering_id in subscription.readable_ids:
+                self.subscriptions[offering_id].discard(subscription)
+                if not self.subscriptions[offering_id]:
+                    del self.subscriptions[offering_id]
+                    self.seats.pop(offering_id, None)
+
+    def check(self, session):
+        """Notify subscribers of the seats that changed since the last check.
+
+        Arguments:
+            session (Session): The sqlalchemy session to connect with.
+
+        Returns:
+            int: The number of offerings that changed.
+        """
+        version = get_data_version(session)
+        with self.lock:
+            if version == self.version:
+                return 0
+            offering_ids = list(self.subscriptions)
+        seats = get_seats(session, offering_ids)
+        changes = defaultdict(dict)
+        num_changed = 0
+        with self.lock:
+            self.version = version
+            for offering_id in offering_ids:
+                if offering_id not in self.subscriptions:
+                    continue
+                offering_seats = seats.get(offering_id)
+                if offering_seats == self.seats.get(offering_id):
+                    continue
+                self.seats[offering_id] = offering_seats
+                num_changed += 1
+                for subscription in self.subscriptions[offering_id]:
+                    changes[subscription][subscription.readable_ids[offering_id]] = offering_seats
+        for subscription, subscription_changes in changes.items():
+            subscription.events.put((version, subscription_changes))
+        return num_changed
+
+    def run(self):
+        """Check for changes until the process exits."""
+        while True:
+            sleep(self.poll_seconds)
+            try:
+                with create_session() as session:
+                    self.check(session)
+            except OperationalError:
+                # eg. the database is locked by an update; try again next time
+                continue
@@ -3,6 +3,8 @@
 """The subitize web-app."""
 
 from subitize import app
+from subitize.app import prepare
 
 if __name__ == '__main__':
+    prepare()
     app.run(host='0.0.0.0')
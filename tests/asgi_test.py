@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+# pylint: disable = missing-docstring, wrong-import-position
+
+import asyncio
+import atexit
+import sys
+from os import environ
+from pathlib import Path
+from shutil import rmtree
+from tempfile import mkdtemp
+from threading import Event
+
+from werkzeug.wrappers import Response
+
+# the tests use a scratch database and output directory, so that they never write to the package's data
+if 'SUBITIZE_OUTPUT_DIR' not in environ:
+    environ['SUBITIZE_OUTPUT_DIR'] = mkdtemp(prefix='subitize-test-')
+    atexit.register(rmtree, environ['SUBITIZE_OUTPUT_DIR'], ignore_errors=True)
+environ.setdefault('SUBITIZE_DATABASE_URL', f"sqlite:///{Path(environ['SUBITIZE_OUTPUT_DIR']) / 'counts.db'}")
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from subitize import app
+from subitize import asgi
+
+
+def run_application(scope, messages):
+    # run the ASGI app on a scope, with the given messages to receive
+    sent = []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        # as if the client stayed connected
+        await asyncio.Event().wait()
+        return None
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(asgi.application(scope, receive, send))
+    return sent
+
+
+def test_asgi_request():
+    path, query_string = '/json/', 'semester=201701&query=a'
+    scope = {
+        'type': 'http',
+        'method': 'GET',
+        'path': path,
+        'query_string': query_string.encode('latin-1'),
+        'headers': [(b'host', b'localhost')],
+        'client': ('127.0.0.1', 12345),
+        'server': ('localhost', 5000),
+    }
+    sent = run_application(scope, [{'type': 'http.request', 'body': b''}])
+    assert [message['type'] for message in sent] == ['http.response.start', 'http.response.body']
+    assert sent[0]['status'] == 200
+    assert (b'content-type', b'application/json') in sent[0]['headers']
+    assert sent[1]['body'] == app.test_client().get(f'{path}?{query_string}').data
+
+
+def test_asgi_startup_failed():
+
+    def fail():
+        raise RuntimeError('no database')
+
+    prepare = asgi.prepare
+    asgi.prepare = fail
+    try:
+        sent = run_application({'type': 'lifespan'}, [{'type': 'lifespan.startup'}])
+    finally:
+        asgi.prepare = prepare
+    assert [message['type'] for message in sent] == ['lifespan.startup.failed']
+    assert 'no database' in sent[0]['message']
+
+
+def test_asgi_stream_cancelled():
+    blocked = Event()
+    release = Event()
+    closed = Event()
+
+    def generate():
+        try:
+            yield b'event: first\n\n'
+            blocked.set()
+            release.wait()
+            yield b'event: second\n\n'
+        finally:
+            closed.set()
+
+    response = Response(generate(), mimetype='text/event-stream')
+    sent = []
+
+    async def receive():
+        await asyncio.Event().wait()
+
+    async def send(message):
+        sent.append(message)
+
+    async def cancel_while_blocked():
+        task = asyncio.ensure_future(asgi.stream_body(receive, send, response))
+        while not blocked.is_set():
+            await asyncio.sleep(0.01)
+        # as if the server cancelled the request while the generator is still running on its thread
+        task.cancel()
+        try:
+            await asyncio.sleep(0.05)
+            assert not task.done()
+        finally:
+            release.set()
+        try:
+            await task
+            assert False
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(cancel_while_blocked())
+    assert closed.is_set()
+    assert [message['body'] for message in sent] == [b'event: first\n\n']
+
+
+if __name__ == '__main__':
+    test_asgi_request()
+    test_asgi_startup_failed()
+    test_asgi_stream_cancelled()
@@ -2,17 +2,64 @@
 
 # pylint: disable = missing-docstring, wrong-import-position
 
+import atexit
+import gzip
+import json
+import logging
 import sys
+from contextlib import contextmanager
+from threading import Thread, enumerate as enumerate_threads, get_ident
+from os import environ
 from os.path import dirname, realpath, join as join_path
 from pathlib import Path
+from shutil import rmtree
+from tempfile import TemporaryDirectory, mkdtemp
 
+import msgpack
+from flask import g
+from sqlalchemy import delete, select
 from sqlalchemy.sql.expression import func
 
+# the tests use a scratch database and output directory, so that they never write to the package's data
+if 'SUBITIZE_OUTPUT_DIR' not in environ:
+    environ['SUBITIZE_OUTPUT_DIR'] = mkdtemp(prefix='subitize-test-')
+    atexit.register(rmtree, environ['SUBITIZE_OUTPUT_DIR'], ignore_errors=True)
+environ.setdefault('SUBITIZE_DATABASE_URL', f"sqlite:///{Path(environ['SUBITIZE_OUTPUT_DIR']) / 'counts.db'}")
+
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
-from subitize import create_session, create_select
+from subitize import create_session, create_select, get_data_version, Room, Offering, DataVersion
+from subitize import OfferingFragment, OfferingTombstone
 from subitize import filter_by_semester, filter_by_department, filter_by_number, filter_by_instructor
 from subitize import filter_by_units, filter_by_core, filter_by_meeting
+from subitize import filter_by_search, filter_by_fuzzy_search, filter_by_fuzzy_instructor
+from subitize import filter_by_prerequisites, sort_offerings
+from subitize import SearchIndex, FilterIndex, RelevanceIndex, PrerequisiteGraph
+from subitize import RoomOccupancy, RoomSchedule, get_room_meetings
+from subitize.models import ENGINE
+from subitize.cache import ResultCache, QueryLog, read_query_log
+from subitize.metrics import STATEMENT_LISTENERS, listen_for_statements, start_request
+from subitize.watch import SeatWatcher
+from subitize.snapshots import SNAPSHOT_DIR
+from subitize.shards import SHARD_DIR, MANIFEST_PATH, create_shards, create_shard_session, get_shard_codes
+
+APP = sys.modules['subitize.app']
+API = sys.modules['subitize.api']
+SLOWLOG = sys.modules['subitize.slowlog']
+
+
+@contextmanager
+def new_data_version():
+    # as if an update had changed the data, until the end of the block
+    with create_session() as session:
+        data_version = DataVersion(timestamp='now')
+        session.add(data_version)
+        session.commit()
+        try:
+            yield data_version.id
+        finally:
+            session.delete(data_version)
+            session.commit()
 
 def test_semester_query():
     query = create_select()
@@ -87,6 +134,429 @@ def test_meeting_query_tbd():
         assert len(list(session.scalars(query))) == 2
 
 
+def test_fuzzy_instructor_query():
+    with create_session() as session:
+        index = SearchIndex(session)
+        exact_query = filter_by_instructor(filter_by_semester(create_select(), 201701), 'Justin Li')
+        fuzzy_query = filter_by_fuzzy_instructor(filter_by_semester(create_select(), 201701), 'Jstin Li', index)
+        exact = set(offering.id for offering in session.scalars(exact_query))
+        fuzzy = set(offering.id for offering in session.scalars(fuzzy_query))
+        assert exact and exact <= fuzzy
+
+
+def test_fuzzy_search_query():
+    with create_session() as session:
+        index = SearchIndex(session)
+        exact_query = filter_by_search(filter_by_semester(create_select(), 201701), 'cognitive')
+        fuzzy_query = filter_by_fuzzy_search(filter_by_semester(create_select(), 201701), 'cognitiv', index)
+        exact = set(offering.id for offering in session.scalars(exact_query))
+        fuzzy = set(offering.id for offering in session.scalars(fuzzy_query))
+        assert exact and exact <= fuzzy
+    client = APP.app.test_client()
+    # the search is only reported as approximate if the approximate search found something
+    response = client.get('/json/?semester=201701&query=cogntive').get_json()
+    assert response['results'] and response['metadata']['fuzzy']
+    response = client.get('/json/?semester=201701&query=cognitive').get_json()
+    assert response['results'] and 'fuzzy' not in response['metadata']
+    response = client.get('/json/?semester=201701&query=qzxjvw').get_json()
+    assert not response['results'] and 'fuzzy' not in response['metadata']
+
+
+def test_filter_index():
+    query = create_select()
+    query = filter_by_semester(query, 201701)
+    query = filter_by_department(query, 'COGS')
+    query = filter_by_meeting(query, days='T')
+    with create_session() as session:
+        index = FilterIndex(session)
+        bitmap = index.filter_by_semester(index.all, '201701')
+        bitmap = index.filter_by_department(bitmap, 'COGS')
+        bitmap = index.filter_by_meeting(bitmap, days='T')
+        assert sorted(index.sorted_ids(bitmap)) == sorted(offering.id for offering in session.scalars(query))
+
+
+def test_sort_offerings():
+    with create_session() as session:
+        index = FilterIndex(session)
+        expected = index.sorted_ids(index.filter_by_semester(index.all, '201701'), 'units')
+        for field in ['semester', 'course', 'title', 'units', 'instructors', 'meetings', 'cores']:
+            query = sort_offerings(filter_by_search(filter_by_semester(create_select(), 201701), 'a'), field)
+            offering_ids = [offering.id for offering in session.scalars(query)]
+            assert len(offering_ids) == len(set(offering_ids))
+        query = sort_offerings(filter_by_semester(create_select(), 201701), 'units')
+        assert [offering.id for offering in session.scalars(query)] == expected
+        # offerings are sorted by their earliest meeting, not by a mix of their meetings
+        query = sort_offerings(filter_by_semester(create_select(), 201701), 'meetings')
+        keys = [
+            min(
+                (
+                    (True,) if meeting.timeslot is None
+                    else (False, meeting.timeslot.weekdays[:1], meeting.timeslot.start, meeting.timeslot.end)
+                    for meeting in offering.meetings
+                ),
+                default=(True,),
+            )
+            for offering in session.scalars(query)
+        ]
+        assert keys == sorted(keys)
+
+
+def test_relevance_index():
+    with create_session() as session:
+        index = RelevanceIndex(session)
+        query = filter_by_search(filter_by_semester(create_select(), 201701), 'cognitive science')
+        expected = set(offering.id for offering in session.scalars(query))
+        semester = set(offering.id for offering in session.scalars(filter_by_semester(create_select(), 201701)))
+        ranked = index.search('cognitive science', 1000, accept=semester.__contains__)
+        assert expected and set(ranked) == expected
+        assert index.search('cognitive science', 5, accept=semester.__contains__) == ranked[:5]
+        # the substring index finds the same tokens as checking every one
+        for term in ['a', 'sc', 'sci', 'cien', 'Science', 'xyzzy']:
+            expected = set(
+                offering_id
+                for token, postings in index.postings.items() if term.lower() in token
+                for offering_id in postings
+            )
+            assert set(index.match(term)) == expected
+
+
+def test_room_occupancy():
+    with create_session() as session:
+        occupancy = RoomOccupancy(session, ['201701'])
+        meetings = get_room_meetings(session, ['201701'])
+        rooms = {room.id: (room.building_code, room.room) for room in session.scalars(select(Room))}
+    busy = set(
+        rooms[room_id] for _, room_id, weekdays, start_minute, end_minute in meetings
+        if 'M' in weekdays and start_minute < 10 * 60 + 30 and end_minute > 9 * 60 + 35
+    )
+    free = occupancy.free_rooms('M', 9 * 60 + 35, 10 * 60 + 30)
+    assert busy and len(free) == len(occupancy.rooms) - len(busy)
+    assert not busy & set(free)
+
+
+def test_room_schedule():
+    with create_session() as session:
+        occupancy = RoomOccupancy(session, ['201701'])
+        schedule = RoomSchedule(session, '201701')
+    for days, start_minute, end_minute in [('M', 9 * 60 + 35, 10 * 60 + 30), ('TR', 13 * 60, 16 * 60), ('F', 8 * 60, 8 * 60 + 5)]: # pylint: disable = line-too-long
+        free = set(schedule.free_rooms(days, start_minute, end_minute))
+        assert free & set(occupancy.rooms) == set(occupancy.free_rooms(days, start_minute, end_minute))
+
+
+def test_prerequisite_filter():
+    with create_session() as session:
+        graph = PrerequisiteGraph(session)
+        index = FilterIndex(session)
+        query = filter_by_prerequisites(filter_by_semester(create_select(), 201701), 'COMP 131', graph)
+        offerings = list(session.scalars(query))
+        bitmap = index.filter_by_prerequisites(index.filter_by_semester(index.all, '201701'), 'COMP 131', graph)
+        assert sorted(index.sorted_ids(bitmap)) == sorted(offering.id for offering in offerings)
+        completed = graph.parse_courses('COMP 131')
+        assert all(graph.is_eligible(offering.course_id, completed) for offering in offerings)
+
+
+def test_result_cache():
+    cache = ResultCache(size=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None and cache.get('a') == 1 and cache.get('c') == 3
+    cache.clear()
+    assert cache.get('a') is None and cache.get('c') is None
+
+
+def test_query_log(tmp_path):
+    path = tmp_path / 'query-log.json'
+    for parameters in ['semester=201701', 'department=COMP&semester=201701', 'semester=201701']:
+        query_log = QueryLog(path, size=2)
+        query_log.record(parameters)
+        query_log.flush()
+    query_log.record('semester=201702')
+    query_log.flush()
+    assert read_query_log(path) == [('semester=201701', 2), ('department=COMP&semester=201701', 1)]
+
+
+def test_seat_watcher():
+    watcher = SeatWatcher(poll_seconds=3600)
+    with create_session() as session:
+        offerings = session.scalars(
+            filter_by_semester(create_select(), '201701').order_by(Offering.id).limit(2)
+        ).all()
+        subscription = watcher.subscribe(session, {offering.readable_id: offering.id for offering in offerings})
+        assert set(subscription.seats) == set(offering.readable_id for offering in offerings)
+        assert watcher.check(session) == 0
+        session.add(DataVersion(timestamp='now'))
+        offerings[0].num_waitlisted += 1
+        session.flush()
+        assert watcher.check(session) == 1
+        version, changes = subscription.events.get_nowait()
+        assert version == get_data_version(session)
+        assert changes == {offerings[0].readable_id: {
+            'is_open': False,
+            'num_enrolled': offerings[0].num_enrolled,
+            'num_waitlisted': offerings[0].num_waitlisted,
+        }}
+        session.rollback()
+    watcher.unsubscribe(subscription)
+    assert not watcher.subscriptions and not watcher.seats
+
+
+def test_indices_follow_data_version():
+    indices = APP.get_indices()
+    assert APP.get_indices() is indices
+    with new_data_version() as version:
+        new_indices = APP.get_indices()
+        assert new_indices is not indices and new_indices.version == version
+        assert APP.get_indices() is new_indices
+    assert APP.get_indices().version == indices.version
+
+
+def test_result_cache_follows_data_version():
+    client = APP.app.test_client()
+    path = '/json/?semester=201701&department=COMP'
+    cache_key = 'department=COMP&semester=201701'
+    results = client.get(path).data
+    old_version = APP.get_indices().version
+    with new_data_version() as version:
+        # results cached for the old data are never served
+        APP.RESULT_CACHE.put((old_version, cache_key), (['"stale"'], False))
+        assert client.get(path).data == results
+        assert APP.RESULT_CACHE.get((version, cache_key)) is not None
+
+
+def test_concurrent_shard_writes():
+    if ENGINE.dialect.name != 'sqlite':
+        # shards are only made from a SQLite database
+        return
+    # let earlier data swaps finish refilling the caches, which may also write shards
+    for thread in enumerate_threads():
+        if thread.name == 'subitize-warm':
+            thread.join()
+    MANIFEST_PATH.unlink(missing_ok=True)
+    # as if several workers started at once
+    threads = [Thread(target=create_shards) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not list(SHARD_DIR.glob('*.tmp'))
+    assert '201701' in get_shard_codes(APP.get_indices().version)
+    with create_shard_session('201701') as shard_session, create_session() as session:
+        query = filter_by_semester(create_select(), '201701').with_only_columns(func.count(Offering.id))
+        assert shard_session.scalar(query) == session.scalar(query)
+
+
+def test_derived_data_follows_data_version():
+    filename = APP.get_snapshot('201701')
+    context = APP.get_context_template()
+    assert APP.get_snapshot('201701') == filename and APP.get_context_template() is context
+    with new_data_version() as version:
+        new_filename = APP.get_snapshot('201701')
+        with gzip.open(SNAPSHOT_DIR / new_filename) as fd:
+            assert json.load(fd)['version'] == version
+        assert APP.get_context_template() is not context
+        if ENGINE.dialect.name == 'sqlite':
+            # shards are never written while serving, so searches use the full database until they are
+            assert APP.get_shards() == [] and not get_shard_codes(version)
+            create_shards()
+            assert '201701' in APP.get_shards() and APP.SHARD_CODES[0] == version
+
+
+def test_snapshot_files():
+    client = APP.app.test_client()
+    filename = APP.get_snapshot('201701')
+    with gzip.open(SNAPSHOT_DIR / filename) as fd:
+        snapshot = json.load(fd)
+    response = client.get(f'/snapshot/{filename}', headers={'Accept-Encoding': 'gzip, deflate'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(response.data)) == snapshot
+    # a client that refuses gzip gets the plain JSON
+    response = client.get(f'/snapshot/{filename}', headers={'Accept-Encoding': 'deflate, gzip;q=0'})
+    assert 'Content-Encoding' not in response.headers and response.get_json() == snapshot
+    with new_data_version():
+        new_filename = APP.get_snapshot('201701')
+        # superseded snapshots are deleted, and their clients sent to the current one
+        assert not (SNAPSHOT_DIR / filename).exists()
+        assert [path.name for path in SNAPSHOT_DIR.glob('201701-*')] == [new_filename]
+        response = client.get(f'/snapshot/{filename}')
+        assert response.status_code == 302 and response.location == '/snapshot/?semester=201701'
+        assert client.get(response.location).location == f'/snapshot/{new_filename}'
+    assert client.get('/snapshot/000000-0123456789abcdef.json.gz').status_code == 404
+
+
+def test_room_utilization_window():
+    occupancy = API.get_room_occupancy(['201701'])
+    assert API.get_room_occupancy(['201701', '201701']) is occupancy
+    try:
+        occupancy.utilization('MTWRF', 18 * 60, 8 * 60)
+        assert False
+    except ValueError:
+        pass
+    client = APP.app.test_client()
+    response = client.get('/rooms/?semester=201701&start_hour=1800&end_hour=0800')
+    assert response.status_code == 400
+    response = client.get('/rooms/?semester=201701&start_hour=0800&end_hour=1800')
+    assert response.status_code == 200 and b'NaN' not in response.data
+    with new_data_version():
+        assert API.get_room_occupancy(['201701']) is not occupancy
+
+
+def test_offering_changes():
+    client = APP.app.test_client()
+    with create_session() as session:
+        num_offerings = session.scalar(select(func.count(Offering.id)))
+    # a new client gets every offering, whether or not the update stored its fragment
+    changes = client.get('/changes/?since=0').get_json()
+    assert len(changes['changed']) == num_offerings and changes['deleted'] == []
+    with new_data_version() as synced_version, new_data_version() as version, create_session() as session:
+        offerings = list(session.scalars(select(Offering).order_by(Offering.id)))
+        try:
+            # as if an update had stored the fragments of every offering
+            session.add_all(
+                OfferingFragment(offering_id=offering.id, version=synced_version, fragment=offering.to_json_fragment())
+                for offering in offerings
+            )
+            session.commit()
+            changes = client.get(f'/changes/?since={synced_version}').get_json()
+            assert changes['changed'] == [] and changes['deleted'] == []
+            # as if the next update had changed one offering and deleted another
+            session.get(OfferingFragment, offerings[0].id).version = version
+            session.add(OfferingTombstone(
+                offering_id=offerings[-1].id + 1, readable_id='201701_ZZZZ_999_0', version=version,
+            ))
+            session.commit()
+            changes = client.get(f'/changes/?since={synced_version}').get_json()
+            assert [offering['id'] for offering in changes['changed']] == [offerings[0].readable_id]
+            assert changes['deleted'] == ['201701_ZZZZ_999_0']
+            assert changes['since'] == synced_version and changes['version'] == version
+            changes = client.get(f'/changes/?since={version}').get_json()
+            assert changes['changed'] == [] and changes['deleted'] == []
+        finally:
+            session.execute(delete(OfferingTombstone))
+            session.execute(delete(OfferingFragment))
+            session.commit()
+
+def expand_results(tables, results):
+    # the inverse of compact_results
+    expanded = []
+    for result in results:
+        result = dict(result)
+        result['semester'] = dict(tables['semesters'][result['semester']], code=result['semester'])
+        result['department'] = {'code': result['department'], 'name': tables['departments'][result['department']]}
+        result['instructors'] = [dict(tables['people'][name], system_name=name) for name in result['instructors']]
+        result['cores'] = [{'code': code, 'name': tables['cores'][code]} for code in result['cores']]
+        meetings = []
+        for meeting in result['meetings']:
+            if meeting['timeslot'] is None:
+                expanded_meeting = dict.fromkeys(
+                    ['weekdays', 'iso_start_time', 'iso_end_time', 'us_start_time', 'us_end_time']
+                )
+            else:
+                expanded_meeting = dict(tables['timeslots'][meeting['timeslot']])
+            if meeting['building'] is None:
+                expanded_meeting['building'] = None
+            else:
+                expanded_meeting['building'] = {
+                    'code': meeting['building'],
+                    'name': tables['buildings'][meeting['building']],
+                }
+            expanded_meeting['room'] = meeting['room']
+            meetings.append(expanded_meeting)
+        result['meetings'] = meetings
+        expanded.append(result)
+    return expanded
+
+
+def test_json_encodings():
+    client = APP.app.test_client()
+    path = '/json/?semester=201701&query=a'
+    full = client.get(path).get_json()
+    assert full['results']
+    compact = client.get(path + '&format=compact').get_json()
+    assert compact['metadata'] == full['metadata']
+    assert expand_results(compact['tables'], compact['results']) == full['results']
+    assert msgpack.unpackb(client.get(path + '&format=compact&encoding=msgpack').data) == compact
+    assert msgpack.unpackb(client.get(path + '&encoding=msgpack').data) == full
+    assert client.get(path + '&format=short').status_code == 400
+    assert client.get(path + '&encoding=xml').status_code == 400
+
+
+class RecordingHandler(logging.Handler):
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        # ignore the statements of background threads, such as the result cache warmer
+        if record.thread == get_ident():
+            self.records.append(record)
+
+
+def test_slow_statement_log():
+    handler = RecordingHandler()
+    SLOWLOG.LOGGER.addHandler(handler)
+    threshold = SLOWLOG.SLOW_QUERY_SECONDS
+    # as if every statement were slow
+    SLOWLOG.SLOW_QUERY_SECONDS = 0
+    try:
+        with create_session() as session:
+            session.execute(select(func.count(Offering.id)).where(Offering.units == 4))
+    finally:
+        SLOWLOG.SLOW_QUERY_SECONDS = threshold
+        SLOWLOG.LOGGER.removeHandler(handler)
+    assert len(handler.records) == 1
+    message = handler.records[0].getMessage()
+    assert message.startswith('slow SQL statement') and 'FROM offerings' in message
+    assert 'plan:' in message and 'unable to explain' not in message
+
+
+def test_query_budget():
+    handler = RecordingHandler()
+    SLOWLOG.LOGGER.addHandler(handler)
+    budget = SLOWLOG.QUERY_BUDGET
+    SLOWLOG.QUERY_BUDGET = 1
+    APP.QUERY_DEBUG = True
+    try:
+        assert not SLOWLOG.check_query_budget('/json/', 1)
+        assert not handler.records
+        # the changes are never cached, so they always query the database
+        response = APP.app.test_client().get('/changes/?since=0')
+    finally:
+        APP.QUERY_DEBUG = SLOWLOG.QUERY_DEBUG
+        SLOWLOG.QUERY_BUDGET = budget
+        SLOWLOG.LOGGER.removeHandler(handler)
+    statements = int(response.headers['X-Query-Count'])
+    assert statements > 1
+    assert [record.getMessage() for record in handler.records] == [
+        f'/changes/ executed {statements} SQL statements (budget 1)',
+    ]
+
+
+def test_statement_listeners():
+    statements = []
+    thread_id = get_ident()
+
+    def record(conn, cursor, statement, parameters, executemany, elapsed):
+        # pylint: disable = unused-argument
+        # ignore the statements of background threads, such as the result cache warmer
+        if get_ident() == thread_id:
+            statements.append((statement, elapsed))
+
+    listen_for_statements(record)
+    try:
+        with APP.app.test_request_context('/'):
+            start_request()
+            with create_session() as session:
+                session.execute(select(func.count(Offering.id)))
+            # the request metrics and the other listeners share one timing of each statement
+            assert len(statements) == 1 and g.metrics_sql_statements == 1
+            assert g.metrics_sql_time == statements[0][1] > 0
+    finally:
+        STATEMENT_LISTENERS.remove(record)
+
+
 if __name__ == '__main__':
     test_semester_query()
     test_department_query()
@@ -96,3 +566,26 @@ if __name__ == '__main__':
     test_core_query()
     test_meeting_query_normal()
     test_meeting_query_tbd()
+    test_fuzzy_instructor_query()
+    test_fuzzy_search_query()
+    test_filter_index()
+    test_sort_offerings()
+    test_relevance_index()
+    test_room_occupancy()
+    test_room_schedule()
+    test_prerequisite_filter()
+    test_result_cache()
+    test_seat_watcher()
+    test_indices_follow_data_version()
+    test_result_cache_follows_data_version()
+    test_concurrent_shard_writes()
+    test_derived_data_follows_data_version()
+    test_snapshot_files()
+    test_room_utilization_window()
+    test_offering_changes()
+    test_json_encodings()
+    test_slow_statement_log()
+    test_query_budget()
+    test_statement_listeners()
+    with TemporaryDirectory() as temp_dir:
+        test_query_log(Path(temp_dir))
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+
+# pylint: disable = missing-docstring, wrong-import-position
+
+import atexit
+import json
+import sqlite3
+import subprocess
+import sys
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from os import environ
+from pathlib import Path
+from shutil import rmtree, which
+from tempfile import TemporaryDirectory, mkdtemp
+from threading import get_ident
+
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+# the tests use a scratch database and output directory, so that they never write to the package's data
+if 'SUBITIZE_OUTPUT_DIR' not in environ:
+    environ['SUBITIZE_OUTPUT_DIR'] = mkdtemp(prefix='subitize-test-')
+    atexit.register(rmtree, environ['SUBITIZE_OUTPUT_DIR'], ignore_errors=True)
+environ.setdefault('SUBITIZE_DATABASE_URL', f"sqlite:///{Path(environ['SUBITIZE_OUTPUT_DIR']) / 'counts.db'}")
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from update import RecordedResponse, RecordingTransport, ReplayTransport
+from update import get_view_state, get_offerings_data, parse_offerings, parse_prerequisites, update_fragments
+from update import UpdateSession, apply_semesters, update_course_histories
+
+# update adds the repository to the path
+from subitize import Department, Course, Person, Offering, DepartmentStats
+from subitize import app
+from subitize import create_session, create_select, filter_by_semester, get_data_version
+from subitize.models import DATA_DIR, DB_PATH, ENGINE
+from subitize.watch import SeatWatcher
+
+API = sys.modules['subitize.api']
+FIXTURES_DIR = Path(__file__).resolve().parent / 'fixtures'
+UPDATE_SCRIPT = Path(__file__).resolve().parent.parent / 'scripts' / 'update.py'
+
+
+def read_fixture(semester_code):
+    with (FIXTURES_DIR / f'offerings-{semester_code}.html').open(encoding='utf-8') as fd:
+        html = fd.read()
+    # recorded from the BeautifulSoup parser that parse_offerings replaced
+    with (FIXTURES_DIR / f'offerings-{semester_code}.json').open(encoding='utf-8') as fd:
+        expected = json.load(fd)
+    return html, expected
+
+
+def test_parse_offerings():
+    html, expected = read_fixture('201701')
+    assert [list(row) for row in parse_offerings(html)] == expected
+
+
+def test_parse_offerings_chunks():
+    html, expected = read_fixture('201701')
+    for chunk_size in [1, 7, 4096]:
+        assert [list(row) for row in parse_offerings(html, chunk_size)] == expected
+
+
+def test_parse_offerings_missing_table():
+    try:
+        list(parse_offerings('<div id="searchResultsPanel"><div></div></div>'))
+    except ValueError:
+        return
+    assert False
+
+
+class FakeCourseCounts:
+
+    def __init__(self, html):
+        self.html = html
+        self.requests = 0
+
+    def get(self, url, **kwargs):
+        # pylint: disable = unused-argument
+        self.requests += 1
+        return RecordedResponse(
+            200,
+            f'<input id="__VIEWSTATE" value="{self.requests}"/><input id="__EVENTVALIDATION" value="0"/>',
+        )
+
+    def post(self, url, **kwargs):
+        # pylint: disable = unused-argument
+        self.requests += 1
+        semester = kwargs['data']['tabContainer$TabPanel1$ddlSemesters']
+        return RecordedResponse(200, f'1|updatePanel||pageUpdatePanel|0|0|0|{self.html}<!--{semester}-->|0|')
+
+
+def test_parse_prerequisites():
+    courses = {('COMP', '131'): 1, ('MATH', '120'): 2, ('MATH', '110'): 3}
+    assert json.loads(parse_prerequisites('COMP 131 and MATH 120 or 110', courses)) == [[1], [2, 3]]
+    # a clause that can be satisfied by something other than a course is not required
+    assert json.loads(parse_prerequisites('COMP 131 and MATH 120 or permission of instructor', courses)) == [[1]]
+    assert parse_prerequisites('Permission of instructor or MATH 120', courses) is None
+    assert parse_prerequisites('COMP 131, MATH 120, or equivalent', courses) is None
+    # a minimum grade is not an alternative
+    assert json.loads(parse_prerequisites('COMP 131 with a grade of C or better', courses)) == [[1]]
+
+
+def test_record_replay():
+    html, _ = read_fixture('201701')
+    live = FakeCourseCounts(html)
+    with TemporaryDirectory() as directory:
+        recorder = RecordingTransport(directory, live)
+        view_state = get_view_state(recorder)
+        recorded = [get_offerings_data(semester, recorder, view_state) for semester in ['201701', '201702']]
+        assert live.requests == 3
+        replayer = ReplayTransport(directory)
+        # the view state differs on every visit, so it is not part of the recording key
+        assert [get_offerings_data(semester, replayer) for semester in ['201701', '201702']] == recorded
+        assert recorded[0].endswith('<!--201701-->')
+        try:
+            get_offerings_data('201801', replayer)
+        except IOError:
+            return
+    assert False
+
+
+def test_update_session():
+    statements = []
+    thread_id = get_ident()
+
+    def count_statement(*args):
+        # ignore the statements of background threads, such as the app's result cache warmer
+        if get_ident() == thread_id:
+            statements.append(args[2])
+
+    with create_session() as session:
+        update_session = UpdateSession(session)
+        department = session.scalars(select(Department).order_by(Department.code)).first()
+        person = session.scalars(select(Person).order_by(Person.id)).first()
+        event.listen(ENGINE, 'before_cursor_execute', count_statement)
+        try:
+            # rows are resolved against the loaded objects, without querying
+            assert update_session.get_department(department.code) is department
+            assert update_session.get_person(person.system_name, person.first_name, person.last_name) is person
+            new_department = update_session.get_department('ZZZZ')
+            new_person = update_session.get_person('Zed Zither', 'Zed', 'Zither')
+            assert update_session.get_department('ZZZZ') is new_department
+            assert update_session.get_person('Zed Zither', 'Zed', 'Zither') is new_person
+        finally:
+            event.remove(ENGINE, 'before_cursor_execute', count_statement)
+        assert not statements
+        # objects that are not found are inserted once
+        session.flush()
+        assert session.scalar(select(func.count()).where(Department.code == 'ZZZZ')) == 1
+        assert session.scalar(select(func.count()).where(Person.system_name == 'Zed Zither')) == 1
+        session.rollback()
+
+
+def test_apply_semesters():
+    html, expected = read_fixture('201701')
+    semester_codes = ['201701', '201702']
+    num_sections = len(set((department, number, section) for department, number, section, *_ in expected))
+    with TemporaryDirectory() as directory:
+        recorder = RecordingTransport(directory, FakeCourseCounts(html))
+        view_state = get_view_state(recorder)
+        for semester_code in semester_codes:
+            get_offerings_data(semester_code, recorder, view_state)
+        with create_session() as session:
+            old_counts = {
+                semester_code: len(session.scalars(filter_by_semester(create_select(), semester_code)).all())
+                for semester_code in semester_codes
+            }
+            apply_semesters(semester_codes, session, ReplayTransport(directory))
+            for semester_code in semester_codes:
+                statement = select(DepartmentStats).where(DepartmentStats.semester_id == int(semester_code))
+                assert len(session.scalars(filter_by_semester(create_select(), semester_code)).all()) == num_sections
+                assert sum(stats.num_sections for stats in session.scalars(statement)) == num_sections
+            # nothing is committed until all semesters and their rollups are written
+            with create_session() as other_session:
+                for semester_code in semester_codes:
+                    statement = filter_by_semester(create_select(), semester_code)
+                    assert len(other_session.scalars(statement).all()) == old_counts[semester_code]
+            session.rollback()
+
+
+@contextmanager
+def copy_database():
+    # a scratch copy of the database, for tests that commit their changes
+    with TemporaryDirectory() as directory:
+        path = Path(directory) / 'counts.db'
+        source = sqlite3.connect(DB_PATH)
+        target = sqlite3.connect(path)
+        source.backup(target)
+        source.close()
+        target.close()
+        engine = create_engine(f'sqlite:///{path}', poolclass=NullPool)
+        try:
+            yield engine
+        finally:
+            engine.dispose()
+
+
+def test_update_live_database():
+    # updates are committed to the database that is being served, so watchers see them
+    if ENGINE.dialect.name != 'sqlite':
+        return
+    with copy_database() as engine:
+        watcher = SeatWatcher(poll_seconds=3600)
+        with Session(engine) as session:
+            version = get_data_version(session)
+            offering = session.scalars(select(Offering).order_by(Offering.id).limit(1)).one()
+            offering_id, readable_id = offering.id, offering.readable_id
+            subscription = watcher.subscribe(session, {readable_id: offering_id})
+        try:
+            with Session(engine) as session:
+                offering = session.get(Offering, offering_id)
+                num_waitlisted = offering.num_waitlisted + 1
+                offering.num_waitlisted = num_waitlisted
+                session.commit()
+                update_fragments(session)
+            with Session(engine) as session:
+                assert get_data_version(session) > version
+                assert watcher.check(session) == 1
+            assert subscription.events.get_nowait()[1][readable_id]['num_waitlisted'] == num_waitlisted
+        finally:
+            watcher.unsubscribe(subscription)
+
+
+def test_course_histories():
+    if ENGINE.dialect.name != 'sqlite':
+        return
+    html, _ = read_fixture('201701')
+    with TemporaryDirectory() as directory, copy_database() as engine:
+        recorder = RecordingTransport(directory, FakeCourseCounts(html))
+        get_offerings_data('201702', recorder, get_view_state(recorder))
+        with Session(engine) as session:
+            apply_semesters(['201702'], session, ReplayTransport(directory))
+            update_course_histories(session=session)
+            session.commit()
+            offerings = defaultdict(list)
+            for offering in session.scalars(select(Offering).order_by(Offering.semester_id, Offering.section)):
+                offerings[offering.course_id].append(offering)
+            # the course offered in the most semesters, with the most sections
+            course_id = max(
+                session.scalars(select(Offering.course_id).where(Offering.semester_id == 201702)),
+                key=(lambda course_id: (
+                    len(set(offering.semester_id for offering in offerings[course_id])),
+                    len(offerings[course_id]),
+                )),
+            )
+            course = session.get(Course, course_id)
+            department, number = course.department_code, course.number
+            semesters = Counter(str(offering.semester_id) for offering in offerings[course_id])
+            title = offerings[course_id][-1].title
+        served_session = API.create_session
+        API.create_session = lambda: Session(engine)
+        try:
+            client = app.test_client()
+            response = client.get(f'/history/{department.lower()}/{number}')
+            assert client.get('/history/ZZZZ/999').status_code == 404
+        finally:
+            API.create_session = served_session
+    assert response.status_code == 200
+    history = response.get_json()
+    assert history['department'] == department and history['number'] == number
+    assert history['title'] == title
+    assert history['num_sections'] == sum(semesters.values())
+    assert history['num_semesters'] == len(semesters) > 1 and '201702' in semesters
+    assert history['first_offered'] == min(semesters) and history['last_offered'] == max(semesters)
+    assert [(semester['semester'], semester['num_sections']) for semester in history['semesters']] == sorted(
+        semesters.items(), reverse=True,
+    )
+
+
+def test_replay_to_scratch():
+    if which('sqlite3') is None:
+        return
+    html, _ = read_fixture('201701')
+    committed = {path: path.stat().st_mtime_ns for path in DATA_DIR.iterdir() if path.is_file()}
+    with TemporaryDirectory() as directory:
+        directory = Path(directory)
+        recorder = RecordingTransport(directory / 'recording', FakeCourseCounts(html))
+        get_offerings_data('201702', recorder, get_view_state(recorder))
+        command = [sys.executable, str(UPDATE_SCRIPT), 'offerings', '201702', '--replay', str(directory / 'recording')]
+        env = dict(environ)
+        del env['SUBITIZE_OUTPUT_DIR']
+        del env['SUBITIZE_DATABASE_URL']
+        # a replay without a scratch database is refused
+        assert subprocess.run(command, env=env, capture_output=True, check=False).returncode == 2
+        (directory / 'output').mkdir()
+        env['SUBITIZE_OUTPUT_DIR'] = str(directory / 'output')
+        env['SUBITIZE_DATABASE_URL'] = f"sqlite:///{directory / 'output' / 'counts.db'}"
+        subprocess.run(command, env=env, capture_output=True, check=True)
+        with (directory / 'output' / 'data.sql').open(encoding='utf-8') as fd:
+            assert '201702' in fd.read()
+        assert (directory / 'output' / 'schema.sql').exists() and (directory / 'output' / 'last-update').exists()
+    assert {path: path.stat().st_mtime_ns for path in DATA_DIR.iterdir() if path.is_file()} == committed
+
+
+if __name__ == '__main__':
+    test_parse_offerings()
+    test_parse_offerings_chunks()
+    test_parse_offerings_missing_table()
+    test_parse_prerequisites()
+    test_record_replay()
+    test_update_session()
+    test_apply_semesters()
+    test_update_live_database()
+    test_course_histories()
+    test_replay_to_scratch()